@@ -148,6 +148,18 @@ class DuckDBClient:
             self.logger.error(f"Query failed: {str(e)}")
             raise Exception(f"Query failed: {str(e)}")
 
+    def execute(self, sql: str) -> None:
+        """Run a statement that returns no rows, such as COPY ... TO."""
+        self.logger.debug(f"Executing statement: {sql}")
+        try:
+            start_time = time.perf_counter()
+            with self._get_cursor() as cursor:
+                cursor.execute(sql)
+            self.logger.debug(f"Statement executed successfully. Cost: {time.perf_counter() - start_time:.2f} seconds.")
+        except Exception as e:
+            self.logger.error(f"Statement failed: {str(e)}")
+            raise Exception(f"Statement failed: {str(e)}")
+
     def close(self) -> None:
         if self.connection:
             self.connection.close()
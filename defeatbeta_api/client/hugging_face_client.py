@@ -1,4 +1,6 @@
-from typing import Dict, Any
+import time
+from threading import Lock
+from typing import Dict, Any, Optional
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -6,6 +8,24 @@ from urllib3.util.retry import Retry
 
 from defeatbeta_api.utils.const import tables
 
+# spec.json is re-checked at most once per TTL; process-wide caches key on its update_time
+UPDATE_TIME_TTL_SECONDS = 300
+
+_update_time: Optional[str] = None
+_update_time_checked_at = 0.0
+_update_time_lock = Lock()
+
+def get_cached_data_update_time(ttl_seconds: float = UPDATE_TIME_TTL_SECONDS) -> str:
+    """Return the dataset update_time, fetching spec.json at most once per *ttl_seconds*."""
+    global _update_time, _update_time_checked_at
+    if _update_time is not None and time.monotonic() - _update_time_checked_at < ttl_seconds:
+        return _update_time
+    with _update_time_lock:
+        if _update_time is None or time.monotonic() - _update_time_checked_at >= ttl_seconds:
+            _update_time = HuggingFaceClient().get_data_update_time()
+            _update_time_checked_at = time.monotonic()
+        return _update_time
+
 class HuggingFaceClient:
     def __init__(self, max_retries: int = 3, timeout: int = 30):
         self.base_url = "https://huggingface.co/datasets/defeatbeta/yahoo-finance-data"
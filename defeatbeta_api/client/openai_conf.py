@@ -5,7 +5,9 @@ class OpenAIConfiguration:
             temperature=0,
             top_p=0,
             top_k=5,
-            tool_choice="auto"
+            tool_choice="auto",
+            max_prompt_tokens=None,
+            compact_json=False
     ):
         configs = locals()
         configs.pop('self')
@@ -27,3 +29,9 @@ class OpenAIConfiguration:
 
     def get_tool_choice(self):
         return self.tool_choice
+
+    def get_max_prompt_tokens(self):
+        return self.max_prompt_tokens
+
+    def get_compact_json(self):
+        return self.compact_json
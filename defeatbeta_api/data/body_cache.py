@@ -0,0 +1,173 @@
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, List, Optional, Sequence
+
+import pandas as pd
+
+from defeatbeta_api.client.duckdb_client import DuckDBClient
+from defeatbeta_api.client.hugging_face_client import get_cached_data_update_time
+from defeatbeta_api.utils.util import validate_body_cache_directory
+
+# Total size of cached bodies before the least recently read ones are evicted
+BODY_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_cache: Optional["BodyCache"] = None
+_cache_lock = Lock()
+
+
+def get_body_cache() -> "BodyCache":
+    """Return the process-wide body cache under ``validate_body_cache_directory()``."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = BodyCache(validate_body_cache_directory(), BODY_CACHE_MAX_BYTES)
+    return _cache
+
+
+class BodyCache:
+    """
+    Local copies of transcript and news bodies, one zstd-compressed parquet file each.
+
+    Files are named by the sha256 of ``(kind, symbol, period or uuid, update_time)``,
+    so a data update simply stops hitting old files and they age out. Reads touch
+    the file's mtime; once the directory grows past ``max_bytes`` the files with the
+    oldest mtime are removed first, which keeps eviction LRU across processes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = BODY_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._size = 0
+
+    def path(self, kind: str, *key) -> str:
+        parts = (kind,) + tuple(str(k) for k in key) + (get_cached_data_update_time(),)
+        digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{kind}-{digest}.parquet")
+
+    def fetch(self, duckdb_client: DuckDBClient, sql: str, kind: str, *key) -> pd.DataFrame:
+        """Result of *sql*, served from the local copy when one exists for *key*."""
+        path = self.path(kind, *key)
+        if self._touch(path):
+            try:
+                return duckdb_client.query(f"SELECT * FROM '{path}'")
+            except Exception:
+                # Evicted by another process between the touch and the read
+                self._forget(path)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            duckdb_client.execute(f"COPY ({sql}) TO '{tmp_path}' (FORMAT parquet, COMPRESSION zstd)")
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._add(path)
+        return duckdb_client.query(f"SELECT * FROM '{path}'")
+
+    def fetch_many(self, duckdb_client: DuckDBClient, batch_sql: Callable[[List[str]], str], kind: str,
+                   key_column: str, keys: Sequence[str], scope: Sequence[str] = ()) -> pd.DataFrame:
+        """
+        Rows of every key in *keys*, one local copy per key, reading all misses in one query.
+
+        *batch_sql* builds the query for the missing keys; its result is split on
+        *key_column* into one cached file per key, so later single and batched reads share them.
+        Keys the query returns no rows for are left uncached. Each file is keyed by
+        ``(kind, *scope, key)``, e.g. scope ``(symbol,)`` for rows only valid for one ticker.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return pd.DataFrame()
+        paths = {key: self.path(kind, *scope, key) for key in keys}
+        missing = {key for key in keys if not self._touch(paths[key])}
+        files = [paths[key] for key in keys if key not in missing]
+        if not missing:
+            return duckdb_client.query(f"SELECT * FROM read_parquet({_parquet_list(files)})")
+        batch_path = os.path.join(self.directory, f".batch-{uuid.uuid4().hex}.tmp")
+        try:
+            duckdb_client.execute(f"COPY ({batch_sql(sorted(missing))}) TO '{batch_path}' "
+                                  f"(FORMAT parquet, COMPRESSION zstd)")
+            # Read before splitting so a batch larger than max_bytes cannot evict its own rows
+            result = duckdb_client.query(f"SELECT * FROM read_parquet({_parquet_list(files + [batch_path])})")
+            # A key the query did not return may exist under another query, so it is not cached as empty
+            returned = set(result[key_column].astype(str))
+            for key in missing:
+                if str(key) not in returned:
+                    continue
+                path = paths[key]
+                tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                literal = str(key).replace("'", "''")
+                duckdb_client.execute(f"COPY (SELECT * FROM read_parquet('{batch_path}') WHERE {key_column} = '{literal}') "
+                                      f"TO '{tmp_path}' (FORMAT parquet, COMPRESSION zstd)")
+                os.replace(tmp_path, path)
+                self._add(path)
+        finally:
+            if os.path.exists(batch_path):
+                os.remove(batch_path)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._load_entries():
+                self._remove(path)
+            self._entries.clear()
+            self._size = 0
+
+    def _load_entries(self) -> "OrderedDict[str, int]":
+        if self._entries is None:
+            stats = []
+            for name in os.listdir(self.directory):
+                if name.endswith(".parquet"):
+                    try:
+                        stats.append((os.path.join(self.directory, name), os.stat(os.path.join(self.directory, name))))
+                    except FileNotFoundError:
+                        continue
+            stats.sort(key=lambda item: item[1].st_mtime)
+            self._entries = OrderedDict((path, stat.st_size) for path, stat in stats)
+            self._size = sum(self._entries.values())
+        return self._entries
+
+    def _touch(self, path: str) -> bool:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            entries = self._load_entries()
+            if path in entries:
+                entries.move_to_end(path)
+            else:
+                # Written by another process
+                entries[path] = os.path.getsize(path)
+                self._size += entries[path]
+        return True
+
+    def _add(self, path: str) -> None:
+        with self._lock:
+            entries = self._load_entries()
+            self._size -= entries.pop(path, 0)
+            entries[path] = os.path.getsize(path)
+            self._size += entries[path]
+            while self._size > self.max_bytes and len(entries) > 1:
+                oldest, size = entries.popitem(last=False)
+                self._size -= size
+                self._remove(oldest)
+
+    def _forget(self, path: str) -> None:
+        with self._lock:
+            self._size -= self._load_entries().pop(path, 0)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _parquet_list(paths: List[str]) -> str:
+    return "[" + ", ".join(f"'{path}'" for path in paths) + "]"
@@ -1,12 +1,20 @@
 import logging
-from typing import Optional, Dict, List
+from threading import Lock
+from typing import Optional, Dict, List, Iterable
 
 import pandas as pd
 
 from defeatbeta_api.client.duckdb_client import get_duckdb_client
 from defeatbeta_api.client.duckdb_conf import Configuration
+from defeatbeta_api.client.hugging_face_client import get_cached_data_update_time
 from defeatbeta_api.data.sql.sql_loader import load_sql
 
+# Process-wide symbol index, rebuilt only when the dataset update_time changes
+_index: Optional[Dict[str, dict]] = None
+_index_records: Optional[List[dict]] = None
+_index_update_time: Optional[str] = None
+_index_lock = Lock()
+
 
 class CompanyMeta:
     COMPANY_TICKERS_URL = "https://huggingface.co/datasets/defeatbeta/yahoo-finance-data/resolve/main/data/company_tickers.json"
@@ -20,31 +28,54 @@ class CompanyMeta:
         sql = load_sql("select_all_companies", url=self.COMPANY_TICKERS_URL)
         return self.duckdb_client.query(sql)
 
-    def _get_company_by_symbol(self, symbol: str) -> pd.DataFrame:
-        sql = load_sql("select_company_by_symbol", url=self.COMPANY_TICKERS_URL, symbol=symbol)
-        return self.duckdb_client.query(sql)
+    def _symbol_index(self) -> Dict[str, dict]:
+        return self._load_index()[0]
+
+    def _load_index(self):
+        global _index, _index_records, _index_update_time
+        update_time = get_cached_data_update_time()
+        if _index is not None and _index_update_time == update_time:
+            return _index, _index_records
+        with _index_lock:
+            if _index is None or _index_update_time != update_time:
+                records = [
+                    {key: (None if pd.isna(value) else value) for key, value in record.items()}
+                    for record in self._get_all_companies().to_dict(orient="records")
+                ]
+                index = {}
+                for record in records:
+                    # Keep the first entry when a ticker appears more than once
+                    index.setdefault(record["symbol"], record)
+                _index, _index_records, _index_update_time = index, records, update_time
+            return _index, _index_records
 
     def get_company_info(self, symbol: str) -> Optional[dict]:
-        df = self._get_company_by_symbol(symbol)
-        if df.empty:
-            return None
-        row = df.iloc[0]
-        return {
-            "idx": row["idx"],
-            "symbol": row["symbol"],
-            "cik": row["cik"],
-            "name": row["name"],
-            "financial_currency": row["financial_currency"]
-        }
+        info = self._symbol_index().get(symbol)
+        return dict(info) if info is not None else None
+
+    def currency(self, symbol: str, default: str = "USD") -> str:
+        info = self._symbol_index().get(symbol)
+        if info is None or info.get("financial_currency") is None:
+            return default
+        return info["financial_currency"]
+
+    def currencies(self, symbols: Iterable[str], default: str = "USD") -> Dict[str, str]:
+        index = self._symbol_index()
+        result = {}
+        for symbol in symbols:
+            info = index.get(symbol)
+            currency = info.get("financial_currency") if info is not None else None
+            result[symbol] = currency if currency is not None else default
+        return result
 
     def get_financial_currency_map(self) -> Dict[str, str]:
-        df = self._get_all_companies()
-        return dict(zip(df["symbol"], df["financial_currency"].fillna("USD")))
+        return {
+            record["symbol"]: record["financial_currency"] or "USD"
+            for record in self._load_index()[1]
+        }
 
     def get_all_companies_info(self) -> List[dict]:
-        df = self._get_all_companies()
-        return df.to_dict(orient="records")
+        return [dict(record) for record in self._load_index()[1]]
 
     def get_all_tickers(self) -> List[str]:
-        df = self._get_all_companies()
-        return df["symbol"].tolist()
+        return [record["symbol"] for record in self._load_index()[1]]
@@ -1,6 +1,6 @@
 import textwrap
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Optional
 
 import pandas as pd
 from rich.box import ROUNDED
@@ -10,6 +10,9 @@ from rich.text import Text
 
 from defeatbeta_api.client.duckdb_client import DuckDBClient
 from defeatbeta_api.client.hugging_face_client import HuggingFaceClient
+from defeatbeta_api.data.news_store import load_ticker_articles
+from defeatbeta_api.data.sentiment import news_sentiment
+from defeatbeta_api.data.similarity_index import similar_news
 from defeatbeta_api.data.sql.sql_loader import load_sql
 from defeatbeta_api.utils.const import stock_news
 from defeatbeta_api.utils.util import in_notebook
@@ -26,16 +29,17 @@ class News:
     """
     Lazy accessor for a ticker's financial news.
 
-    Two SQL paths are used so the inline `news` paragraph array is only
+    Two paths are used so the inline `news` paragraph array is only
     fetched on demand (it accounts for ~99% of the parquet row size):
 
       - `select_news_list_by_symbol`  → metadata-only list (no `news` column)
-      - `select_news_by_uuid`         → single article (1 row, with paragraphs);
-        filters by both uuid and ticker because the same article appears once
-        per related ticker in the parquet.
+      - `news_store.load_ticker_articles` → article bodies by uuid, pruned to this
+        ticker's rows (the same article appears once per related ticker in the
+        parquet). `Tickers.get_articles` reads each article once across tickers.
 
-    The metadata list is memoised on the instance; article bodies are not
-    cached here because DuckDB's httpfs cache already handles repeat reads.
+    The metadata list is memoised on the instance. Article bodies go through
+    the on-disk `body_cache`, keyed by (ticker, uuid, update_time).
+    `similar_news` answers from the TF-IDF vectors in `similarity_index`.
     """
 
     def __init__(
@@ -51,26 +55,75 @@ class News:
         self.log_level = log_level
         self._list_cache: Optional[pd.DataFrame] = None
 
-    def get_news_list(self) -> pd.DataFrame:
-        if self._list_cache is None:
-            url = self.huggingface_client.get_url_path(stock_news)
-            sql = load_sql("select_news_list_by_symbol", ticker=self.ticker, url=url)
-            self._list_cache = self.duckdb_client.query(sql)
-        return self._list_cache
+    def get_news_list(self, limit: Optional[int] = None, offset: int = 0, since: Optional[str] = None,
+                      until: Optional[str] = None, newest_first: bool = False) -> pd.DataFrame:
+        """
+        Metadata of this ticker's articles, ordered by report_date (ties by uuid).
 
-    def get_news(self, uuid: str) -> pd.DataFrame:
+        With no arguments the whole list is read once and memoised. Any option is pushed
+        into the query instead, so "latest 20 headlines" reads only the rows it returns.
+
+        Args:
+            limit: Maximum rows to return.
+            offset: Rows to skip first; with *limit* this pages through the list.
+            since: Only articles reported on or after this date (YYYY-MM-DD).
+            until: Only articles reported on or before this date (YYYY-MM-DD).
+            newest_first: Order by report_date descending instead of ascending.
+        """
+        if limit is None and not offset and since is None and until is None and not newest_first:
+            if self._list_cache is None:
+                self._list_cache = self._query_news_list()
+            return self._list_cache
+        if limit is not None and limit < 0:
+            raise ValueError(f"limit must not be negative, got {limit}")
+        if offset < 0:
+            raise ValueError(f"offset must not be negative, got {offset}")
+        return self._query_news_list(limit, offset, since, until, newest_first)
+
+    def _query_news_list(self, limit: Optional[int] = None, offset: int = 0, since: Optional[str] = None,
+                         until: Optional[str] = None, newest_first: bool = False) -> pd.DataFrame:
+        date_filters = []
+        if since is not None:
+            date_filters.append(f"AND report_date >= '{_parse_date('since', since):%Y-%m-%d}'")
+        if until is not None:
+            # report_date may carry a time of day, so compare against the start of the next day
+            date_filters.append(f"AND report_date < '{_parse_date('until', until) + pd.Timedelta(days=1):%Y-%m-%d}'")
+        page = []
+        if limit is not None:
+            page.append(f"LIMIT {int(limit)}")
+        if offset:
+            page.append(f"OFFSET {int(offset)}")
         url = self.huggingface_client.get_url_path(stock_news)
-        sql = load_sql(
-            "select_news_by_uuid",
-            uuid=uuid,
-            ticker=self.ticker,
-            url=url,
-        )
-        record = self.duckdb_client.query(sql)
+        sql = load_sql("select_news_list_by_symbol", ticker=self.ticker, url=url,
+                       date_filter="\n  ".join(date_filters), order="DESC" if newest_first else "ASC",
+                       page=" ".join(page))
+        return self.duckdb_client.query(sql)
+
+    def get_news(self, uuid: str) -> pd.DataFrame:
+        record = load_ticker_articles(self.duckdb_client, self.huggingface_client, self.ticker, [uuid])
         if record.empty:
             raise ValueError(f"No news found for uuid {uuid}")
         return record
 
+    def get_articles(self, uuids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Several articles with their paragraphs in batched reads; all of this ticker's when *uuids* is None.
+
+        Returns one row per uuid related to this ticker, with its ``symbol``; see
+        `news_store.load_ticker_articles`. `Tickers.get_articles` lists every related ticker instead.
+        """
+        if uuids is None:
+            uuids = self.get_news_list()['uuid']
+        return load_ticker_articles(self.duckdb_client, self.huggingface_client, self.ticker, uuids)
+
+    def similar_news(self, uuid: str, k: int = 10) -> pd.DataFrame:
+        """Articles about any ticker most similar to *uuid*, by TF-IDF cosine similarity."""
+        return similar_news(self.duckdb_client, self.huggingface_client, uuid, k)
+
+    def get_sentiment(self) -> pd.DataFrame:
+        """Lexicon tone of each article about this ticker; see `news_sentiment`."""
+        return news_sentiment(self.duckdb_client, self.huggingface_client, symbols=[self.ticker])
+
     def print_pretty_table(self, uuid):
         record = self.get_news(uuid)
         data = record.iloc[0]
@@ -108,3 +161,10 @@ class News:
         return self.get_news_list().to_string(
             columns=["uuid", "title", "publisher", "report_date", "type", "link"]
         )
+
+
+def _parse_date(name: str, value: str) -> pd.Timestamp:
+    try:
+        return pd.Timestamp(value).normalize()
+    except ValueError:
+        raise ValueError(f"Invalid {name} date '{value}', expected YYYY-MM-DD")
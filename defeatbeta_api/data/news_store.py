@@ -0,0 +1,123 @@
+import os
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from defeatbeta_api.client.duckdb_client import DuckDBClient
+from defeatbeta_api.client.hugging_face_client import HuggingFaceClient, get_cached_data_update_time
+from defeatbeta_api.data.body_cache import get_body_cache
+from defeatbeta_api.data.sql.sql_loader import load_sql
+from defeatbeta_api.utils.const import stock_news
+from defeatbeta_api.utils.util import update_time_cached, versioned_build
+
+# Articles read per remote query by load_articles and load_ticker_articles
+NEWS_BATCH_SIZE = 200
+
+
+def get_news_links(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient) -> str:
+    """
+    Path of the (symbol, uuid) link table for the current update_time, built on first use.
+
+    ``stock_news`` holds one row per article and related ticker; the link table keeps
+    only that relation, so article bodies can be stored and fetched once per uuid.
+    """
+    update_time = get_cached_data_update_time()
+
+    def build(directory: str) -> None:
+        duckdb_client.execute(load_sql("copy_news_links", url=huggingface_client.get_url_path(stock_news),
+                                       path=os.path.join(directory, 'links.parquet')))
+
+    directory = update_time_cached('news_links', update_time,
+                                   lambda: versioned_build('news_links', update_time, build))
+    return os.path.join(directory, 'links.parquet')
+
+
+def news_uuids(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+               symbols: Iterable[str]) -> List[str]:
+    """Distinct uuids of the articles related to any of *symbols*."""
+    symbols = sorted({str(s).upper() for s in symbols})
+    if not symbols:
+        return []
+    sql = load_sql("select_news_uuids_by_symbols", path=get_news_links(duckdb_client, huggingface_client),
+                   symbols=", ".join(f"'{s}'" for s in symbols))
+    return duckdb_client.query(sql)['uuid'].tolist()
+
+
+def load_articles(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+                  uuids: Iterable[str]) -> pd.DataFrame:
+    """
+    Articles for any set of uuids, each body read from the remote dataset at most once.
+
+    Bodies live in the body cache keyed by uuid alone, so an article related to many
+    tickers is stored once. Uncached articles are read NEWS_BATCH_SIZE at a time, each
+    batch in one query pruned to the row of a single related ticker per article.
+
+    Returns:
+        One row per uuid: uuid, symbols (every related ticker), then the article
+        columns of ``stock_news``, ordered by report_date. Unknown uuids are left out.
+    """
+    uuids = list(dict.fromkeys(str(u) for u in uuids))
+    if not uuids:
+        return pd.DataFrame()
+    links_path = get_news_links(duckdb_client, huggingface_client)
+    url = huggingface_client.get_url_path(stock_news)
+    frames = []
+    for start in range(0, len(uuids), NEWS_BATCH_SIZE):
+        batch = ", ".join(f"'{_quote(u)}'" for u in uuids[start:start + NEWS_BATCH_SIZE])
+        links = duckdb_client.query(load_sql("select_news_links_by_uuids", path=links_path, uuids=batch))
+        if links.empty:
+            continue
+        articles = _fetch_articles(duckdb_client, url, dict(zip(links['uuid'], links['symbol'])), "news_article")
+        frames.append(links[['uuid', 'symbols']].merge(articles, on='uuid'))
+    return _sorted(frames)
+
+
+def load_ticker_articles(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient, symbol: str,
+                         uuids: Iterable[str]) -> pd.DataFrame:
+    """
+    Articles among *uuids* that relate to *symbol*, read without the link table.
+
+    The ticker is known, so each batch query is pruned to ``symbol`` and the
+    universe-wide link table is never built. Bodies are cached per (symbol, uuid),
+    so a cached article is only returned for a ticker it relates to.
+
+    Returns:
+        One row per uuid: uuid, symbol, then the article columns of ``stock_news``,
+        ordered by report_date. Uuids not related to *symbol* are left out.
+    """
+    uuids = list(dict.fromkeys(str(u) for u in uuids))
+    if not uuids:
+        return pd.DataFrame()
+    url = huggingface_client.get_url_path(stock_news)
+    frames = []
+    for start in range(0, len(uuids), NEWS_BATCH_SIZE):
+        owner = {u: symbol for u in uuids[start:start + NEWS_BATCH_SIZE]}
+        articles = _fetch_articles(duckdb_client, url, owner, "news", (symbol,))
+        if not articles.empty:
+            articles.insert(1, 'symbol', symbol)
+            frames.append(articles)
+    return _sorted(frames)
+
+
+def _fetch_articles(duckdb_client: DuckDBClient, url: str, owner: Dict[str, str], kind: str,
+                    scope: Tuple[str, ...] = ()) -> pd.DataFrame:
+    """Bodies of the uuids in *owner*, each read from the ``stock_news`` row of its owning ticker."""
+
+    def batch_sql(missing: List[str]) -> str:
+        rows = ", ".join(f"('{_quote(owner[u])}', '{_quote(u)}')" for u in missing)
+        symbols = ", ".join(f"'{_quote(s)}'" for s in sorted({owner[u] for u in missing}))
+        return load_sql("select_news_by_symbols_and_uuids", url=url, symbols=symbols, rows=rows)
+
+    return get_body_cache().fetch_many(duckdb_client, batch_sql, kind, "uuid", list(owner), scope)
+
+
+def _sorted(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    if not frames:
+        return pd.DataFrame()
+    result = pd.concat(frames, ignore_index=True)
+    return result.sort_values(['report_date', 'uuid'], kind='stable', ignore_index=True)
+
+
+def _quote(value: str) -> str:
+    return str(value).replace("'", "''")
+
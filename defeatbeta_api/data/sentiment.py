@@ -0,0 +1,141 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from defeatbeta_api.client.duckdb_client import DuckDBClient
+from defeatbeta_api.client.hugging_face_client import HuggingFaceClient, get_cached_data_update_time
+from defeatbeta_api.data.sql.sql_loader import load_sql
+from defeatbeta_api.data.transcript_index import get_transcript_index
+from defeatbeta_api.utils.const import stock_news
+from defeatbeta_api.utils.text import tokenize_series
+from defeatbeta_api.utils.util import load_sentiment_lexicon, update_time_cached, versioned_build
+
+# Count columns produced per text, in this order
+CATEGORIES = ('positive', 'negative', 'uncertainty')
+
+_SCORE_CHUNK_SIZE = 20_000
+_ROW_GROUP_SIZE = 8192
+
+# COPY statement joining each kind's documents with their scores
+_COPY_SQL = {'transcripts': "copy_transcript_sentiment", 'news': "copy_news_sentiment"}
+
+
+def score_texts(texts: List[str]) -> np.ndarray:
+    """
+    Lexicon counts of each text as an int64 array of (positive, negative, uncertainty, words) rows.
+
+    Texts are tokenised like the search index (lower-cased words), and every token is
+    looked up in each word list of `load_sentiment_lexicon` in one vectorised pass.
+    """
+    tokens = tokenize_series(pd.Series(texts, dtype=object))
+    lengths = tokens.str.len().to_numpy()
+    counts = np.zeros((len(texts), len(CATEGORIES) + 1), dtype=np.int64)
+    counts[:, -1] = lengths
+    if not lengths.sum():
+        return counts
+    flat = pd.Series(np.concatenate([t for t in tokens if t]))
+    owners = np.repeat(np.arange(len(texts)), lengths)
+    lexicon = load_sentiment_lexicon()
+    for column, category in enumerate(CATEGORIES):
+        hits = flat.isin(lexicon[category]).to_numpy()
+        counts[:, column] = np.bincount(owners[hits], minlength=len(texts))
+    return counts
+
+
+def get_sentiment_table(kind: str, duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+                        processes: Optional[int] = None) -> str:
+    """
+    Path of the 'transcripts' or 'news' score parquet for the current update_time, scoring on first use.
+
+    Transcript paragraphs come from the BM25 index snapshot; news bodies are read once per
+    uuid. Chunks of texts are scored in a pool of *processes* workers (default: CPU count).
+    """
+    if kind not in _COPY_SQL:
+        raise ValueError(f"Unknown sentiment table '{kind}', expected 'transcripts' or 'news'")
+    update_time = get_cached_data_update_time()
+    directory = update_time_cached(('sentiment', kind), update_time, lambda: versioned_build(
+        f'sentiment/{kind}', update_time,
+        lambda building: _build(kind, building, duckdb_client, huggingface_client, processes)))
+    return os.path.join(directory, 'scores.parquet')
+
+
+def transcript_sentiment(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+                         symbols: Optional[Iterable[str]] = None, by: str = 'quarter') -> pd.DataFrame:
+    """
+    Lexicon tone of earnings calls.
+
+    Args:
+        symbols: Tickers to return; None returns the whole universe.
+        by: 'paragraph' for one row per paragraph, 'quarter' to sum them per call.
+
+    Returns:
+        The key columns, counts of positive, negative and uncertainty words, the word
+        count, and tone = (positive - negative) / (positive + negative), 0 without hits.
+    """
+    if by not in ('paragraph', 'quarter'):
+        raise ValueError(f"by must be 'paragraph' or 'quarter', got '{by}'")
+    path = get_sentiment_table('transcripts', duckdb_client, huggingface_client)
+    symbol_filter = ""
+    if symbols is not None:
+        wanted = ", ".join(f"'{s.upper()}'" for s in symbols)
+        symbol_filter = f"WHERE symbol IN ({wanted})" if wanted else "WHERE false"
+    return duckdb_client.query(load_sql(f"select_transcript_sentiment_by_{by}", path=path,
+                                        symbol_filter=symbol_filter))
+
+
+def news_sentiment(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+                   symbols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Lexicon tone of each news article (once per uuid), optionally only articles about *symbols*."""
+    path = get_sentiment_table('news', duckdb_client, huggingface_client)
+    symbol_filter = ""
+    if symbols is not None:
+        wanted = ", ".join(f"'{s.upper()}'" for s in symbols)
+        symbol_filter = f"WHERE list_has_any(string_split(symbols, ','), [{wanted}])"
+    return duckdb_client.query(load_sql("select_news_sentiment", path=path, symbol_filter=symbol_filter))
+
+
+def _build(kind: str, directory: str, duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+           processes: Optional[int]) -> None:
+    if kind == 'transcripts':
+        documents = get_transcript_index(duckdb_client, huggingface_client).paragraphs_path
+        text_column = 'content'
+    else:
+        documents = os.path.join(directory, 'documents.parquet')
+        duckdb_client.execute(load_sql("copy_news_documents", url=huggingface_client.get_url_path(stock_news),
+                                       path=documents, row_group_size=_ROW_GROUP_SIZE))
+        text_column = 'body'
+    scores = os.path.join(directory, 'scores.csv')
+    _write_scores(duckdb_client, documents, text_column, scores, processes)
+    duckdb_client.execute(load_sql(_COPY_SQL[kind], documents=documents, scores=scores,
+                                   path=os.path.join(directory, 'scores.parquet')))
+    os.remove(scores)
+    if kind == 'news':
+        os.remove(documents)
+
+
+def _write_scores(duckdb_client: DuckDBClient, documents: str, text_column: str, scores_path: str,
+                  processes: Optional[int]) -> None:
+    """Score *documents* chunk by chunk in a process pool, appending ``doc_id`` and counts to a CSV."""
+    doc_count = int(duckdb_client.query(f"SELECT count(*) AS n FROM '{documents}'")['n'].iloc[0])
+    processes = processes or os.cpu_count() or 1
+    with open(scores_path, 'w') as out, ProcessPoolExecutor(max_workers=processes) as pool:
+        out.write("doc_id," + ",".join(CATEGORIES) + ",words\n")
+        pending = deque()
+        for start in range(0, doc_count, _SCORE_CHUNK_SIZE):
+            batch = duckdb_client.query(load_sql("select_documents_by_doc_range", path=documents,
+                                                 text_column=text_column, start=start,
+                                                 end=start + _SCORE_CHUNK_SIZE))
+            pending.append((batch['doc_id'].to_numpy(), pool.submit(score_texts, batch['body'].tolist())))
+            # Keep a couple of chunks per worker in flight so memory stays bounded
+            while len(pending) > 2 * processes:
+                _append_scores(out, *pending.popleft())
+        while pending:
+            _append_scores(out, *pending.popleft())
+
+
+def _append_scores(out, doc_ids: np.ndarray, future) -> None:
+    np.savetxt(out, np.column_stack([doc_ids, future.result()]), fmt='%d', delimiter=',')
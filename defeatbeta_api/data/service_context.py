@@ -0,0 +1,38 @@
+import logging
+from threading import Lock
+from typing import Optional
+
+from defeatbeta_api.client.duckdb_client import get_duckdb_client
+from defeatbeta_api.client.duckdb_conf import Configuration
+from defeatbeta_api.client.hugging_face_client import HuggingFaceClient
+from defeatbeta_api.data.company_meta import CompanyMeta
+from defeatbeta_api.data.treasure import Treasure
+
+_contexts = {}
+_lock = Lock()
+
+def get_service_context(http_proxy: Optional[str] = None, log_level: Optional[str] = logging.INFO,
+                        config: Optional[Configuration] = None) -> "ServiceContext":
+    # Keyed on the configuration's values, so equal Configuration() objects share one context
+    key = (http_proxy, log_level, None if config is None else tuple(sorted(vars(config).items())))
+    context = _contexts.get(key)
+    if context is None:
+        with _lock:
+            context = _contexts.get(key)
+            if context is None:
+                context = ServiceContext(http_proxy=http_proxy, log_level=log_level, config=config)
+                _contexts[key] = context
+    return context
+
+class ServiceContext:
+    """Clients shared by every Ticker created with the same proxy, log level and config."""
+
+    def __init__(self, http_proxy: Optional[str] = None, log_level: Optional[str] = logging.INFO,
+                 config: Optional[Configuration] = None):
+        self.http_proxy = http_proxy
+        self.log_level = log_level
+        self.config = config
+        self.duckdb_client = get_duckdb_client(http_proxy=http_proxy, log_level=log_level, config=config)
+        self.huggingface_client = HuggingFaceClient()
+        self.treasure = Treasure(http_proxy=http_proxy, log_level=log_level, config=config)
+        self.company_meta = CompanyMeta(http_proxy=http_proxy, log_level=log_level, config=config)
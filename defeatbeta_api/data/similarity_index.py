@@ -0,0 +1,215 @@
+import os
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from defeatbeta_api.client.duckdb_client import DuckDBClient
+from defeatbeta_api.client.hugging_face_client import HuggingFaceClient, get_cached_data_update_time
+from defeatbeta_api.data.sql.sql_loader import load_sql
+from defeatbeta_api.utils.const import stock_earning_call_transcripts, stock_news
+from defeatbeta_api.utils.text import tokenize_series
+from defeatbeta_api.utils.util import update_time_cached, versioned_build
+
+# Unigrams and bigrams are hashed into this many buckets (a power of two)
+FEATURE_BITS = 20
+# Only the highest-weighted features of each document are kept, which keeps postings short
+TOP_FEATURES = 256
+
+_BUILD_BATCH_SIZE = 2000
+_ROW_GROUP_SIZE = 2048
+# Odd multiplier mixing the left token hash into a bigram hash
+_BIGRAM_SEED = np.uint64(0x9E3779B97F4A7C15)
+
+SOURCES = {
+    'transcripts': (stock_earning_call_transcripts, 'copy_transcript_documents'),
+    'news': (stock_news, 'copy_news_documents'),
+}
+
+def get_similarity_index(kind: str, duckdb_client: DuckDBClient,
+                         huggingface_client: HuggingFaceClient) -> "SimilarityIndex":
+    """Return the 'transcripts' or 'news' index for the current update_time, building it on first use."""
+    if kind not in SOURCES:
+        raise ValueError(f"Unknown similarity index '{kind}', expected one of {tuple(SOURCES)}")
+    update_time = get_cached_data_update_time()
+    return update_time_cached(('similarity_index', kind), update_time,
+                              lambda: SimilarityIndex.open_or_build(kind, duckdb_client, huggingface_client, update_time))
+
+
+class SimilarityIndex:
+    """
+    Hashed TF-IDF vectors of whole documents, stored on disk per update_time.
+
+    A document is one earnings call (all paragraphs) or one news article (title and
+    paragraphs, once per uuid). Its unigrams and bigrams are hashed into
+    ``2 ** FEATURE_BITS`` buckets, weighted ``(1 + log tf) * idf``, cut to the
+    TOP_FEATURES heaviest and L2-normalised, so cosine similarity is a dot product.
+
+    ``<index dir>/similarity/<kind>/<update_time>/`` holds ``documents.parquet`` (metadata
+    per ``doc_id``) and the memory-mapped sparse matrix twice: by row (``row_offsets``,
+    ``row_features``, ``row_weights``) to read a document's vector, and by column
+    (``column_offsets``, ``column_docs``, ``column_weights``) to score every document
+    sharing one of its features.
+    """
+
+    _ARRAYS = ('row_offsets', 'row_features', 'row_weights', 'column_offsets', 'column_docs', 'column_weights')
+
+    def __init__(self, directory: str, duckdb_client: DuckDBClient):
+        self.directory = directory
+        for name in self._ARRAYS:
+            setattr(self, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r'))
+        self.documents = duckdb_client.query(
+            f"SELECT * FROM '{os.path.join(directory, 'documents.parquet')}' ORDER BY doc_id")
+        self.doc_count = len(self.documents)
+
+    @classmethod
+    def open_or_build(cls, kind: str, duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+                      update_time: str) -> "SimilarityIndex":
+        directory = versioned_build(f'similarity/{kind}', update_time,
+                                    lambda building: cls.build(kind, building, duckdb_client, huggingface_client))
+        return cls(directory, duckdb_client)
+
+    @staticmethod
+    def build(kind: str, directory: str, duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient) -> None:
+        """Snapshot the documents of *kind* into *directory* and write their vectors next to them."""
+        table, copy_sql = SOURCES[kind]
+        corpus_path = os.path.join(directory, 'corpus.parquet')
+        duckdb_client.execute(load_sql(copy_sql, url=huggingface_client.get_url_path(table), path=corpus_path,
+                                       row_group_size=_ROW_GROUP_SIZE))
+        doc_count = int(duckdb_client.query(f"SELECT count(*) AS n FROM '{corpus_path}'")['n'].iloc[0])
+
+        # First pass: hashed term counts per document, spilled to disk, and document frequencies
+        dimension = 1 << FEATURE_BITS
+        document_frequency = np.zeros(dimension, dtype=np.int64)
+        batches = []
+        for start in range(0, doc_count, _BUILD_BATCH_SIZE):
+            batch = duckdb_client.query(load_sql("select_documents_by_doc_range", path=corpus_path,
+                                                 text_column="body", start=start, end=start + _BUILD_BATCH_SIZE))
+            counts_path = os.path.join(directory, f"counts-{start}.npy")
+            docs, features, counts = _hashed_counts(batch['doc_id'].to_numpy(), batch['body'])
+            np.save(counts_path, np.stack([docs, features, counts]))
+            document_frequency += np.bincount(features, minlength=dimension)
+            batches.append(counts_path)
+
+        # Second pass: TF-IDF weights, pruned to each document's heaviest features
+        idf = (np.log((doc_count + 1) / (document_frequency + 1)) + 1).astype(np.float32)
+        rows, row_features, row_weights = [], [], []
+        for counts_path in batches:
+            docs, features, counts = np.load(counts_path)
+            os.remove(counts_path)
+            weights = (1 + np.log(counts)).astype(np.float32) * idf[features]
+            keep = _top_per_document(docs, weights, TOP_FEATURES)
+            rows.append(docs[keep])
+            row_features.append(features[keep])
+            row_weights.append(weights[keep])
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        row_features = np.concatenate(row_features) if row_features else np.zeros(0, dtype=np.int32)
+        row_weights = np.concatenate(row_weights) if row_weights else np.zeros(0, dtype=np.float32)
+        norms = np.sqrt(np.bincount(rows, weights=row_weights.astype(np.float64) ** 2, minlength=doc_count))
+        row_weights = (row_weights / np.where(norms > 0, norms, 1)[rows]).astype(np.float32)
+
+        order = np.lexsort((row_features, rows))
+        column_order = np.lexsort((rows, row_features))
+        arrays = {
+            'row_offsets': _offsets(rows, doc_count),
+            'row_features': row_features[order],
+            'row_weights': row_weights[order],
+            'column_offsets': _offsets(row_features, dimension),
+            'column_docs': rows[column_order],
+            'column_weights': row_weights[column_order],
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+        duckdb_client.execute(load_sql("copy_similarity_document_metadata", source=corpus_path,
+                                       path=os.path.join(directory, 'documents.parquet')))
+        os.remove(corpus_path)
+
+    def similar(self, doc_id: int, k: int = 10) -> pd.DataFrame:
+        """
+        The *k* documents most similar to *doc_id* by cosine similarity, best first.
+
+        Returns:
+            The document metadata columns plus ``score``; *doc_id* itself is excluded.
+        """
+        if k <= 0:
+            raise ValueError(f"k must be positive, got {k}")
+        lo, hi = self.row_offsets[doc_id], self.row_offsets[doc_id + 1]
+        features = np.asarray(self.row_features[lo:hi])
+        weights = np.asarray(self.row_weights[lo:hi])
+        starts, ends = self.column_offsets[features], self.column_offsets[features + 1]
+        if not len(features) or not (ends - starts).any():
+            return self.documents.iloc[0:0].assign(score=pd.Series(dtype=float))
+
+        docs = np.concatenate([self.column_docs[s:e] for s, e in zip(starts, ends)])
+        products = np.concatenate([self.column_weights[s:e] * w for s, e, w in zip(starts, ends, weights)])
+        candidates, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=products)
+        scores[candidates == doc_id] = -np.inf
+        top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        top = top[np.isfinite(scores[top])]
+
+        result = self.documents.iloc[candidates[top]].reset_index(drop=True)
+        result['score'] = scores[top]
+        return result.drop(columns=['doc_id'])
+
+    def doc_id(self, **key) -> int:
+        """``doc_id`` of the document whose metadata matches every ``column=value`` in *key*."""
+        mask = np.ones(self.doc_count, dtype=bool)
+        for column, value in key.items():
+            mask &= (self.documents[column] == value).to_numpy()
+        matches = np.flatnonzero(mask)
+        if not len(matches):
+            raise ValueError(f"No document found for {key}")
+        return int(self.documents['doc_id'].iloc[matches[0]])
+
+
+def similar_transcripts(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient, symbol: str,
+                        fiscal_year: int, fiscal_quarter: int, k: int = 10) -> pd.DataFrame:
+    """Earnings calls most similar to *symbol*'s FY*fiscal_year* Q*fiscal_quarter* call."""
+    index = get_similarity_index('transcripts', duckdb_client, huggingface_client)
+    doc_id = index.doc_id(symbol=symbol.upper(), fiscal_year=fiscal_year, fiscal_quarter=fiscal_quarter)
+    return index.similar(doc_id, k)
+
+
+def similar_news(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient, uuid: str,
+                 k: int = 10) -> pd.DataFrame:
+    """News articles most similar to the article *uuid*."""
+    index = get_similarity_index('news', duckdb_client, huggingface_client)
+    return index.similar(index.doc_id(uuid=uuid), k)
+
+
+def _hashed_counts(doc_ids: np.ndarray, bodies: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(doc, feature, count) int32 triples of the hashed unigrams and bigrams of each body."""
+    tokens = tokenize_series(bodies).reset_index(drop=True)
+    lengths = tokens.str.len().to_numpy()
+    if not lengths.sum():
+        empty = np.zeros(0, dtype=np.int32)
+        return empty, empty, empty
+    flat = np.concatenate([t for t in tokens if t]).astype(object)
+    hashes = pd.util.hash_array(flat)
+    owners = np.repeat(doc_ids.astype(np.int32), lengths)
+
+    # A bigram pairs each token with the next one of the same document
+    same_doc = owners[1:] == owners[:-1]
+    bigrams = hashes[:-1][same_doc] * _BIGRAM_SEED + hashes[1:][same_doc]
+    mask = np.uint64((1 << FEATURE_BITS) - 1)
+    features = np.concatenate([hashes & mask, bigrams & mask]).astype(np.int32)
+    owners = np.concatenate([owners, owners[1:][same_doc]])
+
+    pairs = pd.DataFrame({'doc': owners, 'feature': features}).value_counts(sort=False)
+    return (pairs.index.get_level_values('doc').to_numpy().astype(np.int32),
+            pairs.index.get_level_values('feature').to_numpy().astype(np.int32),
+            np.minimum(pairs.to_numpy(), np.iinfo(np.int32).max).astype(np.int32))
+
+
+def _top_per_document(docs: np.ndarray, weights: np.ndarray, limit: int) -> np.ndarray:
+    """Positions of the *limit* heaviest entries of every document."""
+    order = np.lexsort((-weights, docs))
+    sorted_docs = docs[order]
+    first = np.searchsorted(sorted_docs, sorted_docs, side='left')
+    return np.sort(order[np.arange(len(order)) - first < limit])
+
+
+def _offsets(keys: np.ndarray, size: int) -> np.ndarray:
+    return np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=size))]).astype(np.int64)
@@ -0,0 +1,23 @@
+COPY (
+    SELECT
+        (row_number() OVER (ORDER BY uuid) - 1)::INTEGER AS doc_id,
+        uuid,
+        title,
+        publisher,
+        report_date,
+        symbols,
+        body
+    FROM (
+        SELECT
+            uuid,
+            any_value(title)       AS title,
+            any_value(publisher)   AS publisher,
+            any_value(report_date) AS report_date,
+            string_agg(DISTINCT symbol, ',' ORDER BY symbol) AS symbols,
+            any_value(title || ' ' || array_to_string(
+                list_transform(news, p -> coalesce(p.highlight, '') || ' ' || coalesce(p.paragraph, '')), ' ')) AS body
+        FROM '{url}'
+        GROUP BY uuid
+    )
+    ORDER BY doc_id
+) TO '{path}' (FORMAT parquet, COMPRESSION zstd, ROW_GROUP_SIZE {row_group_size})
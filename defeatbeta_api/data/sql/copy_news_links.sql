@@ -0,0 +1,5 @@
+COPY (
+    SELECT DISTINCT symbol, uuid
+    FROM '{url}'
+    ORDER BY symbol, uuid
+) TO '{path}' (FORMAT parquet, COMPRESSION zstd)
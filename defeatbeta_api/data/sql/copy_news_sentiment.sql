@@ -0,0 +1,15 @@
+COPY (
+    SELECT
+        d.uuid,
+        d.title,
+        d.publisher,
+        d.report_date,
+        d.symbols,
+        s.positive,
+        s.negative,
+        s.uncertainty,
+        s.words
+    FROM '{documents}' d
+    JOIN read_csv('{scores}', header = true) s USING (doc_id)
+    ORDER BY d.doc_id
+) TO '{path}' (FORMAT parquet, COMPRESSION zstd)
@@ -0,0 +1,5 @@
+COPY (
+    SELECT * EXCLUDE (body)
+    FROM '{source}'
+    ORDER BY doc_id
+) TO '{path}' (FORMAT parquet, COMPRESSION zstd)
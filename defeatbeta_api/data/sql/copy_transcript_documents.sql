@@ -0,0 +1,11 @@
+COPY (
+    SELECT
+        (row_number() OVER (ORDER BY symbol, fiscal_year, fiscal_quarter) - 1)::INTEGER AS doc_id,
+        symbol,
+        fiscal_year,
+        fiscal_quarter,
+        report_date,
+        array_to_string(list_transform(transcripts, p -> p.content), ' ') AS body
+    FROM '{url}'
+    ORDER BY doc_id
+) TO '{path}' (FORMAT parquet, COMPRESSION zstd, ROW_GROUP_SIZE {row_group_size})
@@ -0,0 +1,23 @@
+COPY (
+    SELECT
+        (row_number() OVER (ORDER BY symbol, fiscal_year, fiscal_quarter, paragraph_number) - 1)::INTEGER AS doc_id,
+        symbol,
+        fiscal_year,
+        fiscal_quarter,
+        report_date,
+        paragraph_number,
+        speaker,
+        content
+    FROM (
+        SELECT
+            symbol,
+            fiscal_year,
+            fiscal_quarter,
+            report_date,
+            UNNEST(transcripts).paragraph_number AS paragraph_number,
+            UNNEST(transcripts).speaker          AS speaker,
+            UNNEST(transcripts).content          AS content
+        FROM '{url}'
+    )
+    ORDER BY doc_id
+) TO '{path}' (FORMAT parquet, COMPRESSION zstd, ROW_GROUP_SIZE {row_group_size})
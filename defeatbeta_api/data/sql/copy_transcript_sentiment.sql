@@ -0,0 +1,16 @@
+COPY (
+    SELECT
+        p.symbol,
+        p.fiscal_year,
+        p.fiscal_quarter,
+        p.report_date,
+        p.paragraph_number,
+        p.speaker,
+        s.positive,
+        s.negative,
+        s.uncertainty,
+        s.words
+    FROM '{documents}' p
+    JOIN read_csv('{scores}', header = true) s USING (doc_id)
+    ORDER BY p.doc_id
+) TO '{path}' (FORMAT parquet, COMPRESSION zstd)
@@ -0,0 +1,4 @@
+SELECT {columns} FROM '{url}'
+WHERE symbol = '{ticker}'
+    {date_filter}
+ORDER BY report_date ASC
\ No newline at end of file
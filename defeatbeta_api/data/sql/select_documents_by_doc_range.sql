@@ -0,0 +1,5 @@
+SELECT doc_id, {text_column} AS body
+FROM '{path}'
+WHERE doc_id >= {start}
+  AND doc_id < {end}
+ORDER BY doc_id
@@ -0,0 +1,48 @@
+WITH metric_data AS (
+    SELECT
+        symbol,
+        CAST(report_date AS DATE) AS report_date,
+        item_name,
+        item_value,
+        -- Fiscal period key: month index of the nearest month end, so 52/53-week fiscal
+        -- years (e.g. 2023-09-30 vs 2024-09-28) land on the same period
+        YEAR(CAST(report_date AS DATE) + INTERVAL 15 DAY) * 12
+            + MONTH(CAST(report_date AS DATE) + INTERVAL 15 DAY) AS period_key
+    FROM '{url}'
+    WHERE symbol IN ({symbols})
+        AND item_name IN ({item_names})
+        AND period_type = '{period_type}'
+        AND report_date != 'TTM'
+        AND item_value IS NOT NULL
+        {finance_type_filter}
+),
+lagged AS (
+    SELECT
+        symbol,
+        report_date,
+        item_name,
+        item_value,
+        -- A zero-width RANGE frame looks up the period exactly N months back,
+        -- yielding NULL (not a wrong row) when that period is missing
+        FIRST_VALUE(item_value) OVER (
+            PARTITION BY symbol, item_name
+            ORDER BY period_key
+            RANGE BETWEEN 12 PRECEDING AND 12 PRECEDING
+        ) AS prev_year_value
+        {lag_columns}
+    FROM metric_data
+)
+SELECT
+    symbol,
+    report_date,
+    item_name,
+    item_value,
+    prev_year_value,
+    CASE
+        WHEN prev_year_value IS NOT NULL AND prev_year_value != 0
+        THEN ROUND((item_value - prev_year_value) / ABS(prev_year_value), 4)
+        ELSE NULL
+    END AS yoy_growth
+    {growth_columns}
+FROM lagged
+ORDER BY symbol, item_name, report_date
@@ -0,0 +1,6 @@
+SELECT * EXCLUDE (symbol)
+FROM '{url}'
+WHERE symbol IN ({symbols})
+  AND (symbol, uuid) IN ({rows})
+-- stock_news may repeat a (symbol, uuid) row; keep one per article
+QUALIFY row_number() OVER (PARTITION BY uuid) = 1
@@ -1,5 +0,0 @@
-SELECT *
-FROM '{url}'
-WHERE uuid = '{uuid}'
-  AND symbol = '{ticker}'
-LIMIT 1
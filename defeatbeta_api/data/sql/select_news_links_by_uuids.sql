@@ -0,0 +1,4 @@
+SELECT uuid, min(symbol) AS symbol, list(symbol ORDER BY symbol) AS symbols
+FROM '{path}'
+WHERE uuid IN ({uuids})
+GROUP BY uuid
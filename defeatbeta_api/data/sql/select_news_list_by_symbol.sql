@@ -1,4 +1,6 @@
 SELECT uuid, symbol, title, publisher, report_date, type, link
 FROM '{url}'
 WHERE symbol = '{ticker}'
-ORDER BY report_date ASC
+  {date_filter}
+ORDER BY report_date {order}, uuid {order}
+{page}
@@ -0,0 +1,14 @@
+SELECT
+    uuid,
+    title,
+    publisher,
+    report_date,
+    symbols,
+    positive,
+    negative,
+    uncertainty,
+    words,
+    coalesce((positive - negative)::DOUBLE / nullif(positive + negative, 0), 0) AS tone
+FROM '{path}'
+{symbol_filter}
+ORDER BY report_date, uuid
@@ -0,0 +1,4 @@
+SELECT DISTINCT uuid
+FROM '{path}'
+WHERE symbol IN ({symbols})
+ORDER BY uuid
@@ -7,7 +7,7 @@ WITH roe_table AS (
             FROM
                 '{url}'
             WHERE
-                symbol = '{ticker}'
+                symbol IN ({symbols})
                 AND item_name IN ('net_income_common_stockholders', 'total_assets')
                 AND report_date != 'TTM'
                 AND period_type = 'quarterly'
@@ -39,7 +39,7 @@ base_data_rn AS (
         report_year,
         report_quarter,
         continuous_id,
-        ROW_NUMBER() OVER (ORDER BY continuous_id ASC) AS rn_asc
+        ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY continuous_id ASC) AS rn_asc
     FROM
         base_data
 ),
@@ -47,7 +47,9 @@ base_data_rn AS (
 grouped_data AS (
     SELECT
         *,
-        continuous_id - rn_asc AS group_id
+        continuous_id - rn_asc AS group_id,
+        -- Each symbol keeps its own latest run of consecutive quarters
+        FIRST_VALUE(continuous_id - rn_asc) OVER (PARTITION BY symbol ORDER BY continuous_id DESC) AS latest_group_id
     FROM
         base_data_rn
 ),
@@ -58,21 +60,13 @@ base_data_window AS (
         report_date,
         net_income_common_stockholders,
         total_assets,
-        ROW_NUMBER() OVER (ORDER BY report_date ASC) AS rn
+        ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY report_date ASC) AS rn
     FROM
-        grouped_data t1
-        JOIN (
-            SELECT
-                group_id
-            FROM
-                grouped_data
-            ORDER BY
-                continuous_id DESC
-                LIMIT 1
-        ) t2
-    ON t1.group_id = t2.group_id
+        grouped_data
+    WHERE
+        group_id = latest_group_id
     ORDER BY
-        continuous_id ASC
+        symbol, continuous_id ASC
 ),
 
 assets_with_lag AS (
@@ -111,4 +105,4 @@ select symbol,
                     net_income_common_stockholders / avg_assets
             END
         , 4) AS roa
-    from asserts_avg order by report_date;
+    from asserts_avg order by symbol, report_date;
@@ -8,7 +8,7 @@ WITH roce_table AS (
     FROM
         '{url}'
     WHERE
-        symbol = '{ticker}'
+        symbol IN ({symbols})
         AND item_name IN ('ebit', 'total_assets', 'current_liabilities')
         AND report_date != 'TTM'
         AND period_type = 'quarterly'
@@ -32,7 +32,7 @@ base_data AS (
 base_data_rn AS (
     SELECT
         *,
-        ROW_NUMBER() OVER (ORDER BY continuous_id ASC) AS rn_asc
+        ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY continuous_id ASC) AS rn_asc
     FROM
         base_data
 ),
@@ -40,7 +40,9 @@ base_data_rn AS (
 grouped_data AS (
     SELECT
         *,
-        continuous_id - rn_asc AS group_id
+        continuous_id - rn_asc AS group_id,
+        -- Each symbol keeps its own latest run of consecutive quarters
+        FIRST_VALUE(continuous_id - rn_asc) OVER (PARTITION BY symbol ORDER BY continuous_id DESC) AS latest_group_id
     FROM
         base_data_rn
 ),
@@ -51,17 +53,13 @@ base_data_window AS (
         report_date,
         ebit,
         capital_employed,
-        ROW_NUMBER() OVER (ORDER BY report_date ASC) AS rn
+        ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY report_date ASC) AS rn
     FROM
-        grouped_data t1
-        JOIN (
-            SELECT group_id
-            FROM grouped_data
-            ORDER BY continuous_id DESC
-            LIMIT 1
-        ) t2
-        ON t1.group_id = t2.group_id
-    ORDER BY continuous_id ASC
+        grouped_data
+    WHERE
+        group_id = latest_group_id
+    ORDER BY
+        symbol, continuous_id ASC
 ),
 
 capital_employed_with_lag AS (
@@ -102,4 +100,4 @@ SELECT
         END
     , 4) AS roce
 FROM capital_employed_avg
-ORDER BY report_date;
+ORDER BY symbol, report_date;
@@ -8,7 +8,7 @@ WITH roic_table AS (
  FROM
      '{url}'
  WHERE
-     symbol = '{ticker}'
+     symbol IN ({symbols})
      AND item_name IN ('ebit', 'tax_rate_for_calcs', 'invested_capital')
      AND report_date != 'TTM'
      AND period_type = 'quarterly'
@@ -44,7 +44,7 @@ base_data_rn AS (
       report_year,
       report_quarter,
       continuous_id,
-      ROW_NUMBER() OVER (ORDER BY continuous_id ASC) AS rn_asc
+      ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY continuous_id ASC) AS rn_asc
   FROM
       base_data
 ),
@@ -52,7 +52,9 @@ base_data_rn AS (
 grouped_data AS (
   SELECT
       *,
-      continuous_id - rn_asc AS group_id
+      continuous_id - rn_asc AS group_id,
+      -- Each symbol keeps its own latest run of consecutive quarters
+      FIRST_VALUE(continuous_id - rn_asc) OVER (PARTITION BY symbol ORDER BY continuous_id DESC) AS latest_group_id
   FROM
       base_data_rn
 ),
@@ -65,21 +67,13 @@ base_data_window AS (
       tax_rate_for_calcs,
       nopat,
       invested_capital,
-      ROW_NUMBER() OVER (ORDER BY report_date ASC) AS rn
+      ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY report_date ASC) AS rn
   FROM
-      grouped_data t1
-      JOIN (
-          SELECT
-              group_id
-          FROM
-              grouped_data
-          ORDER BY
-              continuous_id DESC
-              LIMIT 1
-      ) t2
-  ON t1.group_id = t2.group_id
+      grouped_data
+  WHERE
+      group_id = latest_group_id
   ORDER BY
-      continuous_id ASC
+      symbol, continuous_id ASC
 ),
 
 invested_capital_with_lag AS (
@@ -127,4 +121,4 @@ SELECT
         END
     , 4) AS roic
 FROM invested_capital_avg
-ORDER BY report_date;
\ No newline at end of file
+ORDER BY symbol, report_date;
\ No newline at end of file
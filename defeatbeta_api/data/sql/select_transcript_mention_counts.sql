@@ -0,0 +1,30 @@
+WITH paragraphs AS (
+    SELECT
+        symbol,
+        fiscal_year,
+        fiscal_quarter,
+        report_date,
+        UNNEST(transcripts).speaker AS speaker,
+        UNNEST(transcripts).content AS content
+    FROM '{url}'
+    {symbol_filter}
+),
+terms(term, pattern) AS (
+    VALUES {terms}
+),
+matches AS (
+    SELECT
+        {group_columns},
+        t.term,
+        len(regexp_extract_all(coalesce(p.content, ''), t.pattern)) AS mentions
+    FROM paragraphs p
+    CROSS JOIN terms t
+)
+SELECT
+    {group_columns},
+    term,
+    sum(mentions)::BIGINT AS mentions,
+    count(*) FILTER (WHERE mentions > 0) AS paragraphs
+FROM matches
+GROUP BY {group_columns}, term
+ORDER BY {group_columns}, term
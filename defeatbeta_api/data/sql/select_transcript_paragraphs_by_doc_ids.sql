@@ -0,0 +1,3 @@
+SELECT doc_id, symbol, fiscal_year, fiscal_quarter, report_date, paragraph_number, speaker, content
+FROM '{path}'
+WHERE doc_id IN ({doc_ids})
@@ -0,0 +1,5 @@
+SELECT doc_id, symbol, report_date, content
+FROM '{path}'
+WHERE doc_id >= {start}
+  AND doc_id < {end}
+ORDER BY doc_id
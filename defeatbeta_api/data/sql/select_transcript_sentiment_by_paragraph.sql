@@ -0,0 +1,15 @@
+SELECT
+    symbol,
+    fiscal_year,
+    fiscal_quarter,
+    report_date,
+    paragraph_number,
+    speaker,
+    positive,
+    negative,
+    uncertainty,
+    words,
+    coalesce((positive - negative)::DOUBLE / nullif(positive + negative, 0), 0) AS tone
+FROM '{path}'
+{symbol_filter}
+ORDER BY symbol, fiscal_year, fiscal_quarter, paragraph_number
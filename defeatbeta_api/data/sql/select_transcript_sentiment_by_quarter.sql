@@ -0,0 +1,14 @@
+SELECT
+    symbol,
+    fiscal_year,
+    fiscal_quarter,
+    report_date,
+    sum(positive)::BIGINT    AS positive,
+    sum(negative)::BIGINT    AS negative,
+    sum(uncertainty)::BIGINT AS uncertainty,
+    sum(words)::BIGINT       AS words,
+    coalesce((sum(positive) - sum(negative))::DOUBLE / nullif(sum(positive) + sum(negative), 0), 0) AS tone
+FROM '{path}'
+{symbol_filter}
+GROUP BY symbol, fiscal_year, fiscal_quarter, report_date
+ORDER BY symbol, fiscal_year, fiscal_quarter
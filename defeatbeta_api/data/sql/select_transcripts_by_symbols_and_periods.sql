@@ -0,0 +1,12 @@
+SELECT
+    symbol,
+    fiscal_year,
+    fiscal_quarter,
+    report_date,
+    UNNEST(transcripts).paragraph_number AS paragraph_number,
+    UNNEST(transcripts).speaker          AS speaker,
+    UNNEST(transcripts).content          AS content
+FROM '{url}'
+WHERE symbol IN ({symbols})
+  {period_filter}
+ORDER BY symbol, fiscal_year, fiscal_quarter, paragraph_number
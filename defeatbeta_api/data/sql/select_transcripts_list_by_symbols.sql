@@ -0,0 +1,4 @@
+SELECT symbol, fiscal_year, fiscal_quarter, report_date
+FROM '{url}'
+WHERE symbol IN ({symbols})
+ORDER BY symbol, fiscal_year, fiscal_quarter
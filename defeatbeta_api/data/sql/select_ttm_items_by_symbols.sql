@@ -0,0 +1,39 @@
+WITH quarterly_data AS (
+    SELECT
+        symbol,
+        report_date,
+        item_name,
+        item_value,
+        YEAR(report_date::DATE) * 4 + QUARTER(report_date::DATE) AS continuous_id
+    FROM
+        '{url}'
+    WHERE
+        symbol IN ({symbols})
+        AND item_name IN ({item_names})
+        AND period_type = 'quarterly'
+        AND item_value IS NOT NULL
+        AND report_date != 'TTM'
+),
+sliding_window AS (
+    SELECT
+        symbol,
+        report_date,
+        item_name,
+        SUM(item_value) OVER w AS ttm_value,
+        COUNT(*) OVER w AS quarter_count,
+        -- Ensure the 4 quarters in the window are truly consecutive:
+        -- max continuous_id - min continuous_id must equal 3
+        MAX(continuous_id) OVER w - MIN(continuous_id) OVER w AS id_range
+        {detail_column}
+    FROM quarterly_data
+    -- One shared window per (symbol, item): every item and symbol is computed in a single scan
+    WINDOW w AS (
+        PARTITION BY symbol, item_name
+        ORDER BY CAST(report_date AS DATE)
+        ROWS BETWEEN 3 PRECEDING AND CURRENT ROW
+    )
+)
+SELECT * EXCLUDE (quarter_count, id_range)
+FROM sliding_window
+WHERE quarter_count = 4 AND id_range = 3
+ORDER BY symbol, item_name, report_date
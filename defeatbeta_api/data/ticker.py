@@ -1,4 +1,5 @@
 import logging
+import re
 from collections import defaultdict
 from decimal import Decimal
 from typing import Optional, List, Dict
@@ -9,21 +10,18 @@ from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.formatting.rule import CellIsRule
 from openpyxl.workbook import Workbook
 
-from defeatbeta_api.client.duckdb_client import get_duckdb_client
 from defeatbeta_api.client.duckdb_conf import Configuration
-from defeatbeta_api.client.hugging_face_client import HuggingFaceClient
 from defeatbeta_api.data.balance_sheet import BalanceSheet
 from defeatbeta_api.data.finance_item import FinanceItem
 from defeatbeta_api.data.finance_value import FinanceValue
 from defeatbeta_api.data.income_statement import IncomeStatement
 from defeatbeta_api.data.news import News
 from defeatbeta_api.data.print_visitor import PrintVisitor
+from defeatbeta_api.data.service_context import ServiceContext, get_service_context
 from defeatbeta_api.data.sql.sql_loader import load_sql
 from defeatbeta_api.data.statement import Statement
 from defeatbeta_api.data.stock_statement import StockStatement
 from defeatbeta_api.data.transcripts import Transcripts
-from defeatbeta_api.data.treasure import Treasure
-from defeatbeta_api.data.company_meta import CompanyMeta
 from defeatbeta_api.utils.case_insensitive_dict import CaseInsensitiveDict
 from defeatbeta_api.utils.const import stock_profile, stock_earning_calendar, stock_officers, \
     stock_split_events, \
@@ -31,29 +29,57 @@ from defeatbeta_api.utils.const import stock_profile, stock_earning_calendar, st
     stock_prices, stock_statement, income_statement, balance_sheet, cash_flow, quarterly, annual, \
     stock_earning_call_transcripts, stock_news, stock_revenue_breakdown, stock_shares_outstanding, exchange_rate, \
     stock_sec_filing
+from defeatbeta_api.utils.dcf import PROJECTION_YEARS, project_dcf
 from defeatbeta_api.utils.util import load_finance_template, parse_all_title_keys, income_statement_template_type, \
     balance_sheet_template_type, cash_flow_template_type, sp500_cagr_returns_rolling, validate_dcf_directory, \
     in_notebook
 
 
 class Ticker:
-    def __init__(self, ticker, http_proxy: Optional[str] = None, log_level: Optional[str] = logging.INFO, config: Optional[Configuration] = None):
+    # Point-in-time metrics supported by as_of() and the underlying series each one needs
+    _AS_OF_METRICS = {
+        'close_price': ['price'],
+        'ttm_eps': ['eps'],
+        'ttm_pe': ['price', 'eps'],
+        'shares_outstanding': ['shares'],
+        'market_capitalization': ['price', 'shares'],
+        'ttm_revenue_usd': ['revenue'],
+        'ps_ratio': ['price', 'shares', 'revenue'],
+        'book_value_of_equity_usd': ['bve'],
+        'pb_ratio': ['price', 'shares', 'bve'],
+        'ttm_ebitda_usd': ['ebitda'],
+        'ttm_fcf_usd': ['fcf'],
+        'ttm_net_income_usd': ['net_income'],
+        'enterprise_value': ['price', 'shares', 'ev'],
+        'ev_to_revenue': ['price', 'shares', 'ev', 'revenue'],
+        'ev_to_ebitda': ['price', 'shares', 'ev', 'ebitda'],
+    }
+
+    # Fallback publication lag for quarters missing from the earnings calendar
+    _AS_OF_FALLBACK_LAG = pd.Timedelta(days=90)
+
+    # DCF inputs that dcf_monte_carlo() can draw from a distribution, keyed to project_dcf() arguments
+    _DCF_RANDOM_INPUTS = {
+        'wacc': 'discount_rate',
+        'growth_rate_terminal': 'growth_rate_terminal',
+        'growth_rate_1_5y': 'growth_rate_1_5y',
+        'revenue_growth_1_5y': 'revenue_growth_1_5y',
+        'base_fcf': 'base_fcf',
+    }
+
+    def __init__(self, ticker, http_proxy: Optional[str] = None, log_level: Optional[str] = logging.INFO, config: Optional[Configuration] = None,
+                 context: Optional[ServiceContext] = None):
+        if context is None:
+            context = get_service_context(http_proxy=http_proxy, log_level=log_level, config=config)
         self.ticker = ticker.upper()
-        self.http_proxy = http_proxy
-        self.config = config
-        self.duckdb_client = get_duckdb_client(http_proxy=self.http_proxy, log_level=log_level, config=config)
-        self.huggingface_client = HuggingFaceClient()
-        self.log_level = log_level
-        self.treasure = Treasure(
-            http_proxy=self.http_proxy,
-            log_level=self.log_level,
-            config=config
-        )
-        self.company_meta = CompanyMeta(
-            http_proxy=self.http_proxy,
-            log_level=self.log_level,
-            config=config
-        )
+        self.context = context
+        self.http_proxy = context.http_proxy
+        self.config = context.config
+        self.log_level = context.log_level
+        self.duckdb_client = context.duckdb_client
+        self.huggingface_client = context.huggingface_client
+        self.treasure = context.treasure
+        self.company_meta = context.company_meta
 
     def info(self) -> pd.DataFrame:
         return self._query_data(stock_profile)
@@ -78,8 +104,26 @@ class Ticker:
     def ttm_eps(self) -> pd.DataFrame:
         return self._query_data(stock_tailing_eps)
 
-    def price(self) -> pd.DataFrame:
-        return self._query_data(stock_prices)
+    def price(self, start: Optional[str] = None, end: Optional[str] = None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Daily price history, optionally restricted to a date range and a subset of columns.
+
+        The date range and column projection are pushed into the SQL query, so a
+        one-month window only reads one month of rows from the price table.
+
+        Args:
+            start: Optional inclusive start date (YYYY-MM-DD)
+            end: Optional inclusive end date (YYYY-MM-DD)
+            columns: Optional list of price columns to return, e.g. ['report_date', 'close']
+
+        Example:
+            ticker = Ticker("AAPL")
+            df = ticker.price(start="2025-01-01", end="2025-01-31", columns=["report_date", "close"])
+        """
+        if start is None and end is None and columns is None:
+            return self._query_data(stock_prices)
+        return self._query_data_by_date_range(stock_prices, start, end, columns)
 
     def beta(self, period: str = "5y", benchmark: str = "SPY") -> pd.DataFrame:
         """
@@ -210,8 +254,9 @@ class Ticker:
     def annual_cash_flow(self) -> Statement:
         return self._statement(cash_flow, annual)
 
-    def ttm_pe(self) -> pd.DataFrame:
-        price_df = self.price()
+    def ttm_pe(self, start: Optional[str] = None, end: Optional[str] = None,
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+        price_df = self.price(start=start, end=end, columns=['report_date', 'close'])
 
         eps_df = self.ttm_eps()
 
@@ -250,7 +295,7 @@ class Ticker:
 
         result_df.insert(0, 'symbol', self.ticker)
         result_df = result_df.dropna(subset=['ttm_eps']).reset_index(drop=True)
-        return result_df
+        return self._project_columns(result_df, columns)
 
     def quarterly_gross_margin(self) -> pd.DataFrame:
         return self._generate_margin('gross', 'quarterly', 'gross_profit', 'gross_margin')
@@ -348,6 +393,30 @@ class Ticker:
         )
         return self.duckdb_client.query(sql)
 
+    def growth(self, items: List[str], period_type: str = quarterly,
+               cagr_years: Optional[List[int]] = None) -> pd.DataFrame:
+        """
+        YoY, QoQ and multi-year CAGR growth for any list of statement items in one scan.
+
+        Periods are matched on a fiscal-period key (the nearest month end) rather than on
+        exact calendar dates, so 52/53-week fiscal years still pair up year over year.
+
+        Args:
+            items: Statement item names, e.g. ['total_revenue', 'operating_income']
+            period_type: 'quarterly' (default) or 'annual'; QoQ columns are quarterly only
+            cagr_years: Optional CAGR horizons in years, e.g. [3, 5]
+
+        Returns:
+            Long-format DataFrame with columns: symbol, report_date, item_name, item_value,
+            prev_year_value, yoy_growth, [prev_quarter_value, qoq_growth],
+            [prev_<n>y_value, cagr_<n>y for each n in cagr_years]
+
+        Example:
+            ticker = Ticker("AAPL")
+            df = ticker.growth(["total_revenue", "free_cash_flow"], cagr_years=[3, 5])
+        """
+        return self._growth([self.ticker], items, period_type, cagr_years=cagr_years)
+
     def quarterly_revenue_yoy_growth(self) -> pd.DataFrame:
         return self._calculate_yoy_growth(item_name='total_revenue', period_type='quarterly', finance_type='income_statement')
 
@@ -384,8 +453,9 @@ class Ticker:
     def quarterly_ttm_eps_yoy_growth(self) -> pd.DataFrame:
         return self._quarterly_eps_yoy_growth('tailing_eps', 'ttm_eps', 'prev_year_ttm_eps')
 
-    def market_capitalization(self) -> pd.DataFrame:
-        price_df = self.price()
+    def market_capitalization(self, start: Optional[str] = None, end: Optional[str] = None,
+                              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        price_df = self.price(start=start, end=end, columns=['report_date', 'close'])
 
         shares_df = self.shares()
 
@@ -421,10 +491,11 @@ class Ticker:
         })
 
         result_df.insert(0, 'symbol', self.ticker)
-        return result_df
+        return self._project_columns(result_df, columns)
 
-    def ps_ratio(self) -> pd.DataFrame:
-        market_cap_df = self.market_capitalization()
+    def ps_ratio(self, start: Optional[str] = None, end: Optional[str] = None,
+                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+        market_cap_df = self.market_capitalization(start=start, end=end)
         ttm_revenue_df = self.ttm_revenue()
 
         market_cap_df['report_date'] = pd.to_datetime(market_cap_df['report_date']).astype('datetime64[us]')
@@ -464,10 +535,11 @@ class Ticker:
         })
 
         result_df.insert(0, 'symbol', self.ticker)
-        return result_df
+        return self._project_columns(result_df, columns)
 
-    def pb_ratio(self) -> pd.DataFrame:
-        market_cap_df = self.market_capitalization()
+    def pb_ratio(self, start: Optional[str] = None, end: Optional[str] = None,
+                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+        market_cap_df = self.market_capitalization(start=start, end=end)
         bve_df = self._quarterly_book_value_of_equity()
 
         market_cap_df['report_date'] = pd.to_datetime(market_cap_df['report_date']).astype('datetime64[us]')
@@ -507,7 +579,7 @@ class Ticker:
         })
 
         result_df.insert(0, 'symbol', self.ticker)
-        return result_df
+        return self._project_columns(result_df, columns)
 
     def debt_to_equity(self) -> pd.DataFrame:
         url = self.huggingface_client.get_url_path(stock_statement)
@@ -534,37 +606,11 @@ class Ticker:
         ]]
         return result_df
 
-    def enterprise_value(self) -> pd.DataFrame:
-        url = self.huggingface_client.get_url_path(stock_statement)
-        sql = load_sql("select_enterprise_value_components_by_symbol", ticker=self.ticker, url=url)
-        ev_components_df = self.duckdb_client.query(sql)
-
-        company_info = self.company_meta.get_company_info(self.ticker)
-        currency = company_info["financial_currency"] if company_info and company_info.get("financial_currency") else 'USD'
-
-        if currency == 'USD':
-            currency_df = pd.DataFrame()
-            currency_df['report_date'] = pd.to_datetime(ev_components_df['report_date']).astype('datetime64[us]')
-            currency_df['close'] = 1.0
-        else:
-            currency_df = self.currency(currency + '=X')
-
-        ev_components_df['report_date'] = pd.to_datetime(ev_components_df['report_date']).astype('datetime64[us]')
-        currency_df['report_date'] = pd.to_datetime(currency_df['report_date']).astype('datetime64[us]')
-
-        ev_components_df = pd.merge_asof(
-            ev_components_df.sort_values('report_date'),
-            currency_df[['report_date', 'close']].sort_values('report_date'),
-            on='report_date',
-            direction='backward'
-        )
-        ev_components_df = ev_components_df.rename(columns={'close': 'exchange_to_usd_rate'})
-
-        for col in ['total_debt', 'minority_interest', 'preferred_stock_equity', 'cash_and_cash_equivalents']:
-            ev_components_df[col] = ev_components_df[col].fillna(0)
-            ev_components_df[f'{col}_usd'] = round(ev_components_df[col] / ev_components_df['exchange_to_usd_rate'], 2)
+    def enterprise_value(self, start: Optional[str] = None, end: Optional[str] = None,
+                         columns: Optional[List[str]] = None) -> pd.DataFrame:
+        ev_components_df = self._enterprise_value_components()
 
-        market_cap_df = self.market_capitalization().drop(columns=['symbol'])
+        market_cap_df = self.market_capitalization(start=start, end=end).drop(columns=['symbol'])
         market_cap_df['report_date'] = pd.to_datetime(market_cap_df['report_date']).astype('datetime64[us]')
 
         result_df = market_cap_df.copy()
@@ -611,7 +657,39 @@ class Ticker:
         })
 
         result_df.insert(0, 'symbol', self.ticker)
-        return result_df
+        return self._project_columns(result_df, columns)
+
+    def _enterprise_value_components(self) -> pd.DataFrame:
+        url = self.huggingface_client.get_url_path(stock_statement)
+        sql = load_sql("select_enterprise_value_components_by_symbol", ticker=self.ticker, url=url)
+        ev_components_df = self.duckdb_client.query(sql)
+
+        company_info = self.company_meta.get_company_info(self.ticker)
+        currency = company_info["financial_currency"] if company_info and company_info.get("financial_currency") else 'USD'
+
+        if currency == 'USD':
+            currency_df = pd.DataFrame()
+            currency_df['report_date'] = pd.to_datetime(ev_components_df['report_date']).astype('datetime64[us]')
+            currency_df['close'] = 1.0
+        else:
+            currency_df = self.currency(currency + '=X')
+
+        ev_components_df['report_date'] = pd.to_datetime(ev_components_df['report_date']).astype('datetime64[us]')
+        currency_df['report_date'] = pd.to_datetime(currency_df['report_date']).astype('datetime64[us]')
+
+        ev_components_df = pd.merge_asof(
+            ev_components_df.sort_values('report_date'),
+            currency_df[['report_date', 'close']].sort_values('report_date'),
+            on='report_date',
+            direction='backward'
+        )
+        ev_components_df = ev_components_df.rename(columns={'close': 'exchange_to_usd_rate'})
+
+        for col in ['total_debt', 'minority_interest', 'preferred_stock_equity', 'cash_and_cash_equivalents']:
+            ev_components_df[col] = ev_components_df[col].fillna(0)
+            ev_components_df[f'{col}_usd'] = round(ev_components_df[col] / ev_components_df['exchange_to_usd_rate'], 2)
+
+        return ev_components_df
 
     def enterprise_to_revenue(self) -> pd.DataFrame:
         ev_df = self.enterprise_value().drop(columns=['symbol'])
@@ -702,6 +780,151 @@ class Ticker:
         result_df.insert(0, 'symbol', self.ticker)
         return result_df
 
+    def as_of(self, dates, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Point-in-time fundamentals and valuations as they were known on each of the given dates.
+
+        Quarterly figures become visible on their earnings announcement date from the
+        earnings calendar rather than on the fiscal period end, so results are free of
+        look-ahead bias. Quarters missing from the calendar become visible 90 days after
+        period end. Each underlying series is loaded once and every date is resolved in a
+        single merge_asof pass, so a 20-year monthly backtest costs about one call.
+
+        Args:
+            dates: A date or list of dates, anything accepted by pd.to_datetime
+            metrics: Optional subset of metrics to compute (default: all). Supported:
+                     close_price, ttm_eps, ttm_pe, shares_outstanding, market_capitalization,
+                     ttm_revenue_usd, ps_ratio, book_value_of_equity_usd, pb_ratio,
+                     ttm_ebitda_usd, ttm_fcf_usd, ttm_net_income_usd, enterprise_value,
+                     ev_to_revenue, ev_to_ebitda
+
+        Returns:
+            DataFrame with columns: symbol, as_of, price_date (when a price-based metric
+            is requested), followed by the requested metrics
+
+        Example:
+            ticker = Ticker("AAPL")
+            month_ends = pd.date_range("2005-01-31", "2025-12-31", freq="ME")
+            df = ticker.as_of(month_ends, metrics=["ttm_pe", "ps_ratio"])
+        """
+        metrics = list(metrics) if metrics else list(self._AS_OF_METRICS)
+        unknown = [m for m in metrics if m not in self._AS_OF_METRICS]
+        if unknown:
+            raise ValueError(f"Unsupported as_of metrics: {unknown}. Supported: {list(self._AS_OF_METRICS)}")
+        sources = {source for m in metrics for source in self._AS_OF_METRICS[m]}
+
+        as_of_dates = pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(dates))) \
+            .astype('datetime64[us]').dropna().unique().sort_values()
+        if as_of_dates.empty:
+            raise ValueError("as_of requires at least one valid date")
+        result_df = pd.DataFrame({'as_of': as_of_dates})
+
+        output_columns = ['as_of']
+        if 'price' in sources:
+            # A month of look-back covers weekends, holidays and short trading halts
+            price_df = self.price(start=as_of_dates.min() - pd.Timedelta(days=31),
+                                  end=as_of_dates.max(),
+                                  columns=['report_date', 'close'])
+            price_df['report_date'] = pd.to_datetime(price_df['report_date']).astype('datetime64[us]')
+            price_df = price_df.rename(columns={'report_date': 'price_date', 'close': 'close_price'})
+            result_df = pd.merge_asof(
+                result_df,
+                price_df.sort_values('price_date'),
+                left_on='as_of',
+                right_on='price_date',
+                direction='backward'
+            )
+            output_columns.append('price_date')
+
+        loaders = {
+            'eps': lambda: self.ttm_eps()[['report_date', 'tailing_eps']]
+                .rename(columns={'tailing_eps': 'ttm_eps'}),
+            'shares': lambda: self.shares()[['report_date', 'shares_outstanding']],
+            'revenue': lambda: self.ttm_revenue()[['report_date', 'ttm_total_revenue_usd']]
+                .rename(columns={'ttm_total_revenue_usd': 'ttm_revenue_usd'}),
+            'bve': lambda: self._quarterly_book_value_of_equity()[['report_date', 'book_value_of_equity_usd']],
+            'ebitda': lambda: self.ttm_ebitda()[['report_date', 'ttm_ebitda_usd']],
+            'fcf': lambda: self.ttm_fcf()[['report_date', 'ttm_free_cash_flow_usd']]
+                .rename(columns={'ttm_free_cash_flow_usd': 'ttm_fcf_usd'}),
+            'net_income': lambda: self.ttm_net_income_common_stockholders()[['report_date', 'ttm_net_income_usd']],
+            'ev': self._as_of_ev_adjustment,
+        }
+        fundamental_sources = [source for source in loaders if source in sources]
+        if fundamental_sources:
+            calendar_df = self._announcement_calendar()
+            for source in fundamental_sources:
+                available_df = self._align_to_announcements(loaders[source](), calendar_df)
+                result_df = pd.merge_asof(
+                    result_df,
+                    available_df.sort_values('available_date'),
+                    left_on='as_of',
+                    right_on='available_date',
+                    direction='backward'
+                ).drop(columns=['available_date'])
+
+        if {'price', 'eps'} <= sources:
+            result_df['ttm_pe'] = round(result_df['close_price'] / result_df['ttm_eps'], 2)
+            # Negative EPS yields a meaningless negative P/E; mask per Bloomberg/FactSet convention
+            result_df.loc[result_df['ttm_eps'] < 0, 'ttm_pe'] = float('nan')
+        if {'price', 'shares'} <= sources:
+            result_df['market_capitalization'] = round(result_df['close_price'] * result_df['shares_outstanding'], 2)
+        if {'price', 'shares', 'revenue'} <= sources:
+            result_df['ps_ratio'] = round(result_df['market_capitalization'] / result_df['ttm_revenue_usd'], 2)
+        if {'price', 'shares', 'bve'} <= sources:
+            result_df['pb_ratio'] = round(result_df['market_capitalization'] / result_df['book_value_of_equity_usd'], 2)
+        if {'price', 'shares', 'ev'} <= sources:
+            result_df['enterprise_value'] = round(result_df['market_capitalization'] + result_df['ev_adjustment_usd'], 2)
+        if {'price', 'shares', 'ev', 'revenue'} <= sources:
+            result_df['ev_to_revenue'] = (result_df['enterprise_value'] / result_df['ttm_revenue_usd']) \
+                .replace([np.inf, -np.inf], np.nan).round(2)
+        if {'price', 'shares', 'ev', 'ebitda'} <= sources:
+            result_df['ev_to_ebitda'] = (result_df['enterprise_value'] / result_df['ttm_ebitda_usd']) \
+                .replace([np.inf, -np.inf], np.nan).round(2)
+
+        result_df = result_df[output_columns + metrics]
+        result_df.insert(0, 'symbol', self.ticker)
+        return result_df
+
+    def _as_of_ev_adjustment(self) -> pd.DataFrame:
+        ev_components_df = self._enterprise_value_components()
+        ev_components_df['ev_adjustment_usd'] = (
+            ev_components_df['total_debt_usd']
+            + ev_components_df['minority_interest_usd']
+            + ev_components_df['preferred_stock_equity_usd']
+            - ev_components_df['cash_and_cash_equivalents_usd']
+        )
+        return ev_components_df[['report_date', 'ev_adjustment_usd']]
+
+    def _announcement_calendar(self) -> pd.DataFrame:
+        calendar_df = self.calendar()
+        calendar_df = pd.DataFrame({
+            'announce_date': pd.to_datetime(calendar_df['report_date']).astype('datetime64[us]'),
+            'fiscal_quarter_ending': pd.to_datetime(calendar_df['fiscal_quarter_ending']).astype('datetime64[us]'),
+        })
+        return calendar_df.dropna().sort_values('fiscal_quarter_ending')
+
+    def _align_to_announcements(self, df: pd.DataFrame, calendar_df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        df['report_date'] = pd.to_datetime(df['report_date'], errors='coerce').astype('datetime64[us]')
+        df = df.dropna(subset=['report_date']).sort_values('report_date')
+
+        if calendar_df.empty:
+            df['available_date'] = df['report_date'] + self._AS_OF_FALLBACK_LAG
+            return df.drop(columns=['report_date'])
+
+        # Fiscal quarter ends in the calendar can drift a few days from statement dates (52/53-week years)
+        df = pd.merge_asof(
+            df,
+            calendar_df,
+            left_on='report_date',
+            right_on='fiscal_quarter_ending',
+            direction='nearest',
+            tolerance=pd.Timedelta(days=7)
+        )
+        announce_date = df['announce_date'].where(df['announce_date'] >= df['report_date'])
+        df['available_date'] = announce_date.fillna(df['report_date'] + self._AS_OF_FALLBACK_LAG)
+        return df.drop(columns=['report_date', 'fiscal_quarter_ending', 'announce_date'])
+
     def _quarterly_book_value_of_equity(self) -> pd.DataFrame:
         stockholders_equity_url = self.huggingface_client.get_url_path(stock_statement)
         stockholders_equity_sql = load_sql("select_quarterly_book_value_of_equity_by_symbol",
@@ -757,12 +980,29 @@ class Ticker:
         result_df.insert(0, 'symbol', self.ticker)
         return result_df
 
+    def ttm(self, items: List[str], detail: bool = False) -> pd.DataFrame:
+        """
+        Trailing-twelve-months sums for any list of quarterly statement items.
+
+        Every item is computed in a single scan over the statement table. A TTM value is
+        only produced when the four most recent quarters are consecutive.
+
+        Args:
+            items: Statement item names, e.g. ['total_revenue', 'ebitda', 'free_cash_flow']
+            detail: Also return the quarter-by-quarter window as JSON (report_date_2_<item>)
+
+        Returns:
+            DataFrame with columns: symbol, report_date, ttm_<item> for each item
+            (and report_date_2_<item> when detail=True), in reporting currency
+
+        Example:
+            ticker = Ticker("AAPL")
+            df = ticker.ttm(["total_revenue", "gross_profit", "operating_income"])
+        """
+        return self._ttm_items([self.ticker], items, detail)
+
     def ttm_revenue(self) -> pd.DataFrame:
-        ttm_revenue_url = self.huggingface_client.get_url_path(stock_statement)
-        ttm_revenue_sql = load_sql("select_ttm_revenue_by_symbol",
-                                   ticker = self.ticker,
-                                   ttm_revenue_url = ttm_revenue_url)
-        ttm_revenue_df = self.duckdb_client.query(ttm_revenue_sql)
+        ttm_revenue_df = self._ttm_item('total_revenue', 'ttm_total_revenue', 'report_date_2_revenue')
 
         company_info = self.company_meta.get_company_info(self.ticker)
         currency = company_info["financial_currency"] if company_info and company_info.get("financial_currency") else 'USD'
@@ -813,11 +1053,7 @@ class Ticker:
         return result_df
 
     def ttm_fcf(self) -> pd.DataFrame:
-        ttm_fcf_url = self.huggingface_client.get_url_path(stock_statement)
-        ttm_fcf_sql = load_sql("select_ttm_fcf_by_symbol",
-                              ticker=self.ticker,
-                              ttm_fcf_url=ttm_fcf_url)
-        ttm_fcf_df = self.duckdb_client.query(ttm_fcf_sql)
+        ttm_fcf_df = self._ttm_item('free_cash_flow', 'ttm_free_cash_flow', 'report_date_2_fcf')
 
         company_info = self.company_meta.get_company_info(self.ticker)
         currency = company_info["financial_currency"] if company_info and company_info.get("financial_currency") else 'USD'
@@ -868,11 +1104,7 @@ class Ticker:
         return result_df
 
     def ttm_ebitda(self) -> pd.DataFrame:
-        ttm_ebitda_url = self.huggingface_client.get_url_path(stock_statement)
-        ttm_ebitda_sql = load_sql("select_ttm_ebitda_by_symbol",
-                                  ticker=self.ticker,
-                                  ttm_ebitda_url=ttm_ebitda_url)
-        ttm_ebitda_df = self.duckdb_client.query(ttm_ebitda_sql)
+        ttm_ebitda_df = self._ttm_item('ebitda', 'ttm_ebitda', 'report_date_2_ebitda')
 
         company_info = self.company_meta.get_company_info(self.ticker)
         currency = company_info["financial_currency"] if company_info and company_info.get("financial_currency") else 'USD'
@@ -961,11 +1193,7 @@ class Ticker:
         return result_df
 
     def ttm_net_income_common_stockholders(self) -> pd.DataFrame:
-        ttm_net_income_url = self.huggingface_client.get_url_path(stock_statement)
-        ttm_net_income_sql = load_sql("select_ttm_net_income_common_stockholders_by_symbol",
-                                      ticker=self.ticker,
-                                      ttm_net_income_url=ttm_net_income_url)
-        ttm_net_income_df = self.duckdb_client.query(ttm_net_income_sql)
+        ttm_net_income_df = self._ttm_item('net_income_common_stockholders', 'ttm_net_income', 'report_date_2_net_income')
 
         company_info = self.company_meta.get_company_info(self.ticker)
         currency = company_info["financial_currency"] if company_info and company_info.get("financial_currency") else 'USD'
@@ -1017,9 +1245,25 @@ class Ticker:
         return result_df
 
     def roe(self) -> pd.DataFrame:
-        url = self.huggingface_client.get_url_path(stock_statement)
-        sql = load_sql("select_roe_by_symbol", ticker = self.ticker, url = url)
-        result_df = self.duckdb_client.query(sql)
+        return self._roe([self.ticker])
+
+    def roa(self) -> pd.DataFrame:
+        return self._roa([self.ticker])
+
+    def roic(self) -> pd.DataFrame:
+        return self._roic([self.ticker])
+
+    def roce(self) -> pd.DataFrame:
+        return self._roce([self.ticker])
+
+    def equity_multiplier(self) -> pd.DataFrame:
+        return self._equity_multiplier([self.ticker])
+
+    def asset_turnover(self) -> pd.DataFrame:
+        return self._asset_turnover([self.ticker])
+
+    def _roe(self, symbols: List[str]) -> pd.DataFrame:
+        result_df = self._query_return_ratio("select_roe_by_symbols", symbols)
         result_df = result_df[[
             'symbol',
             'report_date',
@@ -1031,10 +1275,8 @@ class Ticker:
         ]]
         return result_df
 
-    def roa(self) -> pd.DataFrame:
-        url = self.huggingface_client.get_url_path(stock_statement)
-        sql = load_sql("select_roa_by_symbol", ticker = self.ticker, url = url)
-        result_df = self.duckdb_client.query(sql)
+    def _roa(self, symbols: List[str]) -> pd.DataFrame:
+        result_df = self._query_return_ratio("select_roa_by_symbols", symbols)
         result_df = result_df[[
             'symbol',
             'report_date',
@@ -1046,10 +1288,8 @@ class Ticker:
         ]]
         return result_df
 
-    def roic(self) -> pd.DataFrame:
-        url = self.huggingface_client.get_url_path(stock_statement)
-        sql = load_sql("select_roic_by_symbol", ticker = self.ticker, url = url)
-        result_df = self.duckdb_client.query(sql)
+    def _roic(self, symbols: List[str]) -> pd.DataFrame:
+        result_df = self._query_return_ratio("select_roic_by_symbols", symbols)
         result_df = result_df[[
             'symbol',
             'report_date',
@@ -1063,10 +1303,8 @@ class Ticker:
         ]]
         return result_df
 
-    def roce(self) -> pd.DataFrame:
-        url = self.huggingface_client.get_url_path(stock_statement)
-        sql = load_sql("select_roce_by_symbol", ticker=self.ticker, url=url)
-        result_df = self.duckdb_client.query(sql)
+    def _roce(self, symbols: List[str]) -> pd.DataFrame:
+        result_df = self._query_return_ratio("select_roce_by_symbols", symbols)
         result_df = result_df[[
             'symbol',
             'report_date',
@@ -1078,59 +1316,65 @@ class Ticker:
         ]]
         return result_df
 
-    def equity_multiplier(self) -> pd.DataFrame:
-        roe = self.roe()
-        roa = self.roa()
+    def _query_return_ratio(self, sql_name: str, symbols: List[str]) -> pd.DataFrame:
+        url = self.huggingface_client.get_url_path(stock_statement)
+        sql = load_sql(sql_name, symbols=", ".join(f"'{s}'" for s in symbols), url=url)
+        return self.duckdb_client.query(sql)
+
+    def _equity_multiplier(self, symbols: List[str]) -> pd.DataFrame:
+        roe = self._roe(symbols)
+        roa = self._roa(symbols)
 
         roe['report_date'] = pd.to_datetime(roe['report_date']).astype('datetime64[us]')
         roa['report_date'] = pd.to_datetime(roa['report_date']).astype('datetime64[us]')
 
         result_df = pd.merge_asof(
-            roe,
-            roa,
-            left_on='report_date',
-            right_on='report_date',
+            roe.sort_values('report_date'),
+            roa.sort_values('report_date'),
+            on='report_date',
+            by='symbol',
             direction='backward'
         )
 
         result_df['equity_multiplier'] = round(result_df['roe'] / result_df['roa'], 2)
 
         result_df = result_df[[
+            'symbol',
             'report_date',
             'roe',
             'roa',
             'equity_multiplier'
         ]]
 
-        result_df.insert(0, 'symbol', self.ticker)
-        return result_df
+        return result_df.sort_values(['symbol', 'report_date']).reset_index(drop=True)
 
-    def asset_turnover(self) -> pd.DataFrame:
-        roa = self.roa()
-        quarterly_net_margin = self.quarterly_net_margin()
+    def _asset_turnover(self, symbols: List[str]) -> pd.DataFrame:
+        roa = self._roa(symbols)
+        quarterly_net_margin = self._generate_margin('net', 'quarterly', 'net_income_common_stockholders',
+                                                     'net_margin', symbols=symbols)
 
         roa['report_date'] = pd.to_datetime(roa['report_date']).astype('datetime64[us]')
         quarterly_net_margin['report_date'] = pd.to_datetime(quarterly_net_margin['report_date']).astype('datetime64[us]')
 
         result_df = pd.merge_asof(
-            roa,
-            quarterly_net_margin,
-            left_on='report_date',
-            right_on='report_date',
+            roa.sort_values('report_date'),
+            quarterly_net_margin.sort_values('report_date'),
+            on='report_date',
+            by='symbol',
             direction='backward'
         )
 
         result_df['asset_turnover'] = round(result_df['roa'] / result_df['net_margin'], 2)
 
         result_df = result_df[[
+            'symbol',
             'report_date',
             'roa',
             'net_margin',
             'asset_turnover'
         ]]
 
-        result_df.insert(0, 'symbol', self.ticker)
-        return result_df
+        return result_df.sort_values(['symbol', 'report_date']).reset_index(drop=True)
 
     def wacc(self) -> pd.DataFrame:
         url = self.huggingface_client.get_url_path(stock_statement)
@@ -1251,39 +1495,7 @@ class Ticker:
             'end_year': 'sp500_cagr_end'
         })
 
-        treasure = self.treasure.daily_treasure_yield()
-        treasure['report_date'] = pd.to_datetime(treasure['report_date']).astype('datetime64[us]')
-
-        result_df = pd.merge_asof(
-            result_df,
-            treasure,
-            left_on='report_date',
-            right_on='report_date',
-            direction='backward'
-        )
-
-        result_df = result_df[[
-            'symbol',
-            'report_date',
-            'market_capitalization',
-            'exchange_rate',
-            'total_debt',
-            'total_debt_usd',
-            'interest_expense',
-            'interest_expense_usd',
-            'pretax_income',
-            'pretax_income_usd',
-            'tax_provision',
-            'tax_provision_usd',
-            'tax_rate_for_calcs',
-            'sp500_cagr_end',
-            'sp500_10y_cagr',
-            'bc_10year'
-        ]]
-
-        result_df = result_df.rename(columns={
-            'bc_10year': 'treasure_10y_yield',
-        })
+        result_df['treasure_10y_yield'] = self.treasure.yield_at(result_df['report_date'].to_numpy(), 'bc_10year')
 
         # Calculate 5-year beta using monthly returns
         result_df['beta_5y'] = self.beta("5y").iloc[0]['beta']
@@ -1942,19 +2154,42 @@ class Ticker:
         sell_rule = CellIsRule(operator='equal', formula=['"Sell"'], font=red_font)
         ws.conditional_formatting.add(f'F{current_price_row}:F{margin_row}', sell_rule)
 
-    def dcf_data(self) -> Dict:
-        """Compute a full DCF valuation and return structured data.
+    def _dcf_market_inputs(self) -> Dict:
+        """Market-wide DCF inputs that are the same for every symbol."""
+        # Mean of annual-average 10Y treasury yields over the last 5 years.
+        # Using annual averages (not raw data points) so Python and the Excel AVERAGE formula agree exactly.
+        treasure_df = self.treasure.daily_treasure_yield()
+        treasury_annual_details = []
+        treasury_avg_5y = None
+        if not treasure_df.empty and 'bc_10year' in treasure_df.columns:
+            treasure_df['report_date'] = pd.to_datetime(treasure_df['report_date'])
+            cutoff = pd.Timestamp.now() - pd.DateOffset(years=5)
+            recent = treasure_df[treasure_df['report_date'] >= cutoff][
+                ['report_date', 'bc_10year']
+            ].dropna(subset=['bc_10year']).copy()
+            if not recent.empty:
+                recent['year'] = recent['report_date'].dt.year
+                annual_avgs = (
+                    recent.groupby('year')['bc_10year'].mean()
+                    .reset_index().sort_values('year')
+                )
+                for _, r in annual_avgs.iterrows():
+                    treasury_annual_details.append({
+                        'year': int(r['year']),
+                        'avg_yield': float(r['bc_10year']),
+                    })
+                treasury_avg_5y = float(annual_avgs['bc_10year'].mean())
+        return {
+            "treasury_details": treasury_annual_details,
+            "treasury_avg_5y": treasury_avg_5y,
+        }
 
-        Performs the same analysis as dcf() but returns all inputs, intermediate
-        calculations, and results as a Python dictionary instead of an Excel file.
+    def _dcf_inputs(self, market: Optional[Dict] = None, missing_ok: bool = False) -> Optional[Dict]:
+        """Per-symbol DCF inputs: WACC components, growth assumptions and TTM / balance sheet values.
 
-        Returns:
-            Dict with keys:
-                - symbol (str)
-                - discount_rate (dict): WACC components and computed values
-                - growth_estimates (dict): Historical growth details and 3Y CAGRs
-                - dcf_template (dict): Growth assumptions, 10-year projections, historical FCF margin
-                - dcf_value (dict): Enterprise value, fair price, recommendation
+        *market* is the output of _dcf_market_inputs(), passed in so a batch valuation
+        fetches it once. Returns None instead of raising when WACC data is unavailable
+        and *missing_ok* is set.
         """
         import json
 
@@ -1989,17 +2224,20 @@ class Ticker:
         # ========== 1. Fetch all required data ==========
         wacc_df = self.wacc()
         if wacc_df.empty:
+            if missing_ok:
+                return None
             raise ValueError(
                 f"Cannot calculate DCF for {self.ticker}: WACC data is unavailable. "
                 f"This typically means the ticker has no financial statements (e.g. ETFs, indices)."
             )
         last_wacc = wacc_df.iloc[-1]
+        if market is None:
+            market = self._dcf_market_inputs()
 
         revenue_growth = self.annual_revenue_yoy_growth()
         revenue_details = _get_growth_details(revenue_growth, 3)
 
         eps_yoy_df = self.quarterly_ttm_eps_yoy_growth()
-        treasure_df = self.treasure.daily_treasure_yield()
 
         ttm_fcf_df = self.ttm_fcf()
         ttm_revenue_df = self.ttm_revenue()
@@ -2014,23 +2252,11 @@ class Ticker:
         )
 
         # ========== 2. Discount rate computation ==========
-        # Compute treasury 5Y avg first so it can serve as risk_free_rate.
+        # Treasury 5Y avg serves as risk_free_rate.
         # This keeps Python and Excel aligned (C8 = =L{treasury_avg_row}).
         _current_yield = float(last_wacc['treasure_10y_yield'])
-        if not treasure_df.empty and 'bc_10year' in treasure_df.columns:
-            _tr = treasure_df.copy()
-            _tr['report_date'] = pd.to_datetime(_tr['report_date'])
-            _cutoff = pd.Timestamp.now() - pd.DateOffset(years=5)
-            _recent = _tr[_tr['report_date'] >= _cutoff]['bc_10year'].dropna()
-            if not _recent.empty:
-                _tr_year = _tr[_tr['report_date'] >= _cutoff][['report_date', 'bc_10year']].dropna(subset=['bc_10year']).copy()
-                _tr_year['year'] = _tr_year['report_date'].dt.year
-                _annual = _tr_year.groupby('year')['bc_10year'].mean()
-                risk_free_rate = float(_annual.mean())
-            else:
-                risk_free_rate = _current_yield
-        else:
-            risk_free_rate = _current_yield
+        treasury_avg_5y = market["treasury_avg_5y"]
+        risk_free_rate = treasury_avg_5y if treasury_avg_5y is not None else _current_yield
 
         report_date = pd.to_datetime(last_wacc["report_date"]).strftime("%Y-%m-%d")
         market_cap = float(last_wacc['market_capitalization'])
@@ -2100,31 +2326,8 @@ class Ticker:
                             break
 
         # ========== 4. DCF template parameters ==========
-        # Terminal rate: mean of annual-average 10Y treasury yields over last 5 years.
-        # Using annual averages (not raw data points) so Python and the Excel AVERAGE formula agree exactly.
-        treasury_annual_details = []
-        if not treasure_df.empty and 'bc_10year' in treasure_df.columns:
-            treasure_df['report_date'] = pd.to_datetime(treasure_df['report_date'])
-            cutoff = pd.Timestamp.now() - pd.DateOffset(years=5)
-            recent = treasure_df[treasure_df['report_date'] >= cutoff][
-                ['report_date', 'bc_10year']
-            ].dropna(subset=['bc_10year']).copy()
-            if not recent.empty:
-                recent['year'] = recent['report_date'].dt.year
-                annual_avgs = (
-                    recent.groupby('year')['bc_10year'].mean()
-                    .reset_index().sort_values('year')
-                )
-                for _, r in annual_avgs.iterrows():
-                    treasury_annual_details.append({
-                        'year': int(r['year']),
-                        'avg_yield': float(r['bc_10year']),
-                    })
-                growth_rate_terminal = float(annual_avgs['bc_10year'].mean())
-            else:
-                growth_rate_terminal = risk_free_rate
-        else:
-            growth_rate_terminal = risk_free_rate
+        # Terminal rate: the same 5-year treasury average
+        growth_rate_terminal = treasury_avg_5y if treasury_avg_5y is not None else risk_free_rate
 
         # Near-term growth rate (1~5Y): EPS CAGR over available years, cap 20% floor 5%
         if eps_cagr is not None:
@@ -2134,7 +2337,6 @@ class Ticker:
 
         # Mid-term rate (6~10Y): year-6 linear interpolation start point
         growth_rate_6_10y = growth_rate_1_5y - (growth_rate_1_5y - growth_rate_terminal) / 5
-        discount_rate = wacc
 
         # Revenue-specific growth rates (for FCF margin computation)
         rev_growth_1_5y = max(min(rev_cagr, 0.20), 0.05) if isinstance(rev_cagr, (int, float)) else 0.05
@@ -2162,60 +2364,7 @@ class Ticker:
             ttm_revenue_label = f"TTM Revenue (USD | {start_date} ~ {end_date})"
             ttm_period = f"{start_date} ~ {end_date}"
 
-        # ========== 6. 10-year FCF projections ==========
-        ttm_end_date = pd.to_datetime(end_date)
-        projections = []
-
-        # Year 0 (TTM base)
-        fcf_margin_0 = base_fcf / ttm_revenue_value if ttm_revenue_value != 0 else 0
-        projections.append({
-            "year": 0,
-            "date": ttm_end_date.strftime("%Y-%m-%d"),
-            "fcf": base_fcf,
-            "terminal_value": 0.0,
-            "total_value": base_fcf,
-            "fcf_margin": fcf_margin_0,
-        })
-
-        prev_fcf = base_fcf
-        prev_rev = ttm_revenue_value
-        for i in range(1, 11):
-            if i <= 5:
-                rate = growth_rate_1_5y
-                rev_rate = rev_growth_1_5y
-            else:
-                rate = growth_rate_1_5y - (i - 5) * (growth_rate_1_5y - growth_rate_terminal) / 5
-                rev_rate = rev_growth_1_5y - (i - 5) * (rev_growth_1_5y - growth_rate_terminal) / 5
-
-            fcf = prev_fcf * (1 + rate)
-            proj_rev = prev_rev * (1 + rev_rate)
-
-            future_date = ttm_end_date + pd.DateOffset(years=i)
-
-            tv = 0.0
-            if i == 10:
-                tv_denom = discount_rate - growth_rate_terminal
-                tv = fcf * (1 + growth_rate_terminal) / tv_denom if tv_denom != 0 else 0.0
-
-            total = fcf + tv
-            margin = fcf / proj_rev if proj_rev != 0 else 0
-
-            projections.append({
-                "year": i,
-                "date": f"{future_date.year}/{future_date.month}/{future_date.day}",
-                "fcf": fcf,
-                "terminal_value": tv,
-                "total_value": total,
-                "fcf_margin": margin,
-            })
-            prev_fcf = fcf
-            prev_rev = proj_rev
-
-        # ========== 7. Enterprise value (NPV) ==========
-        total_values = [p["total_value"] for p in projections[1:]]  # Years 1-10
-        ev = sum(v / (1 + discount_rate) ** i for i, v in enumerate(total_values, 1))
-
-        # ========== 8. Cash from balance sheet ==========
+        # ========== 6. Cash from balance sheet ==========
         cash_value = 0.0
         if not bs_df.empty:
             cash_rows = bs_df[bs_df['Breakdown'].str.contains(
@@ -2240,7 +2389,7 @@ class Ticker:
                             else:
                                 cash_value = float(cash_val_orig)
 
-        # ========== 9. Shares & current price ==========
+        # ========== 7. Shares & current price ==========
         shares_outstanding = 0.0
         if not mc_df.empty:
             shares_val = mc_df.iloc[-1]['shares_outstanding']
@@ -2251,15 +2400,7 @@ class Ticker:
         if not price_df.empty:
             current_price = float(price_df.iloc[-1]['close'])
 
-        # ========== 10. Fair price & recommendation ==========
-        equity_value = ev + cash_value - total_debt
-        fair_price = equity_value / shares_outstanding if shares_outstanding > 0 else 0
-        margin_of_safety = (
-            (fair_price - current_price) / fair_price if fair_price != 0 else 0
-        )
-        recommendation = "Buy" if fair_price > current_price else "Sell"
-
-        # ========== 11. Historical FCF margin ==========
+        # ========== 8. Historical FCF margin ==========
         historical_fcf_margin = []
         if not fcf_margin_df.empty:
             recent = fcf_margin_df.tail(5).dropna(subset=['fcf_margin'])
@@ -2269,61 +2410,255 @@ class Ticker:
                     "margin": float(row_data['fcf_margin']),
                 })
 
+        return {
+            "symbol": self.ticker,
+            "report_date": report_date,
+            "market_cap": market_cap,
+            "beta_5y": beta_5y,
+            "total_debt": total_debt,
+            "interest_expense": interest_expense,
+            "pretax_income": pretax_income,
+            "tax_provision": tax_provision,
+            "risk_free_rate": risk_free_rate,
+            "expected_market_return": expected_market_return,
+            "weight_of_debt": weight_of_debt,
+            "weight_of_equity": weight_of_equity,
+            "cost_of_debt": cost_of_debt,
+            "cost_of_equity": cost_of_equity,
+            "tax_rate": tax_rate,
+            "wacc": wacc,
+            "currency": finance_currency,
+            "revenue_details": revenue_details,
+            "revenue_cagr_3y": rev_cagr,
+            "eps_details": eps_details,
+            "eps_cagr_10y": eps_cagr_display,
+            "eps_cagr_years": eps_cagr_years,
+            "treasury_details": market["treasury_details"],
+            "growth_rate_1_5y": growth_rate_1_5y,
+            "growth_rate_6_10y": growth_rate_6_10y,
+            "growth_rate_terminal": growth_rate_terminal,
+            "revenue_growth_1_5y": rev_growth_1_5y,
+            "revenue_growth_6_10y": rev_growth_6_10y,
+            "ttm_revenue": ttm_revenue_value,
+            "ttm_revenue_label": ttm_revenue_label,
+            "ttm_period": ttm_period,
+            "base_fcf": base_fcf,
+            "end_date": end_date,
+            "cash": cash_value,
+            "shares_outstanding": shares_outstanding,
+            "current_price": current_price,
+            "historical_fcf_margin": historical_fcf_margin,
+        }
+
+    @staticmethod
+    def _project_dcf_inputs(inputs: Dict, **overrides) -> Dict[str, np.ndarray]:
+        # Any of the projection arguments may be overridden with scalars or arrays
+        args = {
+            "base_fcf": inputs["base_fcf"],
+            "ttm_revenue": inputs["ttm_revenue"],
+            "growth_rate_1_5y": inputs["growth_rate_1_5y"],
+            "revenue_growth_1_5y": inputs["revenue_growth_1_5y"],
+            "growth_rate_terminal": inputs["growth_rate_terminal"],
+            "discount_rate": inputs["wacc"],
+            "cash": inputs["cash"],
+            "total_debt": inputs["total_debt"],
+            "shares_outstanding": inputs["shares_outstanding"],
+            "current_price": inputs["current_price"],
+        }
+        args.update(overrides)
+        return project_dcf(**args)
+
+    def dcf_data(self) -> Dict:
+        """Compute a full DCF valuation and return structured data.
+
+        Performs the same analysis as dcf() but returns all inputs, intermediate
+        calculations, and results as a Python dictionary instead of an Excel file.
+
+        Returns:
+            Dict with keys:
+                - symbol (str)
+                - discount_rate (dict): WACC components and computed values
+                - growth_estimates (dict): Historical growth details and 3Y CAGRs
+                - dcf_template (dict): Growth assumptions, 10-year projections, historical FCF margin
+                - dcf_value (dict): Enterprise value, fair price, recommendation
+        """
+        inputs = self._dcf_inputs()
+        valuation = self._project_dcf_inputs(inputs)
+
+        # ========== 10-year FCF projections ==========
+        ttm_end_date = pd.to_datetime(inputs["end_date"])
+        base_fcf = inputs["base_fcf"]
+        ttm_revenue_value = inputs["ttm_revenue"]
+        projections = [{
+            "year": 0,
+            "date": ttm_end_date.strftime("%Y-%m-%d"),
+            "fcf": base_fcf,
+            "terminal_value": 0.0,
+            "total_value": base_fcf,
+            "fcf_margin": base_fcf / ttm_revenue_value if ttm_revenue_value != 0 else 0,
+        }]
+        for i in range(1, PROJECTION_YEARS + 1):
+            future_date = ttm_end_date + pd.DateOffset(years=i)
+            projections.append({
+                "year": i,
+                "date": f"{future_date.year}/{future_date.month}/{future_date.day}",
+                "fcf": float(valuation["fcf"][i - 1]),
+                "terminal_value": float(valuation["terminal_value"]) if i == PROJECTION_YEARS else 0.0,
+                "total_value": float(valuation["total_value"][i - 1]),
+                "fcf_margin": float(valuation["fcf_margin"][i - 1]),
+            })
+
+        fair_price = float(valuation["fair_price"])
+        current_price = inputs["current_price"]
+
         # ========== Return structured result ==========
         return {
             "symbol": self.ticker,
             "discount_rate": {
-                "report_date": report_date,
-                "market_cap": market_cap,
-                "beta_5y": beta_5y,
-                "total_debt": total_debt,
-                "interest_expense": interest_expense,
-                "pretax_income": pretax_income,
-                "tax_provision": tax_provision,
-                "risk_free_rate": risk_free_rate,
-                "expected_market_return": expected_market_return,
-                "weight_of_debt": weight_of_debt,
-                "weight_of_equity": weight_of_equity,
-                "cost_of_debt": cost_of_debt,
-                "cost_of_equity": cost_of_equity,
-                "tax_rate": tax_rate,
-                "wacc": wacc,
+                "report_date": inputs["report_date"],
+                "market_cap": inputs["market_cap"],
+                "beta_5y": inputs["beta_5y"],
+                "total_debt": inputs["total_debt"],
+                "interest_expense": inputs["interest_expense"],
+                "pretax_income": inputs["pretax_income"],
+                "tax_provision": inputs["tax_provision"],
+                "risk_free_rate": inputs["risk_free_rate"],
+                "expected_market_return": inputs["expected_market_return"],
+                "weight_of_debt": inputs["weight_of_debt"],
+                "weight_of_equity": inputs["weight_of_equity"],
+                "cost_of_debt": inputs["cost_of_debt"],
+                "cost_of_equity": inputs["cost_of_equity"],
+                "tax_rate": inputs["tax_rate"],
+                "wacc": inputs["wacc"],
             },
             "growth_estimates": {
-                "currency": finance_currency,
-                "revenue": {"details": revenue_details, "cagr_3y": rev_cagr},
-                "eps": {"details": eps_details, "cagr_10y": eps_cagr_display, "cagr_years": eps_cagr_years},
-                "treasury": {"details": treasury_annual_details, "avg_5y": growth_rate_terminal},
+                "currency": inputs["currency"],
+                "revenue": {"details": inputs["revenue_details"], "cagr_3y": inputs["revenue_cagr_3y"]},
+                "eps": {"details": inputs["eps_details"], "cagr_10y": inputs["eps_cagr_10y"],
+                        "cagr_years": inputs["eps_cagr_years"]},
+                "treasury": {"details": inputs["treasury_details"], "avg_5y": inputs["growth_rate_terminal"]},
             },
             "dcf_template": {
-                "growth_rate_1_5y": growth_rate_1_5y,
-                "growth_rate_6_10y": growth_rate_6_10y,
-                "growth_rate_terminal": growth_rate_terminal,
-                "discount_rate": discount_rate,
+                "growth_rate_1_5y": inputs["growth_rate_1_5y"],
+                "growth_rate_6_10y": inputs["growth_rate_6_10y"],
+                "growth_rate_terminal": inputs["growth_rate_terminal"],
+                "discount_rate": inputs["wacc"],
                 "ttm_revenue": ttm_revenue_value,
-                "ttm_revenue_label": ttm_revenue_label,
-                "ttm_period": ttm_period,
+                "ttm_revenue_label": inputs["ttm_revenue_label"],
+                "ttm_period": inputs["ttm_period"],
                 "base_fcf": base_fcf,
-                "end_date": end_date,
-                "revenue_growth_1_5y": rev_growth_1_5y,
-                "revenue_growth_6_10y": rev_growth_6_10y,
+                "end_date": inputs["end_date"],
+                "revenue_growth_1_5y": inputs["revenue_growth_1_5y"],
+                "revenue_growth_6_10y": inputs["revenue_growth_6_10y"],
                 "projections": projections,
-                "historical_fcf_margin": historical_fcf_margin,
+                "historical_fcf_margin": inputs["historical_fcf_margin"],
             },
             "dcf_value": {
-                "report_date": report_date,
-                "enterprise_value": ev,
-                "cash": cash_value,
-                "total_debt": total_debt,
-                "equity_value": equity_value,
-                "shares_outstanding": shares_outstanding,
+                "report_date": inputs["report_date"],
+                "enterprise_value": float(valuation["enterprise_value"]),
+                "cash": inputs["cash"],
+                "total_debt": inputs["total_debt"],
+                "equity_value": float(valuation["equity_value"]),
+                "shares_outstanding": inputs["shares_outstanding"],
                 "fair_price": fair_price,
                 "current_price": current_price,
-                "margin_of_safety": margin_of_safety,
-                "recommendation": recommendation,
+                "margin_of_safety": float(valuation["margin_of_safety"]),
+                "recommendation": "Buy" if fair_price > current_price else "Sell",
             },
         }
 
+    def dcf_sensitivity(self, wacc_range, growth_range) -> pd.DataFrame:
+        """Fair price for every combination of WACC and terminal growth rate.
+
+        All other assumptions are taken from dcf_data(). The grid is evaluated as one
+        broadcasted array computation.
+
+        Args:
+            wacc_range:   Discount rates to test, e.g. ``np.linspace(0.06, 0.12, 50)``.
+            growth_range: Terminal growth rates to test, e.g. ``np.linspace(0.01, 0.04, 50)``.
+
+        Returns:
+            DataFrame of fair prices indexed by wacc with one column per terminal growth rate.
+
+        Example:
+            ticker = Ticker("AAPL")
+            grid = ticker.dcf_sensitivity([0.08, 0.09, 0.10], [0.02, 0.025, 0.03])
+        """
+        wacc_values = np.asarray(wacc_range, dtype=float).ravel()
+        growth_values = np.asarray(growth_range, dtype=float).ravel()
+        if wacc_values.size == 0 or growth_values.size == 0:
+            raise ValueError("wacc_range and growth_range must not be empty")
+
+        valuation = self._project_dcf_inputs(
+            self._dcf_inputs(),
+            discount_rate=wacc_values[:, None],
+            growth_rate_terminal=growth_values[None, :],
+        )
+        return pd.DataFrame(
+            valuation['fair_price'],
+            index=pd.Index(wacc_values, name='wacc'),
+            columns=pd.Index(growth_values, name='growth_rate_terminal'),
+        )
+
+    def dcf_monte_carlo(self, n: int, distributions: Dict, seed: Optional[int] = None) -> pd.DataFrame:
+        """Distribution of DCF fair prices under uncertain assumptions.
+
+        Each assumption named in *distributions* is drawn *n* times; the rest are taken
+        from dcf_data(). All draws are valued in one broadcasted array computation.
+
+        Args:
+            n:             Number of simulations.
+            distributions: Maps an assumption (wacc, growth_rate_terminal, growth_rate_1_5y,
+                           revenue_growth_1_5y, base_fcf) to a distribution spec:
+                           ``('normal', mean, std)``, ``('lognormal', mean, sigma)``,
+                           ``('uniform', low, high)`` or ``('triangular', left, mode, right)``.
+            seed:          Optional seed for reproducible draws.
+
+        Returns:
+            DataFrame with one row per simulation: the drawn assumptions followed by
+            enterprise_value, equity_value, fair_price and margin_of_safety.
+
+        Example:
+            ticker = Ticker("AAPL")
+            sims = ticker.dcf_monte_carlo(100_000, {
+                'wacc': ('normal', 0.09, 0.01),
+                'growth_rate_terminal': ('uniform', 0.02, 0.035),
+            }, seed=42)
+            sims['fair_price'].describe()
+        """
+        if n <= 0:
+            raise ValueError("n must be a positive integer")
+        unknown = [name for name in distributions if name not in self._DCF_RANDOM_INPUTS]
+        if unknown:
+            raise ValueError(f"Unsupported assumptions: {unknown}. "
+                             f"Valid options are: {', '.join(self._DCF_RANDOM_INPUTS)}")
+
+        rng = np.random.default_rng(seed)
+        draws = {name: self._draw(rng, n, spec) for name, spec in distributions.items()}
+        valuation = self._project_dcf_inputs(
+            self._dcf_inputs(),
+            **{self._DCF_RANDOM_INPUTS[name]: values for name, values in draws.items()}
+        )
+
+        result_df = pd.DataFrame(draws)
+        for column in ['enterprise_value', 'equity_value', 'fair_price', 'margin_of_safety']:
+            result_df[column] = np.broadcast_to(valuation[column], (n,))
+        return result_df
+
+    @staticmethod
+    def _draw(rng: np.random.Generator, n: int, spec) -> np.ndarray:
+        kind, *params = spec
+        if kind == 'normal' and len(params) == 2:
+            return rng.normal(params[0], params[1], n)
+        if kind == 'lognormal' and len(params) == 2:
+            return rng.lognormal(params[0], params[1], n)
+        if kind == 'uniform' and len(params) == 2:
+            return rng.uniform(params[0], params[1], n)
+        if kind == 'triangular' and len(params) == 3:
+            return rng.triangular(params[0], params[1], params[2], n)
+        raise ValueError(f"Invalid distribution {spec!r}. Use ('normal', mean, std), ('lognormal', mean, sigma), "
+                         f"('uniform', low, high) or ('triangular', left, mode, right).")
+
     def dcf(self) -> Dict[str, str]:
         """Generate a Discounted Cash Flow (DCF) valuation Excel spreadsheet.
 
@@ -2544,10 +2879,7 @@ class Ticker:
         market_cap_wide['report_date'] = pd.to_datetime(market_cap_wide['report_date']).astype('datetime64[us]')
         market_cap_cols = [col for col in market_cap_wide.columns if col != 'report_date']
 
-        ttm_net_income_sql = load_sql("select_ttm_net_income_by_industry",
-                                      stock_statement=self.huggingface_client.get_url_path(stock_statement),
-                                      symbols=", ".join(f"'{s}'" for s in market_cap_cols))
-        ttm_net_income_df = self.duckdb_client.query(ttm_net_income_sql).copy()
+        ttm_net_income_df = self._ttm_item_by_symbols(market_cap_cols, 'net_income_common_stockholders')
 
 
         currency_dict = self.company_meta.get_financial_currency_map()
@@ -2654,10 +2986,7 @@ class Ticker:
         market_cap_wide['report_date'] = pd.to_datetime(market_cap_wide['report_date']).astype('datetime64[us]')
         market_cap_cols = [col for col in market_cap_wide.columns if col != 'report_date']
 
-        ttm_revenue_sql = load_sql("select_ttm_revenue_by_industry",
-                                   stock_statement=self.huggingface_client.get_url_path(stock_statement),
-                                   symbols=", ".join(f"'{s}'" for s in market_cap_cols))
-        ttm_revenue_df = self.duckdb_client.query(ttm_revenue_sql).copy()
+        ttm_revenue_df = self._ttm_item_by_symbols(market_cap_cols, 'total_revenue')
 
         currency_dict = self.company_meta.get_financial_currency_map()
         ttm_revenue_df['report_date'] = pd.to_datetime(ttm_revenue_df['report_date']).astype('datetime64[us]')
@@ -3420,23 +3749,68 @@ class Ticker:
         return self.duckdb_client.query(sql)
 
     def _calculate_yoy_growth(self, item_name: str, period_type: str, finance_type: str) -> pd.DataFrame:
-        url = self.huggingface_client.get_url_path(stock_statement)
         metric_name = item_name.replace('total_', '')  # For naming consistency in output
-        ttm_filter = "AND report_date != 'TTM'" if period_type == 'quarterly' else ''
+        growth_df = self._growth([self.ticker], [item_name], period_type, finance_type=finance_type, qoq=False)
+        growth_df = growth_df.rename(columns={
+            'item_value': metric_name,
+            'prev_year_value': f'prev_year_{metric_name}'
+        })
+        return growth_df[['symbol', 'report_date', metric_name, f'prev_year_{metric_name}', 'yoy_growth']] \
+            .reset_index(drop=True)
+
+    def _growth(self, symbols: List[str], item_names: List[str], period_type: str,
+                cagr_years: Optional[List[int]] = None, finance_type: Optional[str] = None,
+                qoq: bool = True) -> pd.DataFrame:
+        if period_type not in (quarterly, annual):
+            raise ValueError(f"Invalid period_type: {period_type}. Use '{quarterly}' or '{annual}'")
+        if not item_names:
+            raise ValueError("At least one item name is required")
+        if isinstance(cagr_years, int):
+            cagr_years = [cagr_years]
+
+        # Each extra horizon is one more window over the same sorted partition, not another scan
+        horizons = []
+        if qoq and period_type == quarterly:
+            horizons.append((3, 'prev_quarter_value', 'qoq_growth', None))
+        for years in cagr_years or []:
+            if years < 1:
+                raise ValueError(f"Invalid CAGR horizon: {years}. Use whole years >= 1")
+            horizons.append((12 * years, f'prev_{years}y_value', f'cagr_{years}y', years))
+
+        lag_columns = ""
+        growth_columns = ""
+        for months, prev_column, growth_column, years in horizons:
+            lag_columns += f"""
+        , FIRST_VALUE(item_value) OVER (
+            PARTITION BY symbol, item_name
+            ORDER BY period_key
+            RANGE BETWEEN {months} PRECEDING AND {months} PRECEDING
+        ) AS {prev_column}"""
+            if years is None:
+                growth_expr = f"CASE WHEN {prev_column} IS NOT NULL AND {prev_column} != 0 " \
+                              f"THEN ROUND((item_value - {prev_column}) / ABS({prev_column}), 4) ELSE NULL END"
+            else:
+                # CAGR is undefined across a sign change or from zero
+                growth_expr = f"CASE WHEN {prev_column} > 0 AND item_value > 0 " \
+                              f"THEN ROUND(POWER(item_value / {prev_column}, 1.0 / {years}) - 1, 4) ELSE NULL END"
+            growth_columns += f"""
+    , {prev_column}
+    , {growth_expr} AS {growth_column}"""
 
-        sql = load_sql("select_metric_calculate_yoy_growth_by_symbol",
-                       ticker = self.ticker,
-                       url = url,
-                       metric_name = metric_name,
-                       item_name = item_name,
-                       period_type = period_type,
-                       finance_type = finance_type,
-                       ttm_filter = ttm_filter)
+        url = self.huggingface_client.get_url_path(stock_statement)
+        sql = load_sql("select_growth_by_symbols",
+                       url=url,
+                       symbols=", ".join(f"'{s}'" for s in symbols),
+                       item_names=", ".join(f"'{i}'" for i in item_names),
+                       period_type=period_type,
+                       finance_type_filter=f"AND finance_type = '{finance_type}'" if finance_type else "",
+                       lag_columns=lag_columns,
+                       growth_columns=growth_columns)
         return self.duckdb_client.query(sql)
 
 
     def _generate_margin(self, margin_type: str, period_type: str, numerator_item: str,
-                         margin_column: str) -> pd.DataFrame:
+                         margin_column: str, symbols: Optional[List[str]] = None) -> pd.DataFrame:
         url = self.huggingface_client.get_url_path('stock_statement')
         ttm_filter = "AND report_date != 'TTM'" if period_type == 'quarterly' else ""
         finance_type_filter = \
@@ -3444,7 +3818,7 @@ class Ticker:
             else "AND finance_type in ('income_statement', 'cash_flow')" if margin_type == 'fcf' \
             else ""
         sql = load_sql("select_margin_for_symbol",
-                       ticker = self.ticker,
+                       symbols = ", ".join(f"'{s}'" for s in (symbols or [self.ticker])),
                        url = url,
                        numerator_item = numerator_item,
                        margin_column = margin_column,
@@ -3453,6 +3827,55 @@ class Ticker:
                        finance_type_filter = finance_type_filter)
         return self.duckdb_client.query(sql)
 
+    def _query_ttm_items(self, symbols: List[str], item_names: List[str], detail: bool = False) -> pd.DataFrame:
+        url = self.huggingface_client.get_url_path(stock_statement)
+        # The window JSON needs two extra ARRAY_AGG passes, so only build it when asked
+        detail_column = ", TO_JSON(MAP(ARRAY_AGG(report_date) OVER w, ARRAY_AGG(item_value) OVER w)) " \
+                        "AS report_date_2_value" if detail else ""
+        sql = load_sql("select_ttm_items_by_symbols",
+                       url=url,
+                       symbols=", ".join(f"'{s}'" for s in symbols),
+                       item_names=", ".join(f"'{i}'" for i in item_names),
+                       detail_column=detail_column)
+        return self.duckdb_client.query(sql)
+
+    def _ttm_items(self, symbols: List[str], item_names: List[str], detail: bool = False) -> pd.DataFrame:
+        if not item_names:
+            raise ValueError("At least one item name is required")
+        ttm_df = self._query_ttm_items(symbols, item_names, detail)
+        ordered_columns = [f"ttm_{item}" for item in item_names]
+        if detail:
+            ordered_columns += [f"report_date_2_{item}" for item in item_names]
+        if ttm_df.empty:
+            return pd.DataFrame(columns=['symbol', 'report_date'] + ordered_columns)
+
+        value_columns = ['ttm_value', 'report_date_2_value'] if detail else ['ttm_value']
+
+        wide_df = ttm_df.drop_duplicates(subset=['symbol', 'report_date', 'item_name']) \
+            .set_index(['symbol', 'report_date', 'item_name'])[value_columns] \
+            .unstack('item_name')
+        prefixes = {'ttm_value': 'ttm_', 'report_date_2_value': 'report_date_2_'}
+        wide_df.columns = [f"{prefixes[value]}{item}" for value, item in wide_df.columns]
+        wide_df = wide_df.reindex(columns=ordered_columns).reset_index()
+        return wide_df.sort_values(['symbol', 'report_date']).reset_index(drop=True)
+
+    def _ttm_item(self, item_name: str, value_column: str, detail_column: str) -> pd.DataFrame:
+        ttm_df = self._query_ttm_items([self.ticker], [item_name], detail=True)
+        return ttm_df[['report_date', 'ttm_value', 'report_date_2_value']].rename(columns={
+            'ttm_value': value_column,
+            'report_date_2_value': detail_column
+        })
+
+    def _ttm_item_by_symbols(self, symbols: List[str], item_name: str) -> pd.DataFrame:
+        # Wide format (report_date + one column per symbol), matching the industry market cap table
+        ttm_df = self._query_ttm_items(symbols, [item_name])
+        if ttm_df.empty:
+            return pd.DataFrame(columns=['report_date'] + list(symbols))
+        wide_df = ttm_df.pivot_table(index='report_date', columns='symbol', values='ttm_value', aggfunc='first')
+        wide_df = wide_df.reindex(columns=list(symbols)).sort_index().reset_index()
+        wide_df.columns.name = None
+        return wide_df
+
     def _query_data(self, table_name: str) -> pd.DataFrame:
         return self._query_data2(table_name, self.ticker)
 
@@ -3464,6 +3887,44 @@ class Ticker:
                         url = url)
         return self.duckdb_client.query(sql)
 
+    def _query_data_by_date_range(self, table_name: str, start: Optional[str], end: Optional[str],
+                                  columns: Optional[List[str]]) -> pd.DataFrame:
+        url = self.huggingface_client.get_url_path(table_name)
+        sql = load_sql("select_by_symbol_and_date_range",
+                       ticker=self.ticker,
+                       url=url,
+                       columns=self._sql_columns(columns),
+                       date_filter=self._date_range_filter(start, end))
+        return self.duckdb_client.query(sql)
+
+    @staticmethod
+    def _date_range_filter(start: Optional[str], end: Optional[str], column: str = 'report_date') -> str:
+        # Normalise through pandas so malformed dates raise ValueError instead of reaching the SQL
+        conditions = []
+        if start is not None:
+            conditions.append(f"AND {column} >= '{pd.to_datetime(start).strftime('%Y-%m-%d')}'")
+        if end is not None:
+            conditions.append(f"AND {column} <= '{pd.to_datetime(end).strftime('%Y-%m-%d')}'")
+        return " ".join(conditions)
+
+    @staticmethod
+    def _sql_columns(columns: Optional[List[str]]) -> str:
+        if not columns:
+            return "*"
+        for column in columns:
+            if not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', column):
+                raise ValueError(f"Invalid column name: {column}")
+        return ", ".join(columns)
+
+    @staticmethod
+    def _project_columns(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+        if not columns:
+            return df
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"Unknown columns: {missing}. Available columns: {list(df.columns)}")
+        return df[list(columns)]
+
     def _statement(self, finance_type: str, period_type: str) -> Statement:
         url = self.huggingface_client.get_url_path(stock_statement)
         sql = load_sql("select_statement_by_symbol",
@@ -1,14 +1,23 @@
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Iterable, Iterator
 
+import numpy as np
 import pandas as pd
+from openai import OpenAI
 
 from defeatbeta_api.client.duckdb_conf import Configuration
+from defeatbeta_api.client.openai_conf import OpenAIConfiguration
 from defeatbeta_api.data.news import News
+from defeatbeta_api.data.news_store import load_articles, news_uuids
+from defeatbeta_api.data.sentiment import transcript_sentiment, news_sentiment
+from defeatbeta_api.data.service_context import get_service_context
 from defeatbeta_api.data.statement import Statement
 from defeatbeta_api.data.ticker import Ticker
-from defeatbeta_api.data.transcripts import Transcripts
+from defeatbeta_api.data.transcript_index import get_transcript_index
+from defeatbeta_api.data.transcript_sentences import backfill_sentences
+from defeatbeta_api.data.transcripts import Transcripts, TranscriptKey, TRANSCRIPT_BATCH_SIZE, list_transcripts, \
+    load_transcripts, stream_transcripts, analyze_transcripts_with_ai, mention_counts
 
 
 class Tickers:
@@ -56,8 +65,9 @@ class Tickers:
     ):
         self.tickers = [t.upper() for t in tickers]
         self.max_workers = max_workers
+        self._context = get_service_context(http_proxy=http_proxy, log_level=log_level, config=config)
         self._ticker_map: Dict[str, Ticker] = {
-            t: Ticker(t, http_proxy=http_proxy, log_level=log_level, config=config)
+            t: Ticker(t, context=self._context)
             for t in self.tickers
         }
 
@@ -92,6 +102,17 @@ class Tickers:
             return pd.DataFrame()
         return pd.concat(frames, ignore_index=True)
 
+    def _run_bulk(self, method_name: str, **kwargs) -> pd.DataFrame:
+        """Call a multi-symbol *method_name* once with every ticker symbol.
+
+        Unlike :meth:`_run_parallel_concat`, the work is a single query that
+        covers all tickers, so cost does not grow with one scan per symbol.
+        """
+        if not self._ticker_map:
+            return pd.DataFrame()
+        ticker_obj = next(iter(self._ticker_map.values()))
+        return getattr(ticker_obj, method_name)(self.tickers, **kwargs)
+
     def _get_industry_representative_tickers(self) -> Dict[str, "Ticker"]:
         """Return one Ticker object per unique industry across all tickers.
 
@@ -149,11 +170,27 @@ class Tickers:
     def news(self) -> Dict[str, News]:
         """Latest news for each ticker.
 
+        The accessors share one article store keyed by uuid, so an article related to
+        several of the tickers is downloaded once.
+
         Returns:
             ``{'NVDA': News(...), 'GOOGL': News(...), ...}``
         """
         return self._run_parallel("news")
 
+    def get_articles(self, uuids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Articles with their paragraphs, each read once however many tickers it relates to.
+
+        Args:
+            uuids: Articles to read, or None for every article related to any of the tickers.
+
+        Returns:
+            One row per uuid: uuid, symbols (every related ticker), then the article columns.
+        """
+        if uuids is None:
+            uuids = news_uuids(self._context.duckdb_client, self._context.huggingface_client, self.tickers)
+        return load_articles(self._context.duckdb_client, self._context.huggingface_client, uuids)
+
     def earning_call_transcripts(self) -> Dict[str, Transcripts]:
         """Earnings-call transcripts for each ticker.
 
@@ -162,6 +199,105 @@ class Tickers:
         """
         return self._run_parallel("earning_call_transcripts")
 
+    def get_transcripts(self, periods: Optional[Iterable[tuple]] = None) -> pd.DataFrame:
+        """Transcript paragraphs of every ticker in one scan.
+
+        Args:
+            periods: (fiscal_year, fiscal_quarter) pairs read for every ticker, or
+                (symbol, fiscal_year, fiscal_quarter) triples. None reads every transcript.
+
+        Returns:
+            Long table: symbol, fiscal_year, fiscal_quarter, report_date, paragraph_number, speaker, content.
+        """
+        return load_transcripts(self._context.duckdb_client, self._context.huggingface_client,
+                                symbols=self.tickers, keys=self._transcript_keys(periods))
+
+    def iter_transcripts(self, periods: Optional[Iterable[tuple]] = None,
+                         batch_size: int = TRANSCRIPT_BATCH_SIZE) -> Iterator[Tuple[TranscriptKey, pd.DataFrame]]:
+        """Yield ``((symbol, fiscal_year, fiscal_quarter), paragraphs)`` per transcript.
+
+        Transcripts are read *batch_size* at a time, one scan per batch, so memory stays
+        bounded when loading the full history of a large universe.
+        """
+        keys = self._transcript_keys(periods)
+        if keys is None:
+            listing = list_transcripts(self._context.duckdb_client, self._context.huggingface_client, self.tickers)
+            keys = listing[['symbol', 'fiscal_year', 'fiscal_quarter']].itertuples(index=False)
+        return stream_transcripts(self._context.duckdb_client, self._context.huggingface_client, keys, batch_size)
+
+    def backfill_transcript_sentences(self, periods: Optional[Iterable[tuple]] = None,
+                                      processes: Optional[int] = None) -> int:
+        """Split and cache transcript sentences for every ticker in a process pool; returns how many were split."""
+        return backfill_sentences(self.iter_transcripts(periods), processes=processes)
+
+    def analyze_transcripts_with_ai(self, analysis: str, llm: OpenAI, periods: Optional[Iterable[tuple]] = None,
+                                    config: Optional[OpenAIConfiguration] = None, concurrency: int = 4,
+                                    max_retries: int = 3, backoff: float = 1.0, cache: bool = True) -> pd.DataFrame:
+        """Run one `*_with_ai` analysis over many (symbol, quarter) pairs concurrently.
+
+        Args:
+            analysis: 'summary', 'change' or 'forecast'.
+            periods: (fiscal_year, fiscal_quarter) pairs for every ticker, or
+                (symbol, fiscal_year, fiscal_quarter) triples. None analyzes every transcript.
+            concurrency, max_retries, backoff, cache: See :meth:`Transcripts.analyze_with_ai`.
+
+        Returns:
+            Combined records of every pair that succeeded; failures are logged and skipped.
+        """
+        keys = self._transcript_keys(periods)
+        if keys is None:
+            listing = list_transcripts(self._context.duckdb_client, self._context.huggingface_client, self.tickers)
+            keys = listing[['symbol', 'fiscal_year', 'fiscal_quarter']].itertuples(index=False)
+        jobs = [(symbol, int(year), int(quarter)) for symbol, year, quarter in keys]
+        return analyze_transcripts_with_ai(self.earning_call_transcripts(), jobs, analysis, llm, config=config,
+                                           concurrency=concurrency, max_retries=max_retries, backoff=backoff,
+                                           cache=cache)
+
+    def _transcript_keys(self, periods: Optional[Iterable[tuple]]) -> Optional[List[TranscriptKey]]:
+        if periods is None:
+            return None
+        keys = []
+        for period in periods:
+            if len(period) == 3:
+                keys.append((period[0].upper(), period[1], period[2]))
+            else:
+                keys.extend((symbol, period[0], period[1]) for symbol in self.tickers)
+        return keys
+
+    def mention_counts(self, terms: List[str], by: str = 'quarter', match: str = 'phrase',
+                       case_sensitive: bool = False) -> pd.DataFrame:
+        """Mentions of *terms* per quarter or speaker across every ticker, in one scan.
+
+        See :func:`defeatbeta_api.data.transcripts.mention_counts` for the arguments and layout.
+        """
+        return mention_counts(self._context.duckdb_client, self._context.huggingface_client, terms,
+                              symbols=self.tickers, by=by, match=match, case_sensitive=case_sensitive)
+
+    def transcript_sentiment(self, by: str = 'quarter') -> pd.DataFrame:
+        """Lexicon tone of every ticker's calls, per 'quarter' or 'paragraph', from one shared score table.
+
+        Returns:
+            symbol, fiscal_year, fiscal_quarter, report_date (plus paragraph_number and speaker
+            per paragraph), positive, negative, uncertainty, words, tone.
+        """
+        return transcript_sentiment(self._context.duckdb_client, self._context.huggingface_client,
+                                    symbols=self.tickers, by=by)
+
+    def news_sentiment(self) -> pd.DataFrame:
+        """Lexicon tone of every article about any of the tickers, each article scored once."""
+        return news_sentiment(self._context.duckdb_client, self._context.huggingface_client, symbols=self.tickers)
+
+    def search_transcripts(self, query: str, date_range: Optional[Tuple[Optional[str], Optional[str]]] = None,
+                           top_k: int = 10) -> pd.DataFrame:
+        """BM25 full-text search over the transcript paragraphs of all tickers.
+
+        Returns:
+            One row per paragraph (symbol, fiscal_year, fiscal_quarter, report_date,
+            paragraph_number, speaker, snippet, score), best match first.
+        """
+        index = get_transcript_index(self._context.duckdb_client, self._context.huggingface_client)
+        return index.search(query, symbols=self.tickers, date_range=date_range, top_k=top_k)
+
     # ------------------------------------------------------------------
     # Category 1 – Finance
     # ------------------------------------------------------------------
@@ -247,6 +383,19 @@ class Tickers:
         """Trailing-twelve-months EPS for all tickers, combined into a single DataFrame."""
         return self._run_parallel_concat("ttm_eps")
 
+    def ttm(self, items: List[str], detail: bool = False) -> pd.DataFrame:
+        """Trailing-twelve-months sums of *items* for all tickers.
+
+        Unlike the per-ticker methods this runs a single query covering every
+        ticker and item, so TTM for many items across a large universe costs one
+        scan of the statement table.
+
+        Args:
+            items:  Statement item names, e.g. ``['total_revenue', 'ebitda']``.
+            detail: Also return the per-quarter window as JSON (``report_date_2_<item>``).
+        """
+        return self._run_bulk("_ttm_items", item_names=items, detail=detail)
+
     def ttm_revenue(self) -> pd.DataFrame:
         """Trailing-twelve-months revenue for all tickers, combined into a single DataFrame."""
         return self._run_parallel_concat("ttm_revenue")
@@ -293,33 +442,102 @@ class Tickers:
         return self._run_parallel_concat("peg_ratio")
 
     def roe(self) -> pd.DataFrame:
-        """Historical return on equity for all tickers, combined into a single DataFrame."""
-        return self._run_parallel_concat("roe")
+        """Historical return on equity for all tickers, computed in a single query."""
+        return self._run_bulk("_roe")
 
     def roa(self) -> pd.DataFrame:
-        """Historical return on assets for all tickers, combined into a single DataFrame."""
-        return self._run_parallel_concat("roa")
+        """Historical return on assets for all tickers, computed in a single query."""
+        return self._run_bulk("_roa")
 
     def roic(self) -> pd.DataFrame:
-        """Historical return on invested capital for all tickers, combined into a single DataFrame."""
-        return self._run_parallel_concat("roic")
+        """Historical return on invested capital for all tickers, computed in a single query."""
+        return self._run_bulk("_roic")
+
+    def roce(self) -> pd.DataFrame:
+        """Historical return on capital employed for all tickers, computed in a single query."""
+        return self._run_bulk("_roce")
 
     def equity_multiplier(self) -> pd.DataFrame:
-        """Historical equity multiplier for all tickers, combined into a single DataFrame."""
-        return self._run_parallel_concat("equity_multiplier")
+        """Historical equity multiplier for all tickers, computed in a single query."""
+        return self._run_bulk("_equity_multiplier")
 
     def asset_turnover(self) -> pd.DataFrame:
-        """Historical asset turnover for all tickers, combined into a single DataFrame."""
-        return self._run_parallel_concat("asset_turnover")
+        """Historical asset turnover for all tickers, computed in a single query."""
+        return self._run_bulk("_asset_turnover")
 
     def wacc(self) -> pd.DataFrame:
         """Historical WACC for all tickers, combined into a single DataFrame."""
         return self._run_parallel_concat("wacc")
 
+    def as_of(self, dates, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        """Point-in-time fundamentals and valuations for all tickers on each of *dates*,
+        combined into a single DataFrame.
+
+        Args:
+            dates:   A date or list of dates, e.g. month-ends of a backtest.
+            metrics: Optional subset of metrics; see :meth:`Ticker.as_of`.
+        """
+        return self._run_parallel_concat("as_of", dates=dates, metrics=metrics)
+
+    def dcf_data(self) -> pd.DataFrame:
+        """DCF valuation for all tickers, one row per symbol.
+
+        Market-wide inputs (treasury yields) are fetched once and shared, per-symbol
+        fundamentals are fetched in parallel, and the 10-year projection and
+        discounting run as a single array computation across every symbol.
+        Tickers without WACC data (e.g. ETFs, indices) are skipped.
+
+        Returns:
+            DataFrame with columns: symbol, report_date, currency, wacc, growth_rate_1_5y,
+            growth_rate_6_10y, growth_rate_terminal, base_fcf, ttm_revenue, enterprise_value,
+            cash, total_debt, equity_value, shares_outstanding, fair_price, current_price,
+            margin_of_safety, recommendation
+        """
+        if not self._ticker_map:
+            return pd.DataFrame()
+        market = next(iter(self._ticker_map.values()))._dcf_market_inputs()
+        results = self._run_parallel("_dcf_inputs", market=market, missing_ok=True)
+        inputs = pd.DataFrame([r for r in results.values() if r is not None])
+        if inputs.empty:
+            return pd.DataFrame()
+
+        valuation = Ticker._project_dcf_inputs({
+            column: inputs[column].to_numpy(dtype=float)
+            for column in ["base_fcf", "ttm_revenue", "growth_rate_1_5y", "revenue_growth_1_5y",
+                           "growth_rate_terminal", "wacc", "cash", "total_debt",
+                           "shares_outstanding", "current_price"]
+        })
+
+        result_df = inputs[[
+            'symbol', 'report_date', 'currency', 'wacc', 'growth_rate_1_5y', 'growth_rate_6_10y',
+            'growth_rate_terminal', 'base_fcf', 'ttm_revenue'
+        ]].copy()
+        result_df['enterprise_value'] = valuation['enterprise_value']
+        result_df['cash'] = inputs['cash']
+        result_df['total_debt'] = inputs['total_debt']
+        result_df['equity_value'] = valuation['equity_value']
+        result_df['shares_outstanding'] = inputs['shares_outstanding']
+        result_df['fair_price'] = valuation['fair_price']
+        result_df['current_price'] = inputs['current_price']
+        result_df['margin_of_safety'] = valuation['margin_of_safety']
+        result_df['recommendation'] = np.where(result_df['fair_price'] > result_df['current_price'], 'Buy', 'Sell')
+        return result_df
+
     # ------------------------------------------------------------------
     # Category 3 – Growth
     # ------------------------------------------------------------------
 
+    def growth(self, items: List[str], period_type: str = "quarterly",
+               cagr_years: Optional[List[int]] = None) -> pd.DataFrame:
+        """YoY, QoQ and CAGR growth of *items* for all tickers in a single query.
+
+        Args:
+            items:       Statement item names, e.g. ``['total_revenue', 'ebitda']``.
+            period_type: ``'quarterly'`` (default) or ``'annual'``.
+            cagr_years:  Optional CAGR horizons in years, e.g. ``[3, 5]``.
+        """
+        return self._run_bulk("_growth", item_names=items, period_type=period_type, cagr_years=cagr_years)
+
     def quarterly_revenue_yoy_growth(self) -> pd.DataFrame:
         """Quarterly revenue YoY growth for all tickers, combined into a single DataFrame."""
         return self._run_parallel_concat("quarterly_revenue_yoy_growth")
@@ -0,0 +1,366 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+from openai import OpenAI, APIConnectionError, RateLimitError, InternalServerError
+from rich.console import Console
+from rich.live import Live
+from rich.panel import Panel
+
+from defeatbeta_api.client.openai_conf import OpenAIConfiguration
+from defeatbeta_api.utils.util import validate_llm_cache_directory
+
+ANALYSES = ('summary', 'change', 'forecast')
+
+# Errors worth another attempt: transport failures, throttling, 5xx and malformed tool calls
+RETRYABLE_ERRORS = (APIConnectionError, RateLimitError, InternalServerError, ValueError)
+
+# Rough characters per token of English prose and JSON, used to budget prompts without a tokenizer
+CHARS_PER_TOKEN = 4
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisRequest(NamedTuple):
+    """Everything sent to the model for one transcript (or transcript chunk) analysis."""
+    transcript: str
+    template: str
+    messages: List[Dict[str, str]]
+    tools: Any
+    result_key: str
+
+
+class Usage(NamedTuple):
+    prompt_tokens: int = 0
+    reasoning_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def serialize_transcript(paragraphs: List[Dict[str, Any]], compact: bool = False) -> str:
+    """Transcript JSON for the prompt; *compact* drops the indentation and separator spaces."""
+    if compact:
+        return json.dumps(paragraphs, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(paragraphs, ensure_ascii=False, indent=2)
+
+
+def chunk_paragraphs(paragraphs: List[Dict[str, Any]], budget: int, compact: bool = False) -> List[List[Dict[str, Any]]]:
+    """
+    Split a transcript into chunks of roughly at most *budget* tokens each.
+
+    Consecutive paragraphs of the same speaker form a turn, and turns are packed
+    whole, so a question and its answer are only separated when the chunk is full.
+    A turn larger than the budget is split between its paragraphs, its first
+    paragraphs topping up the current chunk; a single paragraph over budget
+    becomes a chunk of its own.
+    """
+    if budget <= 0:
+        raise ValueError(f"max_prompt_tokens leaves no room for the transcript (budget {budget})")
+
+    turns: List[List[Dict[str, Any]]] = []
+    for paragraph in paragraphs:
+        if turns and turns[-1][-1].get('speaker') == paragraph.get('speaker'):
+            turns[-1].append(paragraph)
+        else:
+            turns.append([paragraph])
+
+    # Each paragraph is serialised once; a chunk costs roughly the sum of its paragraphs
+    def cost(items: List[Dict[str, Any]]) -> int:
+        return sum(estimate_tokens(serialize_transcript([item], compact)) for item in items)
+
+    chunks: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    current_cost = 0
+    for turn in turns:
+        turn_cost = cost(turn)
+        if turn_cost <= budget:
+            if current and current_cost + turn_cost > budget:
+                chunks.append(current)
+                current, current_cost = [], 0
+            current.extend(turn)
+            current_cost += turn_cost
+            continue
+        # Too long to keep whole: fill the current chunk paragraph by paragraph
+        for paragraph in turn:
+            paragraph_cost = cost([paragraph])
+            if current and current_cost + paragraph_cost > budget:
+                chunks.append(current)
+                current, current_cost = [], 0
+            current.append(paragraph)
+            current_cost += paragraph_cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def merge_tool_arguments(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the tool arguments of every chunk, in transcript order.
+
+    ``key_financial_data`` keeps, per metric, the first non-null value of the earliest
+    chunk that reported it; list fields such as ``key_sentences`` are concatenated.
+    """
+    if len(results) == 1:
+        return results[0]
+    merged: Dict[str, Any] = {}
+    for result in results:
+        for key, value in result.items():
+            if isinstance(value, dict):
+                target = merged.setdefault(key, {})
+                for metric, data in value.items():
+                    if target.get(metric) is None:
+                        target[metric] = data
+            elif isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+            else:
+                merged.setdefault(key, value)
+    return merged
+
+
+def parse_tool_arguments(raw_args: str) -> Dict[str, Any]:
+    """Decode tool-call arguments, trimming ``</tool_call>`` tails and unbalanced braces."""
+    try:
+        clean_args = raw_args.split("</tool_call>")[0].strip()
+        open_braces = clean_args.count('{')
+        close_braces = clean_args.count('}')
+        if open_braces > close_braces:
+            clean_args += '}' * (open_braces - close_braces)
+        elif close_braces > open_braces:
+            clean_args = clean_args.rstrip('}' * (close_braces - open_braces))
+        return json.loads(clean_args)
+    except Exception as e:
+        raise ValueError(f"Failed to parse tool_call arguments: {raw_args}, error: {e}")
+
+
+def complete_tool_call(llm: OpenAI, conf: OpenAIConfiguration, request: AnalysisRequest) -> Tuple[Dict[str, Any], Usage]:
+    """Non-streaming completion; returns the arguments of the first tool call."""
+    response = llm.chat.completions.create(
+        model=conf.get_model(),
+        messages=request.messages,
+        temperature=conf.get_temperature(),
+        top_p=conf.get_top_p(),
+        stream=False,
+        tools=request.tools,
+        tool_choice=conf.get_tool_choice()
+    )
+    if not response or not response.choices:
+        raise ValueError(f"Invalid response from LLM: {response}")
+
+    message = response.choices[0].message
+    if not getattr(message, "tool_calls", None):
+        raise ValueError(f"No tool call was made by the model. Raw message: {message}")
+
+    usage = response.usage
+    details = getattr(usage, "completion_tokens_details", None)
+    return parse_tool_arguments(message.tool_calls[0].function.arguments.strip()), Usage(
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(details, "reasoning_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+    )
+
+
+def stream_tool_call(llm: OpenAI, conf: OpenAIConfiguration, request: AnalysisRequest) -> Tuple[Dict[str, Any], Usage]:
+    """
+    Streaming completion that shows the model's reasoning while it arrives.
+
+    A terminal gets a rich.Live panel with the last few reasoning lines; any other
+    stdout just receives the reasoning text, with no Live display refreshing behind it.
+    """
+    response = llm.chat.completions.create(
+        model=conf.get_model(),
+        messages=request.messages,
+        temperature=conf.get_temperature(),
+        top_p=conf.get_top_p(),
+        stream=True,
+        tools=request.tools,
+        tool_choice=conf.get_tool_choice()
+    )
+    if not response:
+        raise ValueError(f"Invalid response from LLM: {response}")
+
+    if sys.stdout.isatty():
+        with Live(console=Console(), refresh_per_second=20) as live:
+            raw_args, reasoning_text, usage = _consume_stream(response, live)
+            live.update(Panel(reasoning_text, title="[bold white]🧠 Finish Think[/]", border_style="white",
+                              padding=(1, 2)))
+    else:
+        raw_args, _, usage = _consume_stream(response, None)
+
+    if raw_args == "":
+        raise ValueError(f"No tool call was made by the model. Raw message: {raw_args}")
+    return parse_tool_arguments(raw_args), usage
+
+
+def _consume_stream(response, live: Optional[Live]) -> Tuple[str, str, Usage]:
+    raw_args = ""
+    reasoning_text = ""
+    usage = Usage()
+    for chunk in response:
+        delta = chunk.choices[0].delta
+
+        if getattr(chunk, "usage", None) and chunk.choices[0].finish_reason:
+            details = getattr(chunk.usage, "completion_tokens_details", None)
+            usage = Usage(getattr(chunk.usage, "prompt_tokens", 0),
+                          getattr(details, "reasoning_tokens", 0) if details else 0,
+                          getattr(chunk.usage, "completion_tokens", 0))
+
+        reasoning = getattr(delta, "reasoning_content", None)
+        if reasoning:
+            if live is not None:
+                reasoning_text += reasoning
+                visible_text = "\n".join(reasoning_text.splitlines()[-8:])
+                live.update(Panel(visible_text + " ▌", title="[bold green]🧠 Thinking Step by Step[/]",
+                                  border_style="green", padding=(1, 2)))
+            else:
+                print(reasoning, end="", flush=True)
+
+        if delta.tool_calls:
+            raw_args += f"{delta.tool_calls[0].function.arguments}"
+    return raw_args, reasoning_text, usage
+
+
+class ResponseCache:
+    """
+    Tool-call arguments on disk, one JSON file per request.
+
+    The file name is the sha256 of (transcript hash, prompt template hash, model,
+    temperature, top_p), so any change to the transcript text, the prompt or tool
+    schema, or the sampling settings misses the cache.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or validate_llm_cache_directory()
+
+    @staticmethod
+    def key(request: AnalysisRequest, conf: OpenAIConfiguration) -> str:
+        parts = [
+            hashlib.sha256(request.transcript.encode("utf-8")).hexdigest(),
+            hashlib.sha256(request.template.encode("utf-8")).hexdigest(),
+            str(conf.get_model()),
+            repr(conf.get_temperature()),
+            repr(conf.get_top_p()),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, f"{key}.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, key: str, func_args: Dict[str, Any]) -> None:
+        path = os.path.join(self.directory, f"{key}.json")
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(func_args, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def call_tool(llm: OpenAI, conf: OpenAIConfiguration, request: AnalysisRequest,
+              responses: Optional[ResponseCache] = None, max_retries: int = 3, backoff: float = 1.0,
+              label: str = "") -> Tuple[Dict[str, Any], Usage]:
+    """
+    Headless tool call with retries and an optional response cache.
+
+    A call failing with one of RETRYABLE_ERRORS, or answering without *request.result_key*,
+    is retried *max_retries* times, sleeping ``backoff * 2 ** attempt`` seconds (with jitter).
+    """
+    key = ResponseCache.key(request, conf) if responses else None
+    cached = responses.get(key) if responses else None
+    if cached is not None:
+        return cached, Usage()
+    for attempt in range(max_retries + 1):
+        try:
+            func_args, usage = complete_tool_call(llm, conf, request)
+            if not isinstance(func_args, dict) or func_args.get(request.result_key) is None:
+                raise ValueError(f"'{request.result_key}' missing in func_args: {func_args}")
+            break
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff * 2 ** attempt * (1 + random.random() / 2)
+            logger.warning(f"{label} attempt {attempt + 1} failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+    if responses:
+        responses.put(key, func_args)
+    return func_args, usage
+
+
+def run_chunks(llm: OpenAI, conf: OpenAIConfiguration, requests: List[AnalysisRequest],
+               responses: Optional[ResponseCache] = None, max_retries: int = 3, backoff: float = 1.0,
+               label: str = "", parallel: bool = True) -> Tuple[Dict[str, Any], Usage]:
+    """Map every chunk request through `call_tool` (in parallel unless told otherwise) and merge in chunk order."""
+    def call(item: Tuple[int, AnalysisRequest]):
+        index, request = item
+        return call_tool(llm, conf, request, responses, max_retries, backoff, f"{label} chunk {index + 1}/{len(requests)}")
+
+    if parallel and len(requests) > 1:
+        with ThreadPoolExecutor(max_workers=len(requests)) as pool:
+            outputs = list(pool.map(call, enumerate(requests)))
+    else:
+        outputs = [call(item) for item in enumerate(requests)]
+    usage = Usage(*(sum(values) for values in zip(*(u for _, u in outputs))))
+    return merge_tool_arguments([func_args for func_args, _ in outputs]), usage
+
+
+def run_batch(jobs: Iterable[Tuple[str, int, int]],
+              build_requests: Callable[[Tuple[str, int, int]], List[AnalysisRequest]],
+              build_records: Callable[[Tuple[str, int, int], Dict[str, Any]], pd.DataFrame],
+              llm: OpenAI,
+              conf: OpenAIConfiguration,
+              concurrency: int = 4,
+              max_retries: int = 3,
+              backoff: float = 1.0,
+              cache: bool = True) -> pd.DataFrame:
+    """
+    Run one analysis over many (symbol, fiscal_year, fiscal_quarter) jobs, headless.
+
+    Up to *concurrency* jobs are in flight at once; the chunks of a job are requested
+    one after another on its worker, each through `call_tool` with retries and, with
+    *cache*, the ResponseCache. A job that still fails is logged and skipped.
+
+    Returns:
+        The records of every successful job, concatenated in job order.
+    """
+    if concurrency <= 0:
+        raise ValueError(f"concurrency must be positive, got {concurrency}")
+    jobs = list(dict.fromkeys(jobs))
+    responses = ResponseCache() if cache else None
+
+    def run(job: Tuple[str, int, int]) -> pd.DataFrame:
+        func_args, usage = run_chunks(llm, conf, build_requests(job), responses, max_retries, backoff,
+                                      _label(job), parallel=False)
+        logger.debug(f"{_label(job)} prompt tokens: {usage.prompt_tokens}, "
+                     f"reasoning tokens: {usage.reasoning_tokens}, completion tokens: {usage.completion_tokens}")
+        return build_records(job, func_args)
+
+    results: Dict[Tuple[str, int, int], pd.DataFrame] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(run, job): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            try:
+                results[job] = future.result()
+                logger.info(f"[{done}/{len(jobs)}] {_label(job)} analyzed")
+            except Exception as e:
+                logger.error(f"[{done}/{len(jobs)}] {_label(job)} failed: {e}")
+
+    frames = [results[job] for job in jobs if job in results and not results[job].empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def _label(job: Tuple[str, int, int]) -> str:
+    symbol, fiscal_year, fiscal_quarter = job
+    return f"{symbol} FY{fiscal_year} Q{fiscal_quarter}"
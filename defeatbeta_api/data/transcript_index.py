@@ -0,0 +1,218 @@
+import os
+import re
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from defeatbeta_api.client.duckdb_client import DuckDBClient
+from defeatbeta_api.client.hugging_face_client import HuggingFaceClient, get_cached_data_update_time
+from defeatbeta_api.data.sql.sql_loader import load_sql
+from defeatbeta_api.utils.const import stock_earning_call_transcripts
+from defeatbeta_api.utils.text import tokenize, tokenize_series
+from defeatbeta_api.utils.util import update_time_cached, versioned_build
+
+# BM25 term-frequency saturation and length normalisation (the usual Lucene defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Paragraphs tokenised per query while building; small row groups keep hit lookups cheap
+_BUILD_BATCH_SIZE = 200_000
+_ROW_GROUP_SIZE = 8192
+_SNIPPET_CHARS = 240
+
+SEARCH_COLUMNS = ['symbol', 'fiscal_year', 'fiscal_quarter', 'report_date', 'paragraph_number', 'speaker',
+                  'snippet', 'score']
+
+def get_transcript_index(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient) -> "TranscriptIndex":
+    """Return the index for the current dataset update_time, building it on first use."""
+    update_time = get_cached_data_update_time()
+    return update_time_cached('transcript_index', update_time,
+                              lambda: TranscriptIndex.open_or_build(duckdb_client, huggingface_client, update_time))
+
+
+class TranscriptIndex:
+    """
+    BM25 inverted index over every earnings call paragraph, stored on disk per update_time.
+
+    ``<index dir>/transcripts/<update_time>/`` holds:
+
+      - ``paragraphs.parquet`` → one row per UNNESTed paragraph, ordered by ``doc_id``
+      - ``terms.npy``          → sorted vocabulary; the postings of ``terms[i]`` are
+        ``postings_doc[offsets[i]:offsets[i + 1]]`` with frequencies in ``postings_tf``
+      - ``doc_length.npy``, ``doc_symbol.npy`` (codes into ``symbols.npy``), ``doc_date.npy``
+
+    The arrays are memory-mapped, so a query only touches the postings of its own terms.
+    """
+
+    _ARRAYS = ('terms', 'offsets', 'postings_doc', 'postings_tf', 'doc_length', 'doc_symbol', 'doc_date', 'symbols')
+
+    def __init__(self, directory: str, duckdb_client: DuckDBClient):
+        self.directory = directory
+        self.duckdb_client = duckdb_client
+        self.paragraphs_path = os.path.join(directory, 'paragraphs.parquet')
+        for name in self._ARRAYS:
+            setattr(self, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r'))
+        self.doc_count = len(self.doc_length)
+        self.avg_doc_length = float(np.mean(self.doc_length)) if self.doc_count else 0.0
+
+    @classmethod
+    def open_or_build(cls, duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+                      update_time: str) -> "TranscriptIndex":
+        directory = versioned_build('transcripts', update_time,
+                                    lambda building: cls.build(building, duckdb_client, huggingface_client))
+        return cls(directory, duckdb_client)
+
+    @staticmethod
+    def build(directory: str, duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient) -> None:
+        """Snapshot every paragraph into *directory* and write the inverted index next to it."""
+        url = huggingface_client.get_url_path(stock_earning_call_transcripts)
+        paragraphs_path = os.path.join(directory, 'paragraphs.parquet')
+        duckdb_client.execute(load_sql("copy_transcript_paragraphs", url=url, path=paragraphs_path,
+                                       row_group_size=_ROW_GROUP_SIZE))
+        doc_count = int(duckdb_client.query(f"SELECT count(*) AS n FROM '{paragraphs_path}'")['n'].iloc[0])
+
+        vocabulary, symbols = {}, {}
+        term_ids, doc_ids, tfs = [], [], []
+        doc_length = np.zeros(doc_count, dtype=np.int32)
+        doc_symbol = np.zeros(doc_count, dtype=np.int32)
+        doc_date = np.full(doc_count, np.datetime64('NaT'), dtype='datetime64[D]')
+        for start in range(0, doc_count, _BUILD_BATCH_SIZE):
+            batch = duckdb_client.query(load_sql("select_transcript_paragraphs_by_doc_range", path=paragraphs_path,
+                                                 start=start, end=start + _BUILD_BATCH_SIZE))
+            ids = batch['doc_id'].to_numpy()
+            codes, uniques = pd.factorize(batch['symbol'])
+            doc_symbol[ids] = np.array([symbols.setdefault(s, len(symbols)) for s in uniques], dtype=np.int32)[codes]
+            doc_date[ids] = pd.to_datetime(batch['report_date'], errors='coerce').to_numpy().astype('datetime64[D]')
+
+            tokens = tokenize_series(batch['content']).reset_index(drop=True)
+            lengths = tokens.str.len().to_numpy()
+            doc_length[ids] = lengths
+            if not lengths.sum():
+                continue
+            pairs = pd.DataFrame({
+                'doc_id': np.repeat(ids, lengths),
+                'term': np.concatenate([t for t in tokens if t]),
+            }).value_counts(sort=False)
+            codes, uniques = pd.factorize(pairs.index.get_level_values('term'))
+            term_ids.append(np.array([vocabulary.setdefault(t, len(vocabulary)) for t in uniques], dtype=np.int32)[codes])
+            doc_ids.append(pairs.index.get_level_values('doc_id').to_numpy().astype(np.int32))
+            tfs.append(np.minimum(pairs.to_numpy(), np.iinfo(np.uint16).max).astype(np.uint16))
+
+        # Renumber terms and symbols alphabetically so lookups are a binary search
+        terms, term_rank = TranscriptIndex._sorted_codes(vocabulary)
+        symbol_names, symbol_rank = TranscriptIndex._sorted_codes(symbols)
+        term_ids = term_rank[np.concatenate(term_ids)] if term_ids else np.zeros(0, dtype=np.int32)
+        doc_ids = np.concatenate(doc_ids) if doc_ids else np.zeros(0, dtype=np.int32)
+        tfs = np.concatenate(tfs) if tfs else np.zeros(0, dtype=np.uint16)
+        order = np.lexsort((doc_ids, term_ids))
+
+        arrays = {
+            'terms': terms,
+            'offsets': np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(terms)))]).astype(np.int64),
+            'postings_doc': doc_ids[order],
+            'postings_tf': tfs[order],
+            'doc_length': doc_length,
+            'doc_symbol': symbol_rank[doc_symbol] if doc_count else doc_symbol,
+            'doc_date': doc_date,
+            'symbols': symbol_names,
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+
+    @staticmethod
+    def _sorted_codes(codes: dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted keys of a ``{key: code}`` dict and the array mapping each old code to its sorted position."""
+        keys = np.array(list(codes), dtype=str)
+        order = np.argsort(keys, kind='stable')
+        rank = np.empty(len(keys), dtype=np.int32)
+        rank[order] = np.arange(len(keys), dtype=np.int32)
+        return keys[order], rank
+
+    def search(self, query: str, symbols: Optional[Iterable[str]] = None,
+               date_range: Optional[Tuple[Optional[str], Optional[str]]] = None, top_k: int = 10) -> pd.DataFrame:
+        """
+        Rank paragraphs against *query* with BM25.
+
+        Args:
+            query: Free text; every word is a term, so "pricing pressure" scores both words.
+            symbols: Only search these tickers.
+            date_range: ``(start, end)`` on the transcript report_date, inclusive; either end may be None.
+            top_k: Number of paragraphs to return.
+
+        Returns:
+            DataFrame with columns symbol, fiscal_year, fiscal_quarter, report_date,
+            paragraph_number, speaker, snippet and score, best match first.
+        """
+        if top_k <= 0:
+            raise ValueError(f"top_k must be positive, got {top_k}")
+        query_terms = np.unique(np.array(tokenize(query), dtype=str))
+        positions = np.searchsorted(self.terms, query_terms)
+        known = positions < len(self.terms)
+        known[known] = self.terms[positions[known]] == query_terms[known]
+        if not known.any():
+            return pd.DataFrame(columns=SEARCH_COLUMNS)
+
+        docs, scores = [], []
+        for position in positions[known]:
+            lo, hi = self.offsets[position], self.offsets[position + 1]
+            term_docs = np.asarray(self.postings_doc[lo:hi])
+            tf = np.asarray(self.postings_tf[lo:hi], dtype=np.float64)
+            idf = np.log1p((self.doc_count - len(term_docs) + 0.5) / (len(term_docs) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_length[term_docs] / self.avg_doc_length)
+            docs.append(term_docs)
+            scores.append(idf * tf * (BM25_K1 + 1) / (tf + norm))
+        docs = np.concatenate(docs)
+        scores = np.concatenate(scores)
+
+        keep = self._filter(docs, symbols, date_range)
+        if keep is not None:
+            docs, scores = docs[keep], scores[keep]
+        if not len(docs):
+            return pd.DataFrame(columns=SEARCH_COLUMNS)
+
+        candidates, inverse = np.unique(docs, return_inverse=True)
+        totals = np.bincount(inverse, weights=scores)
+        top = np.argpartition(-totals, top_k - 1)[:top_k] if len(totals) > top_k else np.arange(len(totals))
+        top = top[np.argsort(-totals[top], kind='stable')]
+
+        hits = self.duckdb_client.query(load_sql(
+            "select_transcript_paragraphs_by_doc_ids",
+            path=self.paragraphs_path,
+            doc_ids=", ".join(str(int(doc_id)) for doc_id in candidates[top]),
+        )).set_index('doc_id').loc[candidates[top]]
+        hits['snippet'] = [_snippet(content, query_terms[known]) for content in hits['content']]
+        hits['score'] = totals[top]
+        return hits.reset_index(drop=True)[SEARCH_COLUMNS]
+
+    def _filter(self, docs: np.ndarray, symbols: Optional[Iterable[str]],
+                date_range: Optional[Tuple[Optional[str], Optional[str]]]) -> Optional[np.ndarray]:
+        keep = None
+        if symbols is not None:
+            wanted = np.unique(np.array([s.upper() for s in symbols], dtype=str))
+            codes = np.searchsorted(self.symbols, wanted)
+            valid = codes < len(self.symbols)
+            valid[valid] = self.symbols[codes[valid]] == wanted[valid]
+            keep = np.isin(self.doc_symbol[docs], codes[valid])
+        if date_range is not None:
+            start, end = date_range
+            dates = self.doc_date[docs]
+            in_range = ~np.isnat(dates)
+            if start is not None:
+                in_range &= dates >= np.datetime64(pd.Timestamp(start).date(), 'D')
+            if end is not None:
+                in_range &= dates <= np.datetime64(pd.Timestamp(end).date(), 'D')
+            keep = in_range if keep is None else keep & in_range
+        return keep
+
+
+def _snippet(content: str, terms: Iterable[str]) -> str:
+    """About _SNIPPET_CHARS of *content* around the first query term."""
+    if not content:
+        return ''
+    match = re.search(r"\b(?:" + "|".join(re.escape(t) for t in terms) + r")\b", content, re.IGNORECASE)
+    start = max(0, (match.start() if match else 0) - _SNIPPET_CHARS // 3)
+    end = min(len(content), start + _SNIPPET_CHARS)
+    start = max(0, min(start, end - _SNIPPET_CHARS))
+    snippet = content[start:end].strip()
+    return ('…' if start > 0 else '') + snippet + ('…' if end < len(content) else '')
@@ -0,0 +1,126 @@
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from defeatbeta_api.client.hugging_face_client import get_cached_data_update_time
+from defeatbeta_api.utils.util import nltk_sentence_spans, update_time_cached, versioned_build
+
+SENTENCE_COLUMNS = ['paragraph_number', 'speaker', 'sentences']
+
+# Transcripts handed to a worker process at a time during backfills
+_BACKFILL_CHUNK_SIZE = 16
+
+
+def split_sentences(contents: Iterable[str]) -> np.ndarray:
+    """
+    Sentence offsets of a transcript, as an int32 array of (paragraph index, start, end) rows.
+
+    ``contents[i][start:end]`` is exactly the sentence ``nltk.sent_tokenize`` returns.
+    """
+    rows = [(index, start, end) for index, content in enumerate(contents)
+            for start, end in nltk_sentence_spans(content or "")]
+    return np.array(rows, dtype=np.int32).reshape(-1, 3)
+
+
+def transcript_sentences(key: Tuple[str, int, int], paragraphs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Paragraphs of one transcript with their sentences, splitting only on a cache miss.
+
+    Args:
+        key: (symbol, fiscal_year, fiscal_quarter) of the transcript.
+        paragraphs: paragraph_number, speaker, content, as returned by `get_transcript`.
+
+    Returns:
+        DataFrame with SENTENCE_COLUMNS; ``sentences`` holds a list of strings per paragraph.
+    """
+    contents = paragraphs['content'].tolist()
+    offsets = _load_offsets(key, len(contents))
+    if offsets is None:
+        offsets = split_sentences(contents)
+        _store_offsets(key, offsets)
+    sentences = [[] for _ in contents]
+    for index, start, end in offsets.tolist():
+        sentences[index].append(contents[index][start:end])
+    result = paragraphs[['paragraph_number', 'speaker']].reset_index(drop=True)
+    result['sentences'] = sentences
+    return result
+
+
+def backfill_sentences(transcripts: Iterable[Tuple[Tuple[str, int, int], pd.DataFrame]],
+                       processes: Optional[int] = None) -> int:
+    """
+    Split and cache every transcript in *transcripts* that is not cached yet.
+
+    Tokenisation runs in a process pool of *processes* workers, so a full-history
+    backfill is bound by CPU count rather than by one interpreter.
+
+    Args:
+        transcripts: ``(key, paragraphs)`` pairs, e.g. from `Transcripts.iter_transcripts`.
+        processes: Worker processes; defaults to the CPU count.
+
+    Returns:
+        Number of transcripts newly split.
+    """
+    split = 0
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for chunk in _chunks(_missing(transcripts), _BACKFILL_CHUNK_SIZE):
+            keys = [key for key, _ in chunk]
+            contents = [paragraphs['content'].tolist() for _, paragraphs in chunk]
+            for key, offsets in zip(keys, pool.map(split_sentences, contents)):
+                _store_offsets(key, offsets)
+                split += 1
+    return split
+
+
+def _missing(transcripts: Iterable[Tuple[Tuple[str, int, int], pd.DataFrame]]) \
+        -> Iterator[Tuple[Tuple[str, int, int], pd.DataFrame]]:
+    for key, paragraphs in transcripts:
+        if _load_offsets(key, len(paragraphs)) is None:
+            yield key, paragraphs
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _version_directory() -> str:
+    # Filled one transcript at a time, so the published version starts out empty
+    update_time = get_cached_data_update_time()
+    return update_time_cached('sentences', update_time,
+                              lambda: versioned_build('sentences', update_time, lambda directory: None))
+
+
+def _offsets_path(key: Tuple[str, int, int]) -> str:
+    symbol, fiscal_year, fiscal_quarter = key
+    return os.path.join(_version_directory(), str(symbol).upper(), f"{int(fiscal_year)}Q{int(fiscal_quarter)}.npy")
+
+
+def _load_offsets(key: Tuple[str, int, int], paragraph_count: int) -> Optional[np.ndarray]:
+    try:
+        offsets = np.load(_offsets_path(key))
+    except (FileNotFoundError, ValueError):
+        return None
+    # A transcript whose paragraphs changed shape is split again
+    if offsets.ndim != 2 or offsets.shape[1] != 3 or (len(offsets) and offsets[:, 0].max() >= paragraph_count):
+        return None
+    return offsets
+
+
+def _store_offsets(key: Tuple[str, int, int], offsets: np.ndarray) -> None:
+    path = _offsets_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, offsets)
+    os.replace(tmp_path, path)
@@ -4,13 +4,10 @@ import re
 import sys
 import time
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Iterable, Iterator, List
 
 import pandas as pd
 from openai import OpenAI
-from rich.console import Console
-from rich.live import Live
-from rich.panel import Panel
 from tabulate import tabulate
 try:
     from IPython.core.display import display, HTML
@@ -21,11 +18,33 @@ except ImportError:
 from defeatbeta_api.client.duckdb_client import DuckDBClient
 from defeatbeta_api.client.hugging_face_client import HuggingFaceClient
 from defeatbeta_api.client.openai_conf import OpenAIConfiguration
+from defeatbeta_api.data.body_cache import get_body_cache
 from defeatbeta_api.data.sql.sql_loader import load_sql
+from defeatbeta_api.data.transcript_ai import ANALYSES, AnalysisRequest, complete_tool_call, stream_tool_call, \
+    run_batch, run_chunks, chunk_paragraphs, estimate_tokens, serialize_transcript
+from defeatbeta_api.data.sentiment import transcript_sentiment
+from defeatbeta_api.data.similarity_index import similar_transcripts
+from defeatbeta_api.data.transcript_index import get_transcript_index
+from defeatbeta_api.data.transcript_sentences import transcript_sentences, backfill_sentences
 from defeatbeta_api.utils.const import stock_earning_call_transcripts
 from defeatbeta_api.utils.util import load_transcripts_summary_prompt_temp, load_transcripts_summary_tools_def, \
     unit_map, load_transcripts_analyze_change_prompt, load_transcripts_analyze_change_tools, \
-    load_transcripts_analyze_forecast_prompt, load_transcripts_analyze_forecast_tools, nltk_sentences, in_notebook
+    load_transcripts_analyze_forecast_prompt, load_transcripts_analyze_forecast_tools, in_notebook
+
+
+# Transcripts read per scan by stream_transcripts
+TRANSCRIPT_BATCH_SIZE = 100
+
+TRANSCRIPT_COLUMNS = ['symbol', 'fiscal_year', 'fiscal_quarter', 'report_date', 'paragraph_number', 'speaker',
+                      'content']
+
+TranscriptKey = Tuple[str, int, int]
+
+# Group columns of mention_counts, keyed by its `by` argument
+MENTION_GROUPS = {
+    'quarter': ['symbol', 'fiscal_year', 'fiscal_quarter', 'report_date'],
+    'speaker': ['symbol', 'fiscal_year', 'fiscal_quarter', 'speaker'],
+}
 
 
 @dataclass
@@ -40,8 +59,17 @@ class Transcripts:
       - `select_transcript_by_symbol_and_period` → single quarter, paragraphs
         already UNNESTed to (paragraph_number, speaker, content)
 
-    The metadata list is memoised on the instance; transcript bodies are not
-    cached here because DuckDB's httpfs cache already handles repeat reads.
+    `get_transcripts` / `iter_transcripts` read many quarters through
+    `select_transcripts_by_symbols_and_periods`, one scan per batch.
+
+    The metadata list is memoised on the instance. `get_transcript` results go
+    through the on-disk `body_cache`, so a quarter is decoded and UNNESTed once
+    per data update and later reads come from a small local zstd parquet file.
+    Sentence splits for the `*_with_ai` prompts are cached per data update by
+    `transcript_sentences`; `backfill_sentences` precomputes them in a process pool.
+    `search` answers from the local BM25 index in `transcript_index`, and
+    `similar_transcripts` from the TF-IDF vectors in `similarity_index`; both
+    are built once per data update from the whole table.
     """
 
     def __init__(
@@ -79,246 +107,187 @@ class Transcripts:
             fiscal_year=fiscal_year,
             fiscal_quarter=fiscal_quarter,
         )
-        df = self.duckdb_client.query(sql)
+        df = get_body_cache().fetch(self.duckdb_client, sql, "transcript", self.ticker, fiscal_year, fiscal_quarter)
         if df.empty:
             raise ValueError(f"No transcript found for FY{fiscal_year} Q{fiscal_quarter}")
         return df
 
-    def analyze_financial_metrics_forecast_for_future_with_ai(self, fiscal_year: int, fiscal_quarter: int, llm: OpenAI, config: Optional[OpenAIConfiguration] = None) -> pd.DataFrame:
-        conf = config if config is not None else OpenAIConfiguration()
-        template = load_transcripts_analyze_forecast_prompt()
-        pattern_transcripts = r"\{earnings_call_transcripts\}"
+    def get_transcripts(self, periods: Optional[Iterable[Tuple[int, int]]] = None) -> pd.DataFrame:
+        """
+        Paragraphs of several quarters in one scan.
+
+        Args:
+            periods: (fiscal_year, fiscal_quarter) pairs; None reads every transcript of the ticker.
+
+        Returns:
+            Long table: symbol, fiscal_year, fiscal_quarter, report_date, paragraph_number, speaker, content.
+        """
+        keys = None if periods is None else [(self.ticker, year, quarter) for year, quarter in periods]
+        return load_transcripts(self.duckdb_client, self.huggingface_client, symbols=[self.ticker], keys=keys)
+
+    def iter_transcripts(self, periods: Optional[Iterable[Tuple[int, int]]] = None,
+                         batch_size: int = TRANSCRIPT_BATCH_SIZE) -> Iterator[Tuple[TranscriptKey, pd.DataFrame]]:
+        """Yield ``((symbol, fiscal_year, fiscal_quarter), paragraphs)`` per transcript, reading *batch_size* per scan."""
+        if periods is None:
+            periods = self.get_transcripts_list()[['fiscal_year', 'fiscal_quarter']].itertuples(index=False)
+        keys = [(self.ticker, year, quarter) for year, quarter in periods]
+        return stream_transcripts(self.duckdb_client, self.huggingface_client, keys, batch_size)
+
+    def get_transcript_sentences(self, fiscal_year: int, fiscal_quarter: int) -> pd.DataFrame:
+        """Paragraphs of one quarter with their nltk sentences (paragraph_number, speaker, sentences)."""
         transcript = self.get_transcript(fiscal_year, fiscal_quarter)
-        transcript_json = transcript.to_dict(orient="records")
-        for paragraph in transcript_json:
-            content = paragraph.pop("content")
-            sentences = nltk_sentences(content)
-            paragraph["sentences"] = sentences
-        transcript_str = json.dumps(transcript_json, ensure_ascii=False, indent=2)
-        prompt = re.sub(pattern_transcripts, transcript_str, template)
-
-        messages = [{
-            "role": "system",
-            "content": "You are a precise financial analyst. Your task is to analyze every single sentence in the `sentences` array of the provided `earnings_call_transcripts`."
-            },
-            {
-                'role': 'user',
-                'content': prompt
-            }]
-        tools = load_transcripts_analyze_forecast_tools()
-
-        start = time.perf_counter()
-        response = llm.chat.completions.create(
-            model=conf.get_model(),
-            messages=messages,
-            temperature=conf.get_temperature(),
-            top_p=conf.get_top_p(),
-            stream=True,
-            tools=tools,
-            tool_choice=conf.get_tool_choice()
-        )
-
-        if not response:
-            raise ValueError(f"Invalid response from LLM: {response}")
-
-        raw_args = ""
-        prompt_tokens = 0
-        reasoning_tokens = 0
-        completion_tokens = 0
-        cursor_char = "▌"
-        panel_title = "[bold green]🧠 Thinking Step by Step[/]"
-        max_lines = 8
-        reasoning_text = ""
-        console = Console()
-        is_tty = sys.stdout.isatty()
-        with Live(console=console, refresh_per_second=20) as live:
-            for chunk in response:
-                delta = chunk.choices[0].delta
-
-                if hasattr(chunk, "usage") and chunk.usage and chunk.choices[0].finish_reason:
-                    prompt_tokens = getattr(chunk.usage, "prompt_tokens", 0)
-                    completion_tokens = getattr(chunk.usage, "completion_tokens", 0)
-                    details = getattr(chunk.usage, "completion_tokens_details", None)
-                    if details and hasattr(details, "reasoning_tokens"):
-                        reasoning_tokens = details.reasoning_tokens
-
-                if delta.reasoning_content:
-                    if is_tty:
-                        reasoning_text += delta.reasoning_content
-                        lines = reasoning_text.splitlines()
-                        visible_text = "\n".join(lines[-max_lines:])
-                        live.update(Panel(visible_text + " " + cursor_char, title=panel_title, border_style="green",
-                                          padding=(1, 2)))
-                    else:
-                        print(delta.reasoning_content, end="", flush=True)
-
-                if delta.tool_calls:
-                    raw_args += f"{delta.tool_calls[0].function.arguments}"
-            if is_tty:
-                live.update(Panel(reasoning_text, title="[bold white]🧠 Finish Think[/]", border_style="white",
-                                  padding=(1, 2)))
-
-        end = time.perf_counter()
-        elapsed = (end - start)
-
-        if raw_args == "":
-            raise ValueError(f"No tool call was made by the model. Raw message: {raw_args}")
-
-        try:
-            clean_args = raw_args.split("</tool_call>")[0].strip()
-            if isinstance(clean_args, str):
-                open_braces = clean_args.count('{')
-                close_braces = clean_args.count('}')
-                if open_braces > close_braces:
-                    clean_args += '}' * (open_braces - close_braces)
-                elif close_braces > open_braces:
-                    clean_args = clean_args.rstrip('}' * (close_braces - open_braces))
-                func_args = json.loads(clean_args)
-            else:
-                func_args = raw_args
-        except Exception as e:
-            raise ValueError(
-                f"Failed to parse tool_call arguments: {raw_args}, error: {e}"
-            )
-
-        final_metrics = func_args.get("key_sentences")
-
-        self.logger.debug(
-            f"metrics data: {func_args}, "
-            f"prompt tokens: {prompt_tokens}, "
-            f"reasoning tokens: {reasoning_tokens}, "
-            f"completion tokens: {completion_tokens}, "
-            f"infer elapsed(s): {round(elapsed, 2)}"
-        )
+        return transcript_sentences((self.ticker, fiscal_year, fiscal_quarter), transcript)
+
+    def backfill_sentences(self, periods: Optional[Iterable[Tuple[int, int]]] = None,
+                           processes: Optional[int] = None) -> int:
+        """Split and cache the sentences of *periods* (default: every quarter) ahead of time; returns how many were split."""
+        return backfill_sentences(self.iter_transcripts(periods), processes=processes)
+
+    def search(self, query: str, date_range: Optional[Tuple[Optional[str], Optional[str]]] = None,
+               top_k: int = 10) -> pd.DataFrame:
+        """BM25 full-text search over this ticker's transcript paragraphs."""
+        index = get_transcript_index(self.duckdb_client, self.huggingface_client)
+        return index.search(query, symbols=[self.ticker], date_range=date_range, top_k=top_k)
+
+    def similar_transcripts(self, fiscal_year: int, fiscal_quarter: int, k: int = 10) -> pd.DataFrame:
+        """Earnings calls of any ticker most similar to this one's, by TF-IDF cosine similarity."""
+        return similar_transcripts(self.duckdb_client, self.huggingface_client, self.ticker,
+                                   fiscal_year, fiscal_quarter, k)
+
+    def mention_counts(self, terms: Iterable[str], by: str = 'quarter', match: str = 'phrase',
+                       case_sensitive: bool = False) -> pd.DataFrame:
+        """Mentions of *terms* in this ticker's calls; see the module-level `mention_counts`."""
+        return mention_counts(self.duckdb_client, self.huggingface_client, terms, symbols=[self.ticker], by=by,
+                              match=match, case_sensitive=case_sensitive)
+
+    def get_sentiment(self, by: str = 'quarter') -> pd.DataFrame:
+        """Lexicon tone of this ticker's calls, per 'quarter' or 'paragraph'; see `transcript_sentiment`."""
+        return transcript_sentiment(self.duckdb_client, self.huggingface_client, symbols=[self.ticker], by=by)
 
-        df = pd.DataFrame(final_metrics)
-
-        records = []
-        for index, row in df.iterrows():
-            records.append({
-                "symbol": self.ticker,
-                "fiscal_year": fiscal_year,
-                "fiscal_quarter": fiscal_quarter,
-                "speaker": row['speaker'],
-                "paragraph_number": row['paragraph_number'],
-                "summary": row['short_summary'],
-                "outlook": row['sentence'],
-                "attitude": row['attitude'],
-                "reason": row['reason']
-            })
-        return pd.DataFrame(records)
+    def analyze_financial_metrics_forecast_for_future_with_ai(self, fiscal_year: int, fiscal_quarter: int, llm: OpenAI, config: Optional[OpenAIConfiguration] = None) -> pd.DataFrame:
+        return self._analyze_with_ai('forecast', fiscal_year, fiscal_quarter, llm, config)
 
     def analyze_financial_metrics_change_for_this_quarter_with_ai(self, fiscal_year: int, fiscal_quarter: int, llm: OpenAI, config: Optional[OpenAIConfiguration] = None) -> pd.DataFrame:
+        return self._analyze_with_ai('change', fiscal_year, fiscal_quarter, llm, config)
+
+    def summarize_key_financial_data_with_ai(self, fiscal_year: int, fiscal_quarter: int, llm: OpenAI, config: Optional[OpenAIConfiguration] = None) -> pd.DataFrame:
+        return self._analyze_with_ai('summary', fiscal_year, fiscal_quarter, llm, config)
+
+    def analyze_with_ai(self, analysis: str, llm: OpenAI, periods: Optional[Iterable[Tuple[int, int]]] = None,
+                        config: Optional[OpenAIConfiguration] = None, concurrency: int = 4, max_retries: int = 3,
+                        backoff: float = 1.0, cache: bool = True) -> pd.DataFrame:
+        """
+        Run one analysis over many quarters concurrently, without any live display.
+
+        Args:
+            analysis: 'summary', 'change' or 'forecast', matching the `*_with_ai` methods.
+            periods: (fiscal_year, fiscal_quarter) pairs; None analyzes every quarter.
+            concurrency: Requests in flight at once.
+            max_retries: Extra attempts for throttled, failed or malformed responses.
+            backoff: Base delay in seconds, doubled on every retry.
+            cache: Reuse tool-call results cached on disk by transcript, prompt, model and temperature.
+
+        Returns:
+            The records of every quarter that succeeded, in the layout of the single-quarter method.
+        """
+        if periods is None:
+            periods = self.get_transcripts_list()[['fiscal_year', 'fiscal_quarter']].itertuples(index=False)
+        jobs = [(self.ticker, int(year), int(quarter)) for year, quarter in periods]
+        return analyze_transcripts_with_ai({self.ticker: self}, jobs, analysis, llm, config=config,
+                                           concurrency=concurrency, max_retries=max_retries, backoff=backoff,
+                                           cache=cache)
+
+    def _analyze_with_ai(self, analysis: str, fiscal_year: int, fiscal_quarter: int, llm: OpenAI,
+                         config: Optional[OpenAIConfiguration]) -> pd.DataFrame:
         conf = config if config is not None else OpenAIConfiguration()
-        template = load_transcripts_analyze_change_prompt()
-        pattern_transcripts = r"\{earnings_call_transcripts\}"
-        transcript = self.get_transcript(fiscal_year, fiscal_quarter)
-        transcript_json = transcript.to_dict(orient="records")
-        for paragraph in transcript_json:
-            content = paragraph.pop("content")
-            sentences = nltk_sentences(content)
-            paragraph["sentences"] = sentences
-        transcript_str = json.dumps(transcript_json, ensure_ascii=False, indent=2)
-        prompt = re.sub(pattern_transcripts, transcript_str, template)
-
-        messages = [{
-                        "role": "system",
-                        "content": "You are a precise financial analyst. Your task is to analyze every single sentence in the `sentences` array of the provided `earnings_call_transcripts`."
-                    },
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }]
-        tools = load_transcripts_analyze_change_tools()
+        requests = self._analysis_requests(analysis, fiscal_year, fiscal_quarter, conf)
 
         start = time.perf_counter()
-        response = llm.chat.completions.create(
-            model=conf.get_model(),
-            messages=messages,
-            temperature=conf.get_temperature(),
-            top_p=conf.get_top_p(),
-            stream=True,
-            tools=tools,
-            tool_choice=conf.get_tool_choice()
-        )
-
-        if not response:
-            raise ValueError(f"Invalid response from LLM: {response}")
-
-        raw_args = ""
-        prompt_tokens = 0
-        reasoning_tokens = 0
-        completion_tokens = 0
-        cursor_char = "▌"
-        panel_title = "[bold green]🧠 Thinking Step by Step[/]"
-        max_lines = 8
-        reasoning_text = ""
-        console = Console()
-        is_tty = sys.stdout.isatty()
-        with Live(console=console, refresh_per_second=20) as live:
-            for chunk in response:
-                delta = chunk.choices[0].delta
-
-                if hasattr(chunk, "usage") and chunk.usage and chunk.choices[0].finish_reason:
-                    prompt_tokens = getattr(chunk.usage, "prompt_tokens", 0)
-                    completion_tokens = getattr(chunk.usage, "completion_tokens", 0)
-                    details = getattr(chunk.usage, "completion_tokens_details", None)
-                    if details and hasattr(details, "reasoning_tokens"):
-                        reasoning_tokens = details.reasoning_tokens
-
-                if delta.reasoning_content:
-                    if is_tty:
-                        reasoning_text += delta.reasoning_content
-                        lines = reasoning_text.splitlines()
-                        visible_text = "\n".join(lines[-max_lines:])
-                        live.update(Panel(visible_text + " " + cursor_char, title=panel_title, border_style="green",
-                                          padding=(1, 2)))
-                    else:
-                        print(delta.reasoning_content, end="", flush=True)
-                if delta.tool_calls:
-                    raw_args += f"{delta.tool_calls[0].function.arguments}"
-
-            if is_tty:
-                live.update(Panel(reasoning_text, title="[bold white]🧠 Finish Think[/]", border_style="white",
-                                  padding=(1, 2)))
-
-        end = time.perf_counter()
-        elapsed = (end - start)
-
-        if raw_args == "":
-            raise ValueError(f"No tool call was made by the model. Raw message: {raw_args}")
-
-        try:
-            clean_args = raw_args.split("</tool_call>")[0].strip()
-            if isinstance(clean_args, str):
-                open_braces = clean_args.count('{')
-                close_braces = clean_args.count('}')
-                if open_braces > close_braces:
-                    clean_args += '}' * (open_braces - close_braces)
-                elif close_braces > open_braces:
-                    clean_args = clean_args.rstrip('}' * (close_braces - open_braces))
-                func_args = json.loads(clean_args)
-            else:
-                func_args = raw_args
-        except Exception as e:
-            raise ValueError(
-                f"Failed to parse tool_call arguments: {raw_args}, error: {e}"
-            )
-
-        final_metrics = func_args.get("key_sentences")
+        if len(requests) > 1:
+            func_args, usage = run_chunks(llm, conf, requests)
+        elif analysis == 'summary':
+            func_args, usage = complete_tool_call(llm, conf, requests[0])
+        else:
+            func_args, usage = stream_tool_call(llm, conf, requests[0])
+        elapsed = time.perf_counter() - start
 
         self.logger.debug(
-            f"metrics data: {func_args}, "
-            f"prompt tokens: {prompt_tokens}, "
-            f"reasoning tokens: {reasoning_tokens}, "
-            f"completion tokens: {completion_tokens}, "
+            f"{analysis} data: {func_args}, "
+            f"prompt tokens: {usage.prompt_tokens}, "
+            f"reasoning tokens: {usage.reasoning_tokens}, "
+            f"completion tokens: {usage.completion_tokens}, "
             f"infer elapsed(s): {round(elapsed, 2)}"
         )
+        return self._analysis_records(analysis, fiscal_year, fiscal_quarter, func_args)
 
-        df = pd.DataFrame(final_metrics)
+    def _analysis_requests(self, analysis: str, fiscal_year: int, fiscal_quarter: int,
+                           conf: OpenAIConfiguration) -> List[AnalysisRequest]:
+        """
+        One request per transcript chunk.
 
+        Without `max_prompt_tokens` the whole transcript goes into a single request; otherwise
+        it is split into speaker-aligned chunks whose prompts stay under the budget.
+        """
+        pattern_transcripts = r"\{earnings_call_transcripts\}"
+        if analysis == 'summary':
+            template = load_transcripts_summary_prompt_temp()
+            tools = load_transcripts_summary_tools_def()
+            system = None
+            result_key = "key_financial_data"
+            template = re.sub(r"\{question\}",
+                              "Extract the key financial data required for function calling tools based on the earnings call transcript",
+                              template)
+            transcript_json = self.get_transcript(fiscal_year, fiscal_quarter).to_dict(orient="records")
+        elif analysis in ('change', 'forecast'):
+            if analysis == 'change':
+                template = load_transcripts_analyze_change_prompt()
+                tools = load_transcripts_analyze_change_tools()
+            else:
+                template = load_transcripts_analyze_forecast_prompt()
+                tools = load_transcripts_analyze_forecast_tools()
+            system = "You are a precise financial analyst. Your task is to analyze every single sentence in the `sentences` array of the provided `earnings_call_transcripts`."
+            result_key = "key_sentences"
+            transcript_json = self.get_transcript_sentences(fiscal_year, fiscal_quarter).to_dict(orient="records")
+        else:
+            raise ValueError(f"Unknown analysis '{analysis}', expected one of {ANALYSES}")
+
+        prompt_template = json.dumps([system, template, tools], ensure_ascii=False, sort_keys=True)
+        chunks = [transcript_json]
+        if conf.get_max_prompt_tokens():
+            budget = conf.get_max_prompt_tokens() - estimate_tokens(prompt_template)
+            chunks = chunk_paragraphs(transcript_json, budget, conf.get_compact_json())
+
+        requests = []
+        for chunk in chunks:
+            transcript_str = serialize_transcript(chunk, conf.get_compact_json())
+            messages = [{'role': 'user', 'content': re.sub(pattern_transcripts, lambda _: transcript_str, template)}]
+            if system is not None:
+                messages.insert(0, {"role": "system", "content": system})
+            requests.append(AnalysisRequest(transcript_str, prompt_template, messages, tools, result_key))
+        return requests
+
+    def _analysis_records(self, analysis: str, fiscal_year: int, fiscal_quarter: int,
+                          func_args: Dict[str, Any]) -> pd.DataFrame:
+        if analysis == 'summary':
+            return self._key_financial_data_records(fiscal_year, fiscal_quarter, func_args)
+
+        df = pd.DataFrame(func_args.get("key_sentences"))
         records = []
         for index, row in df.iterrows():
+            if analysis == 'forecast':
+                records.append({
+                    "symbol": self.ticker,
+                    "fiscal_year": fiscal_year,
+                    "fiscal_quarter": fiscal_quarter,
+                    "speaker": row['speaker'],
+                    "paragraph_number": row['paragraph_number'],
+                    "summary": row['short_summary'],
+                    "outlook": row['sentence'],
+                    "attitude": row['attitude'],
+                    "reason": row['reason']
+                })
+                continue
+
             if row['is_factual'] == 'N':
                 continue
 
@@ -335,130 +304,60 @@ class Transcripts:
             })
         return pd.DataFrame(records)
 
-    def summarize_key_financial_data_with_ai(self, fiscal_year: int, fiscal_quarter: int, llm: OpenAI, config: Optional[OpenAIConfiguration] = None) -> pd.DataFrame:
-        conf = config if config is not None else OpenAIConfiguration()
-        template = load_transcripts_summary_prompt_temp()
-
-        pattern_question = r"\{question\}"
-        pattern_transcripts = r"\{earnings_call_transcripts\}"
-        transcript = self.get_transcript(fiscal_year, fiscal_quarter)
-        transcript_json = transcript.to_dict(orient="records")
-        transcript_str = json.dumps(transcript_json, ensure_ascii=False, indent=2)
-
-        prompt = re.sub(pattern_question,
-                        "Extract the key financial data required for function calling tools based on the earnings call transcript",
-                        template)
-        prompt = re.sub(pattern_transcripts, transcript_str, prompt)
-
-        tools = load_transcripts_summary_tools_def()
-
-        messages = [{
-            'role': 'user',
-            'content': prompt
-        }]
-
-        start = time.perf_counter()
-        response = llm.chat.completions.create(
-            model = conf.get_model(),
-            messages = messages,
-            temperature = conf.get_temperature(),
-            top_p = conf.get_top_p(),
-            stream = False,
-            tools = tools,
-            tool_choice=conf.get_tool_choice()
-        )
-        end = time.perf_counter()
-        elapsed = (end - start)
-
-        if not response or not response.choices:
-            raise ValueError(f"Invalid response from LLM: {response}")
-
-        message = response.choices[0].message
-
-        if not hasattr(message, "tool_calls") or not message.tool_calls:
-            raise ValueError(f"No tool call was made by the model. Raw message: {message}")
-
-        for tool_call in message.tool_calls:
-            try:
-                raw_args = tool_call.function.arguments.strip()
-                clean_args = raw_args.split("</tool_call>")[0].strip()
-                if isinstance(clean_args, str):
-                    open_braces = clean_args.count('{')
-                    close_braces = clean_args.count('}')
-                    if open_braces > close_braces:
-                        clean_args += '}' * (open_braces - close_braces)
-                    elif close_braces > open_braces:
-                        clean_args = clean_args.rstrip('}' * (close_braces - open_braces))
-                    func_args = json.loads(clean_args)
-                else:
-                    func_args = raw_args
-            except Exception as e:
-                raise ValueError(
-                    f"Failed to parse tool_call arguments: {tool_call.function.arguments}, error: {e}"
-                )
-
-            key_financial_data = func_args.get("key_financial_data")
-            if not key_financial_data:
-                raise ValueError(
-                    f"'key_financial_data' missing in func_args: {func_args}"
-                )
-
-            prompt_tokens = response.usage.prompt_tokens
-            completion_tokens = response.usage.completion_tokens
-            self.logger.debug(
-                f"Key financial data: {key_financial_data}, "
-                f"prompt tokens: {prompt_tokens}, "
-                f"completion tokens: {completion_tokens}, "
-                f"infer elapsed(s): {round(elapsed, 2)}"
+    def _key_financial_data_records(self, fiscal_year: int, fiscal_quarter: int,
+                                    func_args: Dict[str, Any]) -> pd.DataFrame:
+        key_financial_data = func_args.get("key_financial_data")
+        if not key_financial_data:
+            raise ValueError(
+                f"'key_financial_data' missing in func_args: {func_args}"
             )
 
-            records = []
-            for k, v in key_financial_data.items():
-                if v is None:
-                    value = None
-                    currency_code = None
-                    speaker = None
-                    paragraph_number = None
-                else:
-                    try:
-                        if v.get("unit") == '%':
-                            value = round(float(v["value_vocabulary"]) / 100, 4)
-                        elif v.get("unit") == 'per_share':
-                            value = round(float(v["value_vocabulary"]), 4)
-                        else:
-                            value = float(v["value_vocabulary"]) * unit_map.get(v.get("unit"), 1)
-                        currency_code = v.get("currency_code")
-                        speaker = v.get("speaker")
-                        paragraph_number = str(v.get("paragraph_number"))
-                    except Exception as e:
-                        raise ValueError(f"Bad value in {k}: {v}, error: {e}")
-
-                metric = k
-                time_scope = "raw"
-                if k.endswith("_for_this_quarter"):
-                    metric = k[: -len("_for_this_quarter")]
-                    time_scope = "this_quarter"
-                elif k.endswith("_for_next_quarter"):
-                    metric = k[: -len("_for_next_quarter")]
-                    time_scope = "next_quarter"
-                elif k.endswith("_for_full_fiscal_year"):
-                    metric = k[: -len("_for_full_fiscal_year")]
-                    time_scope = "full_fiscal_year"
+        records = []
+        for k, v in key_financial_data.items():
+            if v is None:
+                value = None
+                currency_code = None
+                speaker = None
+                paragraph_number = None
+            else:
+                try:
+                    if v.get("unit") == '%':
+                        value = round(float(v["value_vocabulary"]) / 100, 4)
+                    elif v.get("unit") == 'per_share':
+                        value = round(float(v["value_vocabulary"]), 4)
+                    else:
+                        value = float(v["value_vocabulary"]) * unit_map.get(v.get("unit"), 1)
+                    currency_code = v.get("currency_code")
+                    speaker = v.get("speaker")
+                    paragraph_number = str(v.get("paragraph_number"))
+                except Exception as e:
+                    raise ValueError(f"Bad value in {k}: {v}, error: {e}")
+
+            metric = k
+            time_scope = "raw"
+            if k.endswith("_for_this_quarter"):
+                metric = k[: -len("_for_this_quarter")]
+                time_scope = "this_quarter"
+            elif k.endswith("_for_next_quarter"):
+                metric = k[: -len("_for_next_quarter")]
+                time_scope = "next_quarter"
+            elif k.endswith("_for_full_fiscal_year"):
+                metric = k[: -len("_for_full_fiscal_year")]
+                time_scope = "full_fiscal_year"
 
-                records.append({
-                    "symbol": self.ticker,
-                    "fiscal_year": fiscal_year,
-                    "fiscal_quarter": fiscal_quarter,
-                    "speaker": speaker,
-                    "paragraph_number": paragraph_number,
-                    "key_financial_metric": metric,
-                    "time_scope": time_scope,
-                    "value": value,
-                    "currency_code": currency_code
-                })
+            records.append({
+                "symbol": self.ticker,
+                "fiscal_year": fiscal_year,
+                "fiscal_quarter": fiscal_quarter,
+                "speaker": speaker,
+                "paragraph_number": paragraph_number,
+                "key_financial_metric": metric,
+                "time_scope": time_scope,
+                "value": value,
+                "currency_code": currency_code
+            })
 
-            df = pd.DataFrame(records)
-            return df
+        return pd.DataFrame(records)
 
     def print_pretty_table(self, fiscal_year: int, fiscal_quarter: int) -> str:
         list_df = self.get_transcripts_list()
@@ -483,4 +382,121 @@ class Transcripts:
         )
 
     def __repr__(self):
-        return repr(self.get_transcripts_list())
\ No newline at end of file
+        return repr(self.get_transcripts_list())
+
+
+def list_transcripts(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+                     symbols: Iterable[str]) -> pd.DataFrame:
+    """Metadata (symbol, fiscal_year, fiscal_quarter, report_date) of every transcript of *symbols*."""
+    symbols = list(symbols)
+    if not symbols:
+        return pd.DataFrame(columns=['symbol', 'fiscal_year', 'fiscal_quarter', 'report_date'])
+    url = huggingface_client.get_url_path(stock_earning_call_transcripts)
+    sql = load_sql("select_transcripts_list_by_symbols", url=url,
+                   symbols=", ".join(f"'{s}'" for s in symbols))
+    return duckdb_client.query(sql)
+
+
+def load_transcripts(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+                     symbols: Optional[Iterable[str]] = None,
+                     keys: Optional[Iterable[TranscriptKey]] = None) -> pd.DataFrame:
+    """
+    Paragraphs of any set of transcripts in a single scan.
+
+    Args:
+        symbols: Tickers whose every transcript is read, when *keys* is None.
+        keys: (symbol, fiscal_year, fiscal_quarter) triples to read instead.
+
+    Returns:
+        Long table with TRANSCRIPT_COLUMNS, ordered by symbol, period and paragraph_number.
+    """
+    period_filter = ""
+    if keys is not None:
+        keys = sorted({(str(symbol).upper(), int(year), int(quarter)) for symbol, year, quarter in keys})
+        symbols = sorted({key[0] for key in keys})
+        years = sorted({key[1] for key in keys})
+        rows = ", ".join(f"('{symbol}', {year}, {quarter})" for symbol, year, quarter in keys)
+        period_filter = (f"AND fiscal_year IN ({', '.join(map(str, years))})\n"
+                         f"  AND (symbol, fiscal_year, fiscal_quarter) IN ({rows})")
+    symbols = list(symbols or [])
+    if not symbols:
+        return pd.DataFrame(columns=TRANSCRIPT_COLUMNS)
+
+    url = huggingface_client.get_url_path(stock_earning_call_transcripts)
+    sql = load_sql("select_transcripts_by_symbols_and_periods", url=url,
+                   symbols=", ".join(f"'{s}'" for s in symbols), period_filter=period_filter)
+    return duckdb_client.query(sql)
+
+
+def stream_transcripts(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient,
+                       keys: Iterable[TranscriptKey],
+                       batch_size: int = TRANSCRIPT_BATCH_SIZE) -> Iterator[Tuple[TranscriptKey, pd.DataFrame]]:
+    """Yield ``(key, paragraphs)`` per transcript, reading *batch_size* transcripts per scan."""
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    keys: List[TranscriptKey] = sorted({(str(symbol).upper(), int(year), int(quarter)) for symbol, year, quarter in keys})
+    for start in range(0, len(keys), batch_size):
+        frame = load_transcripts(duckdb_client, huggingface_client, keys=keys[start:start + batch_size])
+        for (symbol, year, quarter), paragraphs in frame.groupby(['symbol', 'fiscal_year', 'fiscal_quarter'], sort=True):
+            yield (symbol, int(year), int(quarter)), paragraphs[['paragraph_number', 'speaker', 'content']].reset_index(drop=True)
+
+
+def analyze_transcripts_with_ai(transcripts: Dict[str, "Transcripts"], jobs: Iterable[TranscriptKey], analysis: str,
+                                llm: OpenAI, config: Optional[OpenAIConfiguration] = None, concurrency: int = 4,
+                                max_retries: int = 3, backoff: float = 1.0, cache: bool = True) -> pd.DataFrame:
+    """Run *analysis* over (symbol, fiscal_year, fiscal_quarter) *jobs*; see `Transcripts.analyze_with_ai`."""
+    if analysis not in ANALYSES:
+        raise ValueError(f"Unknown analysis '{analysis}', expected one of {ANALYSES}")
+    conf = config if config is not None else OpenAIConfiguration()
+    return run_batch(
+        jobs,
+        lambda job: transcripts[job[0]]._analysis_requests(analysis, job[1], job[2], conf),
+        lambda job, func_args: transcripts[job[0]]._analysis_records(analysis, job[1], job[2], func_args),
+        llm, conf, concurrency=concurrency, max_retries=max_retries, backoff=backoff, cache=cache)
+
+
+def mention_counts(duckdb_client: DuckDBClient, huggingface_client: HuggingFaceClient, terms: Iterable[str],
+                   symbols: Optional[Iterable[str]] = None, by: str = 'quarter', match: str = 'phrase',
+                   case_sensitive: bool = False) -> pd.DataFrame:
+    """
+    Count mentions of *terms* in transcript paragraphs with one DuckDB pass.
+
+    Args:
+        terms: Words or phrases (``match='phrase'``) or RE2 patterns (``match='regex'``).
+            A phrase matches whole words only, with any whitespace between its words.
+        symbols: Tickers to scan; None scans the whole universe, an empty list nothing.
+        by: 'quarter' counts per transcript, 'speaker' per speaker within a transcript.
+        case_sensitive: Match case exactly instead of ignoring it.
+
+    Returns:
+        One row per group and term: the group columns (symbol, fiscal_year, fiscal_quarter,
+        then report_date or speaker), term, mentions and paragraphs (paragraphs with at
+        least one mention). Groups without mentions are kept with zero counts.
+    """
+    if by not in MENTION_GROUPS:
+        raise ValueError(f"by must be one of {tuple(MENTION_GROUPS)}, got '{by}'")
+    if match not in ('phrase', 'regex'):
+        raise ValueError(f"match must be 'phrase' or 'regex', got '{match}'")
+    terms = list(dict.fromkeys(terms))
+    if not terms:
+        raise ValueError("terms must not be empty")
+
+    def pattern(term: str) -> str:
+        if match == 'phrase':
+            term = r"\b" + r"\s+".join(re.escape(word) for word in term.split()) + r"\b"
+        return term if case_sensitive else "(?i)" + term
+
+    def literal(value: str) -> str:
+        return "'" + value.replace("'", "''") + "'"
+
+    symbol_filter = ""
+    if symbols is not None:
+        symbols = list(symbols)
+        if not symbols:
+            return pd.DataFrame(columns=MENTION_GROUPS[by] + ['term', 'mentions', 'paragraphs'])
+        symbol_filter = "WHERE symbol IN (" + ", ".join(literal(s.upper()) for s in symbols) + ")"
+    url = huggingface_client.get_url_path(stock_earning_call_transcripts)
+    sql = load_sql("select_transcript_mention_counts", url=url, symbol_filter=symbol_filter,
+                   terms=", ".join(f"({literal(term)}, {literal(pattern(term))})" for term in terms),
+                   group_columns=", ".join(MENTION_GROUPS[by]))
+    return duckdb_client.query(sql)
@@ -1,13 +1,45 @@
 import logging
-from typing import Optional
+import re
+from threading import Lock
+from typing import Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from defeatbeta_api import HuggingFaceClient
 from defeatbeta_api.client.duckdb_client import get_duckdb_client
 from defeatbeta_api.client.duckdb_conf import Configuration
+from defeatbeta_api.client.hugging_face_client import get_cached_data_update_time
 from defeatbeta_api.utils.const import daily_treasury_yield
 
+# Matches yield curve columns such as bc_1month / bc_10year and maps them to a tenor in years
+_TENOR_COLUMN = re.compile(r"^bc_?(\d+)_?(month|year)$")
+_TENOR_TEXT = re.compile(r"^(\d+(?:\.\d+)?)\s*(m|mo|month|months|y|yr|year|years)$")
+
+# Process-wide yield curve, rebuilt only when the dataset update_time changes
+_curve = None
+_curve_update_time: Optional[str] = None
+_curve_lock = Lock()
+
+
+class _YieldCurve:
+    def __init__(self, table: pd.DataFrame):
+        table = table.copy()
+        table['report_date'] = pd.to_datetime(table['report_date']).astype('datetime64[us]')
+        self.table = table.sort_values('report_date').reset_index(drop=True)
+        self.dates = self.table['report_date'].to_numpy(dtype='datetime64[us]')
+
+        tenor_columns = []
+        for column in self.table.columns:
+            match = _TENOR_COLUMN.match(column)
+            if match:
+                value = int(match.group(1))
+                tenor_columns.append((value / 12 if match.group(2) == 'month' else float(value), column))
+        tenor_columns.sort()
+        self.tenors = np.array([tenor for tenor, _ in tenor_columns], dtype=float)
+        self.columns = [column for _, column in tenor_columns]
+        self.yields = self.table[self.columns].to_numpy(dtype=float)
+
 
 class Treasure:
     def __init__(self, http_proxy: Optional[str] = None, log_level: Optional[str] = logging.INFO, config: Optional[Configuration] = None):
@@ -16,7 +48,88 @@ class Treasure:
         self.huggingface_client = HuggingFaceClient()
         self.log_level = log_level
 
+    def _yield_curve(self) -> _YieldCurve:
+        global _curve, _curve_update_time
+        update_time = get_cached_data_update_time()
+        if _curve is not None and _curve_update_time == update_time:
+            return _curve
+        with _curve_lock:
+            if _curve is None or _curve_update_time != update_time:
+                url = self.huggingface_client.get_url_path(daily_treasury_yield)
+                sql = f"SELECT * FROM '{url}'"
+                _curve = _YieldCurve(self.duckdb_client.query(sql))
+                _curve_update_time = update_time
+            return _curve
+
     def daily_treasure_yield(self) -> pd.DataFrame:
-        url = self.huggingface_client.get_url_path(daily_treasury_yield)
-        sql = f"SELECT * FROM '{url}'"
-        return self.duckdb_client.query(sql)
\ No newline at end of file
+        return self._yield_curve().table.copy()
+
+    def yield_at(self, dates, tenor: Union[float, str]) -> Union[float, np.ndarray]:
+        """
+        Treasury yield for a tenor on each of the given dates.
+
+        Each date uses the most recent curve published on or before it. The yield is
+        linearly interpolated between the nearest quoted maturities on that curve,
+        skipping maturities that were not quoted that day, and held flat beyond the
+        shortest and longest ones.
+
+        Args:
+            dates: A date or an array-like of dates.
+            tenor: Maturity in years (e.g. ``10``, ``0.25``), a string such as ``'3m'`` or
+                   ``'10y'``, or a curve column name such as ``'bc_10year'``.
+
+        Returns:
+            A float for a single date, otherwise a NumPy array aligned with *dates*.
+            Dates before the first published curve yield NaN.
+        """
+        curve = self._yield_curve()
+        years = self._tenor_years(tenor)
+        scalar = np.ndim(dates) == 0
+        query = pd.to_datetime(np.atleast_1d(dates)).to_numpy(dtype='datetime64[us]')
+
+        result = np.full(len(query), np.nan)
+        rows = np.searchsorted(curve.dates, query, side='right') - 1
+        known = rows >= 0
+        if known.any() and len(curve.tenors) > 0:
+            yields = curve.yields[rows[known]]
+            valid = ~np.isnan(yields)
+            tenors = np.broadcast_to(curve.tenors, yields.shape)
+            width = len(curve.tenors)
+
+            below = valid & (tenors <= years)
+            above = valid & (tenors >= years)
+            has_below = below.any(axis=1)
+            has_above = above.any(axis=1)
+            lower = width - 1 - np.argmax(below[:, ::-1], axis=1)
+            upper = np.argmax(above, axis=1)
+
+            # Hold the curve flat past its ends
+            lower = np.where(has_below, lower, upper)
+            upper = np.where(has_above, upper, lower)
+
+            picked = np.arange(len(yields))
+            t0, t1 = curve.tenors[lower], curve.tenors[upper]
+            y0, y1 = yields[picked, lower], yields[picked, upper]
+            span = np.where(t1 > t0, t1 - t0, 1.0)
+            weight = np.where(t1 > t0, (years - t0) / span, 0.0)
+            interpolated = y0 + weight * (y1 - y0)
+            result[known] = np.where(has_below | has_above, interpolated, np.nan)
+
+        return float(result[0]) if scalar else result
+
+    @staticmethod
+    def _tenor_years(tenor: Union[float, str]) -> float:
+        if isinstance(tenor, (int, float, np.integer, np.floating)):
+            if tenor <= 0:
+                raise ValueError(f"tenor must be positive, got {tenor}")
+            return float(tenor)
+        text = str(tenor).strip().lower()
+        match = _TENOR_COLUMN.match(text)
+        if match:
+            value = int(match.group(1))
+            return value / 12 if match.group(2) == 'month' else float(value)
+        match = _TENOR_TEXT.match(text)
+        if match:
+            value = float(match.group(1))
+            return value / 12 if match.group(2).startswith('m') else value
+        raise ValueError(f"Invalid tenor '{tenor}'. Use years (e.g. 10), '3m', '10y' or a column such as 'bc_10year'.")
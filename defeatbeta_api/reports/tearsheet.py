@@ -1,42 +1,61 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Union
+
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure as MatplotlibFigure
 from matplotlib.ticker import LinearLocator, FormatStrFormatter, Formatter, PercentFormatter
 
-from defeatbeta_api import __version__, HuggingFaceClient
+from defeatbeta_api import __version__
+from defeatbeta_api.client.duckdb_conf import Configuration
+from defeatbeta_api.client.hugging_face_client import get_cached_data_update_time
 from defeatbeta_api.data.ticker import Ticker
 from defeatbeta_api.utils import util
-from defeatbeta_api.utils.util import html_table, human_format
+from defeatbeta_api.utils.util import html_table, human_format, validate_figure_cache_directory
 from pathlib import Path
 
-def html(ticker: Ticker, output=None):
-    if output is None and not util.in_notebook():
-        raise ValueError("`output` must be specified")
-
-    template_path = Path(__file__).parent / 'tearsheet.html'
-    template_path = template_path.resolve()
-    if not template_path.exists():
-        raise FileNotFoundError(f"Template file not found: {template_path}")
-    if not template_path.is_file():
-        raise ValueError(f"Template path is not a file: {template_path}")
-    tpl = template_path.read_text(encoding='utf-8')
-
-    tpl = fill_headline(ticker, tpl)
+logger = logging.getLogger(__name__)
 
-    tpl = fill_pe(ticker, tpl)
+# Ticker queries behind every tearsheet section, fetched concurrently before anything is rendered
+TEARSHEET_INPUTS = (
+    'info',
+    'ttm_pe',
+    'industry_ttm_pe',
+    'quarterly_gross_margin',
+    'industry_quarterly_gross_margin',
+    'quarterly_ebitda_margin',
+    'industry_quarterly_ebitda_margin',
+    'quarterly_net_margin',
+    'industry_quarterly_net_margin',
+    'quarterly_revenue_yoy_growth',
+    'quarterly_ebitda_yoy_growth',
+    'quarterly_net_income_yoy_growth',
+    'quarterly_eps_yoy_growth',
+)
 
-    tpl = fill_quarterly_gross_margin_profitability(ticker, tpl)
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
 
-    tpl = fill_quarterly_ebitda_margin_profitability(ticker, tpl)
+# One Agg-backed figure per rendering thread, cleared and reused for every chart
+_local = threading.local()
 
-    tpl = fill_quarterly_net_margin_profitability(ticker, tpl)
 
-    tpl = fill_quarterly_revenue_growth(ticker, tpl)
+class Figure(NamedTuple):
+    """A chart to render: a plot_* function and its keyword arguments (picklable for process pools)."""
+    plot: Callable
+    kwargs: dict
 
-    tpl = fill_quarterly_ebitda_growth(ticker, tpl)
 
-    tpl = fill_quarterly_net_income_growth(ticker, tpl)
+def html(ticker: Ticker, output=None, executor: Optional[Executor] = None, cache: bool = True):
+    if output is None and not util.in_notebook():
+        raise ValueError("`output` must be specified")
 
-    tpl = fill_quarterly_eps_growth(ticker, tpl)
+    tpl = render(ticker, executor=executor, cache=cache)
 
     if util.in_notebook():
         if output is None:
@@ -46,66 +65,196 @@ def html(ticker: Ticker, output=None):
         with open(output, "w", encoding="utf-8") as f:
             f.write(tpl)
 
-def fill_quarterly_eps_growth(ticker: Ticker, tpl):
-    stock_eps_growth = ticker.quarterly_eps_yoy_growth()
-    stock_eps_growth = stock_eps_growth.dropna(subset=['yoy_growth']).tail(8)
-    y_min = stock_eps_growth['yoy_growth'].min()
-    y_max = stock_eps_growth['yoy_growth'].max()
-    ranges = []
-    if y_min < 0:
-        ranges.append((y_min, 0.0, "#F7C6C7", "Cornered"))
-    if 0 < y_max < 0.1:
-        ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
-    if 0.1 < y_max < 0.2:
-        ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
-        ranges.append((0.10, 0.20, "#D5F5D0", "Stalwarts"))
-    if 0.2 < y_max:
-        ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
-        ranges.append((0.10, 0.20, "#D5F5D0", "Stalwarts"))
-        ranges.append((0.20, y_max, "#D6EAF8", "Fast Growers"))
-
-    figure = plot_single_series_figure(
-        title='Quarterly Diluted EPS YoY Growth',
-        series_x=stock_eps_growth['report_date'],
-        series_y=stock_eps_growth['yoy_growth'],
-        series_label='Quarterly EPS YoY Growth',
-        fig_size=(8, 4),
-        y_axis_ticks=10,
-        formater=PercentFormatter(xmax=1.0, decimals=1),
-        figure_type='bar',
-        horizontal_lines=[0],
-        range_lines=ranges
-    )
-    tpl = tpl.replace("{{quarterly_eps_yoy_growth}}", util.embed_figure(figure, "svg"))
-    tpl = tpl.replace("{{quarterly_eps_yoy_growth_title}}", "<h3>Quarterly Diluted EPS YoY Growth</h3>")
-    quarterly_eps_yoy_growth_table = stock_eps_growth[['report_date', 'eps', 'prev_year_eps', 'yoy_growth']].copy()
-    quarterly_eps_yoy_growth_table['report_date'] = quarterly_eps_yoy_growth_table['report_date'].dt.date
-    quarterly_eps_yoy_growth_table['yoy_growth'] = quarterly_eps_yoy_growth_table['yoy_growth'].apply(
-        lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
-    )
-    quarterly_eps_yoy_growth_table["eps"] = \
-        quarterly_eps_yoy_growth_table["eps"].apply(human_format)
-    quarterly_eps_yoy_growth_table["prev_year_eps"] = \
-        quarterly_eps_yoy_growth_table["prev_year_eps"].apply(human_format)
-
-    quarterly_eps_yoy_growth_table.rename(
-        columns={
-            'report_date': 'Report Date',
-            'eps': 'Current',
-            'prev_year_eps': 'Prev. (YoY Base)',
-            'yoy_growth': 'YoY %'
-        },
-        inplace=True
-    )
-
-    tpl = tpl.replace("{{quarterly_eps_yoy_growth_table}}", html_table(quarterly_eps_yoy_growth_table, showindex=False))
-    return tpl
 
-def fill_quarterly_revenue_growth(ticker: Ticker, tpl):
-    stock_revenue_growth = ticker.quarterly_revenue_yoy_growth()
-    stock_revenue_growth = stock_revenue_growth.dropna(subset=['yoy_growth']).tail(8)
-    y_min = stock_revenue_growth['yoy_growth'].min()
-    y_max = stock_revenue_growth['yoy_growth'].max()
+def batch(tickers: Iterable[Union[str, Ticker]], out_dir: str, http_proxy: Optional[str] = None,
+          log_level: Optional[str] = logging.INFO, config: Optional[Configuration] = None,
+          max_workers: Optional[int] = None, processes: Optional[int] = None, cache: bool = True) -> Dict[str, str]:
+    """
+    Write one ``{SYMBOL}.html`` tearsheet per ticker into *out_dir*.
+
+    Up to *max_workers* tickers fetch their inputs at the same time, while every chart
+    not found in the figure cache is rendered in one shared pool of *processes*
+    worker processes. A ticker whose
+    report fails is logged and skipped so one bad symbol does not stop the run.
+
+    Returns:
+        ``{symbol: output path}`` for every report written, in input order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    ticker_objs = [t if isinstance(t, Ticker) else Ticker(t, http_proxy=http_proxy, log_level=log_level, config=config)
+                   for t in tickers]
+
+    written = {}
+    with ProcessPoolExecutor(max_workers=processes) as figure_pool:
+        # Start the render workers before any query threads exist
+        figure_pool.submit(int).result()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_symbol = {
+                executor.submit(_write_report, ticker, out_dir, figure_pool, cache): ticker.ticker
+                for ticker in ticker_objs
+            }
+            for future in as_completed(future_to_symbol):
+                symbol = future_to_symbol[future]
+                try:
+                    written[symbol] = future.result()
+                except Exception as e:
+                    logger.warning(f"Tearsheet for {symbol} failed: {e}")
+    return {t.ticker: written[t.ticker] for t in ticker_objs if t.ticker in written}
+
+
+def _write_report(ticker: Ticker, out_dir: str, executor: Executor, cache: bool) -> str:
+    output = os.path.join(out_dir, f"{ticker.ticker}.html")
+    tpl = render(ticker, executor=executor, cache=cache)
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(tpl)
+    return output
+
+
+def render(ticker: Ticker, executor: Optional[Executor] = None, cache: bool = True) -> str:
+    """
+    Return the tearsheet HTML.
+
+    Charts are rendered through *executor* when one is given. With *cache*, a chart whose
+    inputs hash the same as last time is read back from the figure cache instead.
+    """
+    inputs = fetch_inputs(ticker)
+    values = {
+        **headline_section(inputs['info'], get_cached_data_update_time()),
+        **pe_section(inputs['ttm_pe'], inputs['industry_ttm_pe']),
+        **margin_section(ticker.ticker, inputs['quarterly_gross_margin'],
+                         inputs['industry_quarterly_gross_margin'], 'gross_margin', 'Gross'),
+        **margin_section(ticker.ticker, inputs['quarterly_ebitda_margin'],
+                         inputs['industry_quarterly_ebitda_margin'], 'ebitda_margin', 'EBITDA'),
+        **margin_section(ticker.ticker, inputs['quarterly_net_margin'],
+                         inputs['industry_quarterly_net_margin'], 'net_margin', 'Net'),
+        **growth_section(inputs['quarterly_revenue_yoy_growth'], 'revenue', 'Quarterly Revenue YoY Growth'),
+        **growth_section(inputs['quarterly_ebitda_yoy_growth'], 'ebitda', 'Quarterly EBITDA YoY Growth'),
+        **growth_section(inputs['quarterly_net_income_yoy_growth'], 'net_income_common_stockholders',
+                         'Quarterly Net Income YoY Growth', key='quarterly_net_income_yoy_growth'),
+        **growth_section(inputs['quarterly_eps_yoy_growth'], 'eps', 'Quarterly Diluted EPS YoY Growth',
+                         series_label='Quarterly EPS YoY Growth'),
+    }
+    values.update(render_figures(values, executor, symbol=ticker.ticker if cache else None))
+    return fill_template(load_template(), values)
+
+
+def fetch_inputs(ticker: Ticker) -> Dict[str, pd.DataFrame]:
+    """Run every query in TEARSHEET_INPUTS concurrently."""
+    with ThreadPoolExecutor(max_workers=len(TEARSHEET_INPUTS)) as executor:
+        futures = {name: executor.submit(getattr(ticker, name)) for name in TEARSHEET_INPUTS}
+        return {name: future.result() for name, future in futures.items()}
+
+
+@lru_cache(maxsize=1)
+def load_template() -> str:
+    template_path = Path(__file__).parent / 'tearsheet.html'
+    template_path = template_path.resolve()
+    if not template_path.exists():
+        raise FileNotFoundError(f"Template file not found: {template_path}")
+    if not template_path.is_file():
+        raise ValueError(f"Template path is not a file: {template_path}")
+    return template_path.read_text(encoding='utf-8')
+
+
+def fill_template(tpl: str, values: Dict[str, str]) -> str:
+    """Substitute every ``{{name}}`` placeholder in one pass; unknown names are left as-is."""
+    return _PLACEHOLDER.sub(lambda m: values.get(m.group(1), m.group(0)), tpl)
+
+
+def render_figure(figure: Figure) -> str:
+    return util.embed_figure(figure.plot(**figure.kwargs), "svg")
+
+
+def render_figures(values: Dict[str, object], executor: Optional[Executor] = None,
+                   symbol: Optional[str] = None) -> Dict[str, str]:
+    """
+    Render every Figure in *values* to SVG text, keyed like *values*.
+
+    When *symbol* is given, each chart is looked up in the figure cache under
+    ``<symbol>/<chart>-<digest>.svg`` first, and newly rendered charts are stored there.
+    """
+    svgs = {}
+    paths = {}
+    for key, value in values.items():
+        if not isinstance(value, Figure):
+            continue
+        if symbol is not None:
+            paths[key] = _figure_cache_path(symbol, key, figure_digest(value))
+            if os.path.isfile(paths[key]):
+                with open(paths[key], "r", encoding="utf-8") as f:
+                    svgs[key] = f.read()
+                continue
+        svgs[key] = None
+
+    missing = [key for key, svg in svgs.items() if svg is None]
+    figures = [values[key] for key in missing]
+    rendered = executor.map(render_figure, figures) if executor is not None else map(render_figure, figures)
+    for key, svg in zip(missing, rendered):
+        svgs[key] = svg
+        if symbol is not None:
+            _store_figure(paths[key], svg)
+    return svgs
+
+
+def figure_digest(figure: Figure) -> str:
+    """Content hash of a chart: the plot function, its options and the plotted values."""
+    digest = hashlib.sha256(figure.plot.__name__.encode())
+    for name in sorted(figure.kwargs):
+        digest.update(name.encode())
+        _update_digest(digest, figure.kwargs[name])
+    return digest.hexdigest()
+
+
+def _update_digest(digest, value):
+    if isinstance(value, pd.Series):
+        digest.update(str(value.dtype).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _update_digest(digest, item)
+    elif isinstance(value, Formatter):
+        # Formatters get an axis attached once used; only their settings matter
+        settings = {k: v for k, v in vars(value).items() if k != 'axis'}
+        digest.update(f"{type(value).__name__}{sorted(settings.items())}".encode())
+    else:
+        digest.update(repr(value).encode())
+
+
+def _figure_cache_path(symbol: str, chart: str, digest: str) -> str:
+    return os.path.join(validate_figure_cache_directory(), symbol, f"{chart}-{digest}.svg")
+
+
+def _store_figure(path: str, svg: str):
+    directory, name = os.path.split(path)
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(svg)
+    os.replace(tmp_path, path)
+    # Only the latest render of a chart is kept
+    chart = name.rsplit("-", 1)[0]
+    for stale in os.listdir(directory):
+        if stale != name and stale.endswith(".svg") and stale.rsplit("-", 1)[0] == chart:
+            try:
+                os.remove(os.path.join(directory, stale))
+            except FileNotFoundError:
+                pass
+
+
+def _figure(fig_size: tuple) -> MatplotlibFigure:
+    """Return this thread's Agg figure, cleared and resized to *fig_size*."""
+    fig = getattr(_local, 'figure', None)
+    if fig is None:
+        fig = MatplotlibFigure()
+        FigureCanvasAgg(fig)
+        _local.figure = fig
+    fig.clear()
+    fig.set_size_inches(fig_size)
+    return fig
+
+
+def _growth_ranges(y_min, y_max) -> list:
     ranges = []
     if y_min < 0:
         ranges.append((y_min, 0.0, "#F7C6C7", "Cornered"))
@@ -118,311 +267,113 @@ def fill_quarterly_revenue_growth(ticker: Ticker, tpl):
         ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
         ranges.append((0.10, 0.20, "#D5F5D0", "Stalwarts"))
         ranges.append((0.20, y_max, "#D6EAF8", "Fast Growers"))
+    return ranges
 
-    figure = plot_single_series_figure(
-        title='Quarterly Revenue YoY Growth',
-        series_x=stock_revenue_growth['report_date'],
-        series_y=stock_revenue_growth['yoy_growth'],
-        series_label='Quarterly Revenue YoY Growth',
-        fig_size=(8, 4),
-        y_axis_ticks=10,
-        formater=PercentFormatter(xmax=1.0, decimals=1),
-        figure_type='bar',
-        horizontal_lines=[0],
-        range_lines=ranges
-    )
-    tpl = tpl.replace("{{quarterly_revenue_yoy_growth}}", util.embed_figure(figure, "svg"))
-    tpl = tpl.replace("{{quarterly_revenue_yoy_growth_title}}", "<h3>Quarterly Revenue YoY Growth</h3>")
-    quarterly_revenue_yoy_growth_table = stock_revenue_growth[['report_date', 'revenue', 'prev_year_revenue', 'yoy_growth']].copy()
-    quarterly_revenue_yoy_growth_table['report_date'] = quarterly_revenue_yoy_growth_table['report_date'].dt.date
-    quarterly_revenue_yoy_growth_table['yoy_growth'] = quarterly_revenue_yoy_growth_table['yoy_growth'].apply(
-        lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
-    )
-    quarterly_revenue_yoy_growth_table["revenue"] = \
-        quarterly_revenue_yoy_growth_table["revenue"].apply(human_format)
-    quarterly_revenue_yoy_growth_table["prev_year_revenue"] = \
-        quarterly_revenue_yoy_growth_table["prev_year_revenue"].apply(human_format)
 
-    quarterly_revenue_yoy_growth_table.rename(
-        columns={
-            'report_date': 'Report Date',
-            'revenue': 'Current',
-            'prev_year_revenue': 'Prev. (YoY Base)',
-            'yoy_growth': 'YoY %'
-        },
-        inplace=True
-    )
-
-    tpl = tpl.replace("{{quarterly_revenue_yoy_growth_table}}", html_table(quarterly_revenue_yoy_growth_table, showindex=False))
-    return tpl
+def growth_section(growth: pd.DataFrame, value_column: str, title: str, key: Optional[str] = None,
+                   series_label: Optional[str] = None) -> Dict[str, object]:
+    key = key or f"quarterly_{value_column}_yoy_growth"
+    growth = growth.dropna(subset=['yoy_growth']).tail(8)
 
-def fill_quarterly_ebitda_growth(ticker: Ticker, tpl):
-    stock_ebitda_growth = ticker.quarterly_ebitda_yoy_growth()
-    stock_ebitda_growth = stock_ebitda_growth.dropna(subset=['yoy_growth']).tail(8)
-    y_min = stock_ebitda_growth['yoy_growth'].min()
-    y_max = stock_ebitda_growth['yoy_growth'].max()
-    ranges = []
-    if y_min < 0:
-        ranges.append((y_min, 0.0, "#F7C6C7", "Cornered"))
-    if 0 < y_max < 0.1:
-        ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
-    if 0.1 < y_max < 0.2:
-        ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
-        ranges.append((0.10, 0.20, "#D5F5D0", "Stalwarts"))
-    if 0.2 < y_max:
-        ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
-        ranges.append((0.10, 0.20, "#D5F5D0", "Stalwarts"))
-        ranges.append((0.20, y_max, "#D6EAF8", "Fast Growers"))
-
-    figure = plot_single_series_figure(
-        title='Quarterly EBITDA YoY Growth',
-        series_x=stock_ebitda_growth['report_date'],
-        series_y=stock_ebitda_growth['yoy_growth'],
-        series_label='Quarterly EBITDA YoY Growth',
+    figure = Figure(plot_single_series_figure, dict(
+        title=title,
+        series_x=growth['report_date'],
+        series_y=growth['yoy_growth'],
+        series_label=series_label or title,
         fig_size=(8, 4),
         y_axis_ticks=10,
         formater=PercentFormatter(xmax=1.0, decimals=1),
         figure_type='bar',
         horizontal_lines=[0],
-        range_lines=ranges
-    )
-    tpl = tpl.replace("{{quarterly_ebitda_yoy_growth}}", util.embed_figure(figure, "svg"))
-    tpl = tpl.replace("{{quarterly_ebitda_yoy_growth_title}}", "<h3>Quarterly EBITDA YoY Growth</h3>")
-    quarterly_ebitda_yoy_growth_table = stock_ebitda_growth[['report_date', 'ebitda', 'prev_year_ebitda', 'yoy_growth']].copy()
-    quarterly_ebitda_yoy_growth_table['report_date'] = quarterly_ebitda_yoy_growth_table['report_date'].dt.date
-    quarterly_ebitda_yoy_growth_table['yoy_growth'] = quarterly_ebitda_yoy_growth_table['yoy_growth'].apply(
-        lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
-    )
-    quarterly_ebitda_yoy_growth_table["ebitda"] = \
-        quarterly_ebitda_yoy_growth_table["ebitda"].apply(human_format)
-    quarterly_ebitda_yoy_growth_table["prev_year_ebitda"] = \
-        quarterly_ebitda_yoy_growth_table["prev_year_ebitda"].apply(human_format)
-
-    quarterly_ebitda_yoy_growth_table.rename(
-        columns={
-            'report_date': 'Report Date',
-            'ebitda': 'Current',
-            'prev_year_ebitda': 'Prev. (YoY Base)',
-            'yoy_growth': 'YoY %'
-        },
-        inplace=True
-    )
-
-    tpl = tpl.replace("{{quarterly_ebitda_yoy_growth_table}}", html_table(quarterly_ebitda_yoy_growth_table, showindex=False))
-    return tpl
+        range_lines=_growth_ranges(growth['yoy_growth'].min(), growth['yoy_growth'].max())
+    ))
 
-def fill_quarterly_net_income_growth(ticker: Ticker, tpl):
-    stock_net_income_growth = ticker.quarterly_net_income_yoy_growth()
-    stock_net_income_growth = stock_net_income_growth.dropna(subset=['yoy_growth']).tail(8)
-    y_min = stock_net_income_growth['yoy_growth'].min()
-    y_max = stock_net_income_growth['yoy_growth'].max()
-    ranges = []
-    if y_min < 0:
-        ranges.append((y_min, 0.0, "#F7C6C7", "Cornered"))
-    if 0 < y_max < 0.1:
-        ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
-    if 0.1 < y_max < 0.2:
-        ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
-        ranges.append((0.10, 0.20, "#D5F5D0", "Stalwarts"))
-    if 0.2 < y_max:
-        ranges.append((0.0, 0.10, "#F8E5B9", "Slow Growers"))
-        ranges.append((0.10, 0.20, "#D5F5D0", "Stalwarts"))
-        ranges.append((0.20, y_max, "#D6EAF8", "Fast Growers"))
-
-    figure = plot_single_series_figure(
-        title='Quarterly Net Income YoY Growth',
-        series_x=stock_net_income_growth['report_date'],
-        series_y=stock_net_income_growth['yoy_growth'],
-        series_label='Quarterly Net Income YoY Growth',
-        fig_size=(8, 4),
-        y_axis_ticks=10,
-        formater=PercentFormatter(xmax=1.0, decimals=1),
-        figure_type='bar',
-        horizontal_lines=[0],
-        range_lines=ranges
-    )
-    tpl = tpl.replace("{{quarterly_net_income_yoy_growth}}", util.embed_figure(figure, "svg"))
-    tpl = tpl.replace("{{quarterly_net_income_yoy_growth_title}}", "<h3>Quarterly Net Income YoY Growth</h3>")
-    quarterly_net_income_yoy_growth_table = stock_net_income_growth[['report_date', 'net_income_common_stockholders', 'prev_year_net_income_common_stockholders', 'yoy_growth']].copy()
-    quarterly_net_income_yoy_growth_table['report_date'] = quarterly_net_income_yoy_growth_table['report_date'].dt.date
-    quarterly_net_income_yoy_growth_table['yoy_growth'] = quarterly_net_income_yoy_growth_table['yoy_growth'].apply(
+    prev_column = f"prev_year_{value_column}"
+    table = growth[['report_date', value_column, prev_column, 'yoy_growth']].copy()
+    table['report_date'] = table['report_date'].dt.date
+    table['yoy_growth'] = table['yoy_growth'].apply(
         lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
     )
-    quarterly_net_income_yoy_growth_table["net_income_common_stockholders"] = \
-        quarterly_net_income_yoy_growth_table["net_income_common_stockholders"].apply(human_format)
-    quarterly_net_income_yoy_growth_table["prev_year_net_income_common_stockholders"] = \
-        quarterly_net_income_yoy_growth_table["prev_year_net_income_common_stockholders"].apply(human_format)
+    table[value_column] = table[value_column].apply(human_format)
+    table[prev_column] = table[prev_column].apply(human_format)
 
-    quarterly_net_income_yoy_growth_table.rename(
+    table.rename(
         columns={
             'report_date': 'Report Date',
-            'net_income_common_stockholders': 'Current',
-            'prev_year_net_income_common_stockholders': 'Prev. (YoY Base)',
+            value_column: 'Current',
+            prev_column: 'Prev. (YoY Base)',
             'yoy_growth': 'YoY %'
         },
         inplace=True
     )
-
-    tpl = tpl.replace("{{quarterly_net_income_yoy_growth_table}}", html_table(quarterly_net_income_yoy_growth_table, showindex=False))
-    return tpl
-
-def fill_quarterly_gross_margin_profitability(ticker: Ticker, tpl):
-    stock_gross_margin = ticker.quarterly_gross_margin()
-    industry_gross_margin = ticker.industry_quarterly_gross_margin()
-    stock_gross_margin['report_date'] = pd.to_datetime(stock_gross_margin['report_date'])
-    industry_gross_margin['report_date'] = pd.to_datetime(industry_gross_margin['report_date'])
-    merged_df = pd.merge_asof(
-        stock_gross_margin,
-        industry_gross_margin,
-        left_on='report_date',
-        right_on='report_date',
-        direction='backward'
-    )
-    merged_df = merged_df.dropna(subset=['gross_margin', 'industry_gross_margin'])
-
-    figure = plot_vs_figure(
-        title='Gross Margin (vs Industry)',
-        target_series_x=merged_df['report_date'],
-        target_series_y=merged_df['gross_margin'],
-        target_series_label='Stock Gross Margin',
-        baseline_series_x=merged_df['report_date'],
-        baseline_series_y=merged_df['industry_gross_margin'],
-        baseline_series_label='Industry Gross Margin',
-        fig_size=(8, 4),
-        y_axis_ticks=10,
-        formater=PercentFormatter(xmax=1.0, decimals=1),
-        figure_type='bar'
-    )
-    tpl = tpl.replace("{{gross_margin}}", util.embed_figure(figure, "svg"))
-    tpl = tpl.replace("{{gross_margin_title}}", "<h3>Gross Margin</h3>")
-    gross_margin_table = merged_df[['report_date', 'gross_margin', 'industry_gross_margin']].copy()
-    gross_margin_table['report_date'] = gross_margin_table['report_date'].dt.date
-    gross_margin_table['gross_margin'] = gross_margin_table['gross_margin'].apply(
-        lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
-    )
-    gross_margin_table['industry_gross_margin'] = gross_margin_table['industry_gross_margin'].apply(
-        lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
-    )
-
-    gross_margin_table.rename(
-        columns={
-            'report_date': 'Report Date',
-            'gross_margin': f"{ticker.ticker}",
-            'industry_gross_margin': f"{industry_gross_margin['industry'].iloc[0]} Industry",
-        },
-        inplace=True
-    )
-    tpl = tpl.replace("{{gross_margin_table}}", html_table(gross_margin_table, showindex=False))
-    return tpl
-
-def fill_quarterly_net_margin_profitability(ticker, tpl):
-    stock_net_margin = ticker.quarterly_net_margin()
-    industry_net_margin = ticker.industry_quarterly_net_margin()
-    stock_net_margin['report_date'] = pd.to_datetime(stock_net_margin['report_date'])
-    industry_net_margin['report_date'] = pd.to_datetime(industry_net_margin['report_date'])
+    return {
+        key: figure,
+        f"{key}_title": f"<h3>{title}</h3>",
+        f"{key}_table": html_table(table, showindex=False),
+    }
+
+
+def margin_section(symbol: str, stock_margin: pd.DataFrame, industry_margin: pd.DataFrame,
+                   metric: str, name: str) -> Dict[str, object]:
+    industry_metric = f"industry_{metric}"
+    stock_margin['report_date'] = pd.to_datetime(stock_margin['report_date'])
+    industry_margin['report_date'] = pd.to_datetime(industry_margin['report_date'])
     merged_df = pd.merge_asof(
-        stock_net_margin,
-        industry_net_margin,
+        stock_margin,
+        industry_margin,
         left_on='report_date',
         right_on='report_date',
         direction='backward'
     )
-    merged_df = merged_df.dropna(subset=['net_margin', 'industry_net_margin'])
+    merged_df = merged_df.dropna(subset=[metric, industry_metric])
 
-    figure = plot_vs_figure(
-        title='Net Margin (vs Industry)',
+    figure = Figure(plot_vs_figure, dict(
+        title=f"{name} Margin (vs Industry)",
         target_series_x=merged_df['report_date'],
-        target_series_y=merged_df['net_margin'],
-        target_series_label='Stock Net Margin',
+        target_series_y=merged_df[metric],
+        target_series_label=f"Stock {name} Margin",
         baseline_series_x=merged_df['report_date'],
-        baseline_series_y=merged_df['industry_net_margin'],
-        baseline_series_label='Industry Net Margin',
+        baseline_series_y=merged_df[industry_metric],
+        baseline_series_label=f"Industry {name} Margin",
         fig_size=(8, 4),
         y_axis_ticks=10,
         formater=PercentFormatter(xmax=1.0, decimals=1),
         figure_type='bar'
-    )
-    tpl = tpl.replace("{{net_margin}}", util.embed_figure(figure, "svg"))
-    tpl = tpl.replace("{{net_margin_title}}", "<h3>Net Margin</h3>")
-    net_margin_table = merged_df[['report_date', 'net_margin', 'industry_net_margin']].copy()
-    net_margin_table['report_date'] = net_margin_table['report_date'].dt.date
-    net_margin_table['net_margin'] = net_margin_table['net_margin'].apply(
+    ))
+    table = merged_df[['report_date', metric, industry_metric]].copy()
+    table['report_date'] = table['report_date'].dt.date
+    table[metric] = table[metric].apply(
         lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
     )
-    net_margin_table['industry_net_margin'] = net_margin_table['industry_net_margin'].apply(
+    table[industry_metric] = table[industry_metric].apply(
         lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
     )
 
-    net_margin_table.rename(
+    table.rename(
         columns={
             'report_date': 'Report Date',
-            'net_margin': f"{ticker.ticker}",
-            'industry_net_margin': f"{industry_net_margin['industry'].iloc[0]} Industry"
+            metric: f"{symbol}",
+            industry_metric: f"{industry_margin['industry'].iloc[0]} Industry",
         },
         inplace=True
     )
-    tpl = tpl.replace("{{net_margin_table}}", html_table(net_margin_table, showindex=False))
-    return tpl
-
-def fill_quarterly_ebitda_margin_profitability(ticker, tpl):
-    stock_ebitda_margin = ticker.quarterly_ebitda_margin()
-    industry_ebitda_margin = ticker.industry_quarterly_ebitda_margin()
-    stock_ebitda_margin['report_date'] = pd.to_datetime(stock_ebitda_margin['report_date'])
-    industry_ebitda_margin['report_date'] = pd.to_datetime(industry_ebitda_margin['report_date'])
-    merged_df = pd.merge_asof(
-        stock_ebitda_margin,
-        industry_ebitda_margin,
-        left_on='report_date',
-        right_on='report_date',
-        direction='backward'
-    )
-    merged_df = merged_df.dropna(subset=['ebitda_margin', 'industry_ebitda_margin'])
+    return {
+        metric: figure,
+        f"{metric}_title": f"<h3>{name} Margin</h3>",
+        f"{metric}_table": html_table(table, showindex=False),
+    }
 
-    figure = plot_vs_figure(
-        title='EBITDA Margin (vs Industry)',
-        target_series_x=merged_df['report_date'],
-        target_series_y=merged_df['ebitda_margin'],
-        target_series_label='Stock EBITDA Margin',
-        baseline_series_x=merged_df['report_date'],
-        baseline_series_y=merged_df['industry_ebitda_margin'],
-        baseline_series_label='Industry EBITDA Margin',
-        fig_size=(8, 4),
-        y_axis_ticks=10,
-        formater=PercentFormatter(xmax=1.0, decimals=1),
-        figure_type='bar'
-    )
-    tpl = tpl.replace("{{ebitda_margin}}", util.embed_figure(figure, "svg"))
-    tpl = tpl.replace("{{ebitda_margin_title}}", "<h3>EBITDA Margin</h3>")
-    net_margin_table = merged_df[['report_date', 'ebitda_margin', 'industry_ebitda_margin']].copy()
-    net_margin_table['report_date'] = net_margin_table['report_date'].dt.date
-    net_margin_table['ebitda_margin'] = net_margin_table['ebitda_margin'].apply(
-        lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
-    )
-    net_margin_table['industry_ebitda_margin'] = net_margin_table['industry_ebitda_margin'].apply(
-        lambda x: f"{x * 100:.2f}%" if pd.notna(x) else 'NaN'
-    )
 
-    net_margin_table.rename(
-        columns={
-            'report_date': 'Report Date',
-            'ebitda_margin': f"{ticker.ticker}",
-            'industry_ebitda_margin': f"{industry_ebitda_margin['industry'].iloc[0]} Industry"
-        },
-        inplace=True
-    )
-    tpl = tpl.replace("{{ebitda_margin_table}}", html_table(net_margin_table, showindex=False))
-    return tpl
-
-def fill_pe(ticker, tpl):
-    df_stock = ticker.ttm_pe().dropna()
-    df_ind = ticker.industry_ttm_pe().dropna()
+def pe_section(df_stock: pd.DataFrame, df_ind: pd.DataFrame) -> Dict[str, object]:
+    df_stock = df_stock.dropna()
+    df_ind = df_ind.dropna()
     df_stock['report_date'] = pd.to_datetime(df_stock['report_date'])
     df_ind['report_date'] = pd.to_datetime(df_ind['report_date'])
     df_ind = df_ind.dropna(subset=['industry_pe'])
     start_date = max(df_stock['report_date'].min(), df_ind['report_date'].min())
     df_stock_trim = df_stock[df_stock['report_date'] >= start_date]
     df_ind_trim = df_ind[df_ind['report_date'] >= start_date]
-    figure = plot_vs_figure(
+    figure = Figure(plot_vs_figure, dict(
         title='TTM P/E Ratio (vs Industry)',
         target_series_x=df_stock_trim['report_date'],
         target_series_y=df_stock_trim['ttm_pe'],
@@ -434,9 +385,7 @@ def fill_pe(ticker, tpl):
         y_axis_ticks=10,
         formater=FormatStrFormatter('%.0f'),
         use_reasonable_range=True
-    )
-    tpl = tpl.replace("{{ttm_pe}}", util.embed_figure(figure, "svg"))
-    tpl = tpl.replace("{{ttm_pe_title}}", "<h3>TTM P/E Ratio</h3>")
+    ))
     mean = df_stock_trim['ttm_pe'].mean()
     std = df_stock_trim['ttm_pe'].std()
     last_pe = df_stock_trim['ttm_pe'].iloc[-1]
@@ -451,22 +400,21 @@ def fill_pe(ticker, tpl):
         {'Metrics': 'u±1σ Band', 'Value': f"{mean - std:.2f} ~ {mean + std:.2f}"},
         {'Metrics': 'Below-History %', 'Value': f"{percentile_rank:.2f}%"},
     ])
-    tpl = tpl.replace("{{ttm_pe_table}}", html_table(ttm_pe_table, showindex=False))
-    return tpl
-
-
-def fill_headline(ticker, tpl):
-    info = ticker.info()
-    tpl = tpl.replace("{{symbol}}", info['symbol'].iloc[0])
-    tpl = tpl.replace("{{sector}}", info['sector'].iloc[0])
-    tpl = tpl.replace("{{industry}}", info['industry'].iloc[0])
-    tpl = tpl.replace("{{web_site}}", info['web_site'].iloc[0])
-    tpl = tpl.replace("{{city}}", info['city'].iloc[0])
-    tpl = tpl.replace("{{country}}", info['country'].iloc[0])
-    tpl = tpl.replace("{{address}}", info['address'].iloc[0])
-    tpl = tpl.replace("{{date_range}}", HuggingFaceClient().get_data_update_time())
-    tpl = tpl.replace("{{v}}", __version__)
-    return tpl
+    return {
+        'ttm_pe': figure,
+        'ttm_pe_title': "<h3>TTM P/E Ratio</h3>",
+        'ttm_pe_table': html_table(ttm_pe_table, showindex=False),
+    }
+
+
+def headline_section(info: pd.DataFrame, update_time: str) -> Dict[str, str]:
+    values = {
+        column: info[column].iloc[0]
+        for column in ('symbol', 'sector', 'industry', 'web_site', 'city', 'country', 'address')
+    }
+    values['date_range'] = update_time
+    values['v'] = __version__
+    return values
 
 def plot_single_series_figure(
         title: str,
@@ -477,7 +425,8 @@ def plot_single_series_figure(
         figure_type: str = "line",
         horizontal_lines: list = None,
         range_lines: list = None):
-    fig, ax = plt.subplots(figsize = fig_size)
+    fig = _figure(fig_size)
+    ax = fig.subplots()
     for spine in ["top", "right", "bottom", "left"]:
         ax.spines[spine].set_visible(False)
     fig.suptitle(title, fontweight="bold", fontsize=15, color="black")
@@ -529,10 +478,9 @@ def plot_single_series_figure(
     ax.legend()
     ax.grid(color='gray', alpha=0.2, linewidth=0.3)
     fig.autofmt_xdate()
-    plt.tight_layout()
+    fig.tight_layout()
     fig_file = util.file_stream()
     fig.savefig(fig_file, format="svg")
-    plt.close(fig)
     return fig_file
 
 def plot_vs_figure(
@@ -543,7 +491,8 @@ def plot_vs_figure(
         formater: Formatter,
         use_reasonable_range: bool = False,
         figure_type: str = "line"):
-    fig, ax = plt.subplots(figsize = fig_size)
+    fig = _figure(fig_size)
+    ax = fig.subplots()
     for spine in ["top", "right", "bottom", "left"]:
         ax.spines[spine].set_visible(False)
     fig.suptitle(title, fontweight="bold", fontsize=15, color="black")
@@ -572,10 +521,9 @@ def plot_vs_figure(
     ax.legend()
     ax.grid(color='gray', alpha=0.2, linewidth=0.3)
     fig.autofmt_xdate()
-    plt.tight_layout()
+    fig.tight_layout()
     fig_file = util.file_stream()
     fig.savefig(fig_file, format="svg")
-    plt.close(fig)
     return fig_file
 
 
@@ -0,0 +1,71 @@
+from typing import Dict
+
+import numpy as np
+
+# Explicit forecast horizon of the DCF template, in years
+PROJECTION_YEARS = 10
+
+# Years 1-5 grow at the near-term rate, years 6-10 fade linearly to the terminal rate
+_YEARS = np.arange(1, PROJECTION_YEARS + 1)
+_FADE_STEPS = np.clip(_YEARS - 5, 0, None)
+
+
+def stage_growth_rates(near_term, terminal) -> np.ndarray:
+    """Per-year growth rates for years 1-10, with a trailing axis of length 10."""
+    near_term = np.asarray(near_term, dtype=float)[..., None]
+    terminal = np.asarray(terminal, dtype=float)[..., None]
+    return near_term - _FADE_STEPS * (near_term - terminal) / 5
+
+
+def project_dcf(base_fcf, ttm_revenue, growth_rate_1_5y, revenue_growth_1_5y, growth_rate_terminal,
+                discount_rate, cash, total_debt, shares_outstanding, current_price) -> Dict[str, np.ndarray]:
+    """
+    Run the 10-year DCF projection and discounting as array math.
+
+    Every argument may be a scalar or an array; they are broadcast against each other,
+    so one call can value a whole universe of symbols, a WACC x growth grid or a set of
+    Monte Carlo draws. Per-year outputs gain a trailing axis of length 10 (years 1-10).
+
+    Returns:
+        Dict of arrays: fcf, revenue, fcf_margin, terminal_value, total_value,
+        enterprise_value, equity_value, fair_price and margin_of_safety.
+    """
+    base_fcf = np.asarray(base_fcf, dtype=float)
+    ttm_revenue = np.asarray(ttm_revenue, dtype=float)
+    growth_rate_terminal = np.asarray(growth_rate_terminal, dtype=float)
+    discount_rate = np.asarray(discount_rate, dtype=float)
+    shares_outstanding = np.asarray(shares_outstanding, dtype=float)
+    current_price = np.asarray(current_price, dtype=float)
+
+    fcf = base_fcf[..., None] * np.cumprod(1 + stage_growth_rates(growth_rate_1_5y, growth_rate_terminal), axis=-1)
+    revenue = ttm_revenue[..., None] * np.cumprod(1 + stage_growth_rates(revenue_growth_1_5y, growth_rate_terminal), axis=-1)
+    fcf_margin = np.divide(fcf, revenue, out=np.zeros(np.broadcast(fcf, revenue).shape), where=revenue != 0)
+
+    # Gordon growth on year 10, zero when the discount rate equals the terminal rate
+    spread = discount_rate - growth_rate_terminal
+    terminal_value = np.divide(fcf[..., -1] * (1 + growth_rate_terminal), spread,
+                               out=np.zeros(np.broadcast(fcf[..., -1], spread).shape), where=spread != 0)
+    total_value = fcf + terminal_value[..., None] * (_YEARS == PROJECTION_YEARS)
+
+    discount_factors = (1 + discount_rate[..., None]) ** -_YEARS
+    enterprise_value = np.sum(total_value * discount_factors, axis=-1)
+
+    equity_value = enterprise_value + cash - total_debt
+    fair_price = np.divide(equity_value, shares_outstanding,
+                           out=np.zeros(np.broadcast(equity_value, shares_outstanding).shape),
+                           where=shares_outstanding > 0)
+    margin_of_safety = np.divide(fair_price - current_price, fair_price,
+                                 out=np.zeros(np.broadcast(fair_price, current_price).shape),
+                                 where=fair_price != 0)
+
+    return {
+        "fcf": fcf,
+        "revenue": revenue,
+        "fcf_margin": fcf_margin,
+        "terminal_value": terminal_value,
+        "total_value": total_value,
+        "enterprise_value": enterprise_value,
+        "equity_value": equity_value,
+        "fair_price": fair_price,
+        "margin_of_safety": margin_of_safety,
+    }
@@ -0,0 +1,16 @@
+import re
+from typing import List
+
+import pandas as pd
+
+# Lower-case ASCII words and numbers; runs longer than 40 characters are noise and are dropped
+TOKEN_PATTERN = re.compile(r"\b[0-9a-z]{1,40}\b")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def tokenize_series(texts: pd.Series) -> pd.Series:
+    """Vectorised :func:`tokenize` over a Series of strings; missing values become empty lists."""
+    return texts.fillna("").str.lower().str.findall(TOKEN_PATTERN)
@@ -3,11 +3,15 @@ import json
 import os
 import platform
 import re
+import shutil
 import tempfile
+from functools import lru_cache
 from importlib.resources import files
-from typing import List, Dict, Any
+from threading import Lock
+from typing import List, Dict, Any, Tuple, Callable, Hashable
 
 import nltk
+from nltk.tokenize import PunktTokenizer
 import numpy as np
 import pandas as pd
 import psutil
@@ -59,6 +63,14 @@ def validate_memory_limit(memory_limit: str) -> str:
 def nltk_sentences(content: str) -> List[str]:
     return nltk.sent_tokenize(content)
 
+def nltk_sentence_spans(content: str) -> List[Tuple[int, int]]:
+    """(start, end) offsets of the sentences `nltk_sentences` returns for *content*."""
+    return list(_punkt_tokenizer().span_tokenize(content))
+
+@lru_cache(maxsize=1)
+def _punkt_tokenizer() -> PunktTokenizer:
+    return PunktTokenizer()
+
 def _get_base_temp_dir() -> str:
     """Get the base temporary directory based on platform."""
     if platform.system() in ("Darwin", "Linux"):
@@ -84,12 +96,90 @@ def validate_httpfs_cache_directory() -> str:
     os.makedirs(cache_dir, exist_ok=True)
     return cache_dir
 
+def validate_index_directory() -> str:
+    """Get local search index directory: /tmp/defeatbeta/index"""
+    cache_dir = os.path.join(_get_defeatbeta_root_dir(), "index")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def validate_body_cache_directory() -> str:
+    """Get transcript and news body cache directory: /tmp/defeatbeta/bodies/<version>"""
+    cache_dir = os.path.join(_get_defeatbeta_root_dir(), "bodies", __version__)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def validate_figure_cache_directory() -> str:
+    """Get tearsheet figure cache directory: /tmp/defeatbeta/figures/<version>"""
+    cache_dir = os.path.join(_get_defeatbeta_root_dir(), "figures", __version__)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def validate_llm_cache_directory() -> str:
+    """Get LLM response cache directory: /tmp/defeatbeta/llm"""
+    cache_dir = os.path.join(_get_defeatbeta_root_dir(), "llm")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
 def validate_dcf_directory() -> str:
     """Get DCF output directory: /tmp/defeatbeta/dcf"""
     cache_dir = os.path.join(_get_defeatbeta_root_dir(), "dcf")
     os.makedirs(cache_dir, exist_ok=True)
     return cache_dir
 
+def versioned_build(kind: str, update_time: str, build_fn: Callable[[str], None]) -> str:
+    """
+    Directory of *kind* for *update_time*: <index dir>/<kind>/<update_time>, built once.
+
+    *build_fn* fills a fresh ``.building-`` directory that is then renamed into place, so
+    readers never see a partial build and concurrent builders publish at most one copy.
+    Older versions of *kind* are removed once the current one exists.
+    """
+    root = os.path.join(validate_index_directory(), kind)
+    os.makedirs(root, exist_ok=True)
+    directory = os.path.join(root, re.sub(r'[^0-9A-Za-z_-]', '_', update_time))
+    if os.path.isdir(directory):
+        return directory
+    building = tempfile.mkdtemp(prefix='.building-', dir=root)
+    try:
+        build_fn(building)
+        os.rename(building, directory)
+    except OSError:
+        # Another process published the same version first
+        if not os.path.isdir(directory):
+            raise
+    finally:
+        shutil.rmtree(building, ignore_errors=True)
+    for stale in os.listdir(root):
+        if not stale.startswith('.') and os.path.join(root, stale) != directory:
+            shutil.rmtree(os.path.join(root, stale), ignore_errors=True)
+    return directory
+
+
+# Values kept by update_time_cached; reentrant because one build may open another (sentiment → BM25 index)
+_update_time_values: Dict[Hashable, Tuple[str, Any]] = {}
+_update_time_locks: Dict[Hashable, Lock] = {}
+_update_time_locks_lock = Lock()
+
+
+def update_time_cached(key: Hashable, update_time: str, load: Callable[[], Any]) -> Any:
+    """
+    Process-wide ``load()`` result for *key*, reloaded only when the dataset update_time changes.
+
+    Each key has its own lock, so a long build only blocks callers waiting for the same key.
+    """
+    cached = _update_time_values.get(key)
+    if cached is not None and cached[0] == update_time:
+        return cached[1]
+    with _update_time_locks_lock:
+        lock = _update_time_locks.setdefault(key, Lock())
+    with lock:
+        cached = _update_time_values.get(key)
+        if cached is None or cached[0] != update_time:
+            cached = (update_time, load())
+            _update_time_values[key] = cached
+        return cached[1]
+
+
 def load_item_dictionary() -> Dict[str, str]:
     text = files("defeatbeta_api.data.template").joinpath('dictionary.json').read_text(encoding="utf-8")
     data = json.loads(text)
@@ -188,7 +278,17 @@ def load_transcripts_analyze_forecast_tools() -> Dict[str, Any]:
     data = json.loads(text)
     return data
 
+@lru_cache(maxsize=1)
+def load_sentiment_lexicon() -> Dict[str, frozenset]:
+    """Finance word lists (positive, negative, uncertainty) used for lexicon sentiment."""
+    text = files("defeatbeta_api.data.template").joinpath('finance_sentiment_lexicon.json').read_text(encoding="utf-8")
+    return {category: frozenset(words) for category, words in json.loads(text).items()}
+
 def load_sp500_historical_annual_returns() -> pd.DataFrame:
+    return _sp500_historical_annual_returns().copy()
+
+@lru_cache(maxsize=1)
+def _sp500_historical_annual_returns() -> pd.DataFrame:
     text = files("defeatbeta_api.data.template").joinpath('sp500_historical_annual_returns.json').read_text(encoding="utf-8")
     data = json.loads(text)
 
@@ -200,6 +300,14 @@ def load_sp500_historical_annual_returns() -> pd.DataFrame:
 
     return df
 
+@lru_cache(maxsize=1)
+def _sp500_cumulative_log_returns():
+    # cumulative[i] is the log growth over the first i years, so any window is a difference of two entries
+    df = _sp500_historical_annual_returns()
+    dates = df["report_date"].to_numpy(dtype="datetime64[us]")
+    cumulative = np.concatenate([[0.0], np.cumsum(np.log1p(df["annual_returns"].to_numpy(dtype=float)))])
+    return dates, cumulative
+
 def sp500_cagr_returns(years: int) -> pd.DataFrame:
     annual_returns = load_sp500_historical_annual_returns()
     recent = annual_returns.tail(years).copy()
@@ -213,39 +321,55 @@ def sp500_cagr_returns(years: int) -> pd.DataFrame:
 def sp500_cagr_returns_rolling(years: int) -> pd.DataFrame:
     if years <= 0:
         raise ValueError("years must be a positive integer")
+    return _sp500_cagr_returns_rolling(years).copy()
 
-    df = load_sp500_historical_annual_returns().copy()
-    df = df.sort_values("report_date").reset_index(drop=True)
+@lru_cache(maxsize=None)
+def _sp500_cagr_returns_rolling(years: int) -> pd.DataFrame:
+    dates, cumulative = _sp500_cumulative_log_returns()
 
-    n = len(df)
+    n = len(dates)
     if n < years:
         return pd.DataFrame(columns=[
             "start_date", "end_date", "start_year", "end_year", f"cagr_returns_{years}_years"
         ])
 
-    returns_series = df["annual_returns"]
-    rolling_prod = (1 + returns_series).rolling(window=years, min_periods=years).apply(np.prod, raw=True)
-
-    results = []
-    for end_idx in range(years - 1, n):
-        prod_value = rolling_prod.iloc[end_idx]
-        if pd.isna(prod_value):
-            continue
-        cagr = prod_value ** (1 / years) - 1
-
-        start_idx = end_idx - years + 1
-        start_date = df.loc[start_idx, "report_date"]
-        end_date = df.loc[end_idx, "report_date"]
-
-        results.append({
-            "start_date": start_date,
-            "end_date": end_date,
-            "start_year": int(start_date.year),
-            "end_year": int(end_date.year),
-            f"cagr_returns_{years}_years": round(float(cagr), 4)
-        })
-
-    return pd.DataFrame(results).sort_values("end_date").reset_index(drop=True)
+    cagr = np.expm1((cumulative[years:] - cumulative[:-years]) / years)
+    start_dates = pd.DatetimeIndex(dates[:n - years + 1])
+    end_dates = pd.DatetimeIndex(dates[years - 1:])
+
+    return pd.DataFrame({
+        "start_date": start_dates,
+        "end_date": end_dates,
+        "start_year": start_dates.year.astype(int),
+        "end_year": end_dates.year.astype(int),
+        f"cagr_returns_{years}_years": np.round(cagr, 4)
+    })
+
+def sp500_cagr_returns_matrix(max_years: int = None) -> pd.DataFrame:
+    """
+    Rolling S&P 500 CAGR for every window length at once.
+
+    Rows are indexed by the end date of the window and columns are the window length
+    in years (1 to *max_years*, default the full history). Windows that reach back
+    before the first year of data are NaN.
+    """
+    dates, cumulative = _sp500_cumulative_log_returns()
+    n = len(dates)
+    max_years = n if max_years is None else max_years
+    if max_years <= 0:
+        raise ValueError("max_years must be a positive integer")
+
+    end = np.arange(1, n + 1)[:, None]
+    years = np.arange(1, max_years + 1)[None, :]
+    start = end - years
+    log_growth = cumulative[end] - cumulative[np.clip(start, 0, None)]
+    cagr = np.where(start >= 0, np.expm1(log_growth / years), np.nan)
+
+    return pd.DataFrame(
+        np.round(cagr, 4),
+        index=pd.DatetimeIndex(dates, name="end_date"),
+        columns=pd.Index(np.arange(1, max_years + 1), name="years")
+    )
 
 unit_map = {
     "trillion": 1e12,
@@ -1,6 +1,6 @@
 import pandas as pd
 
-from .util import create_ticker
+from .util import create_ticker, validate_date_range
 
 MAX_ROWS = 1000
 
@@ -86,19 +86,21 @@ def get_stock_enterprise_value(symbol: str, start_date: str = None, end_date: st
         time expressions.
     """
     symbol = symbol.upper()
+    err = validate_date_range(start_date, end_date)
+    if err:
+        return err
+
     ticker = create_ticker(symbol)
-    df = ticker.enterprise_value()
+    df = ticker.enterprise_value(start=start_date or None, end=end_date or None)
 
     if df.empty:
+        if start_date or end_date:
+            return {"symbol": symbol, "message": "No data found for the specified date range."}
         return {"symbol": symbol, "message": "No historical data available for this symbol."}
 
     df['report_date'] = pd.to_datetime(df['report_date'])
     df['fiscal_quarter'] = pd.to_datetime(df['fiscal_quarter'])
 
-    df, err = _apply_date_filter(df, start_date, end_date, symbol)
-    if err:
-        return err
-
     truncated = False
     if len(df) > MAX_ROWS:
         df = df.tail(MAX_ROWS)
@@ -1,4 +1,4 @@
-from .util import create_ticker
+from .util import create_ticker, validate_date_range
 import pandas as pd
 
 def get_stock_news(symbol: str, start_date: str = None, end_date: str = None, max_rows: int = 50):
@@ -10,7 +10,7 @@ def get_stock_news(symbol: str, start_date: str = None, end_date: str = None, ma
                       Case-insensitive; will be converted to uppercase.
         start_date (str, optional): Filter news on or after this date (YYYY-MM-DD).
         end_date (str, optional): Filter news on or before this date (YYYY-MM-DD).
-        max_rows (int, optional): Maximum number of news items to return (default 50).
+        max_rows (int, optional): Maximum number of news items to return, at least 1 (default 50).
 
     Important note on data limits:
         To prevent responses from becoming too large for the language model to process
@@ -62,43 +62,34 @@ def get_stock_news(symbol: str, start_date: str = None, end_date: str = None, ma
         }
     """
     symbol = symbol.upper()
+    err = validate_date_range(start_date, end_date)
+    if err:
+        return err
+    if max_rows < 1:
+        return {"error": f"Invalid max_rows: {max_rows}. Use a positive number of news items."}
     ticker = create_ticker(symbol)
     news = ticker.news()
-    df = news.get_news_list()
+    # Newest first with one extra row: only the returned rows are read, and the extra one flags truncation
+    df = news.get_news_list(limit=max_rows + 1, since=start_date or None,
+                            until=end_date or None, newest_first=True)
 
     if df.empty:
         return {"symbol": symbol, "rows_returned": 0, "truncated": False, "news": []}
 
+    truncated = len(df) > max_rows
+    df = df.head(max_rows).iloc[::-1].reset_index(drop=True)
     df["report_date"] = pd.to_datetime(df["report_date"], errors="coerce")
-    df = df.sort_values("report_date").reset_index(drop=True)
 
-    if start_date:
-        try:
-            start_dt = pd.to_datetime(start_date)
-            df = df[df["report_date"] >= start_dt]
-        except ValueError:
-            return {"error": f"Invalid start_date: {start_date}"}
-    if end_date:
-        try:
-            end_dt = pd.to_datetime(end_date)
-            df = df[df["report_date"] <= end_dt]
-        except ValueError:
-            return {"error": f"Invalid end_date: {end_date}"}
-
-    if df.empty:
-        return {"symbol": symbol, "rows_returned": 0, "truncated": False, "news": []}
-
-    truncated = False
-    if len(df) > max_rows:
-        df = df.tail(max_rows)
-        truncated = True
+    articles = news.get_articles(df["uuid"].tolist())
+    articles = {row["uuid"]: row for _, row in articles.iterrows()}
 
     news_items = []
     for _, row in df.iterrows():
-        news_content = news.get_news(row["uuid"])
+        article = articles.get(row["uuid"])
         paragraphs = []
-        if not news_content.empty:
-            raw_news = news_content.iloc[0].get("news")
+        related_symbols = []
+        if article is not None:
+            raw_news = article.get("news")
             news_list = list(raw_news) if pd.api.types.is_list_like(raw_news) else []
             paragraphs = [
                 {
@@ -108,6 +99,7 @@ def get_stock_news(symbol: str, start_date: str = None, end_date: str = None, ma
                 }
                 for p in news_list
             ]
+            related_symbols = [article["symbol"]]
         news_items.append({
             "uuid": row["uuid"],
             "report_date": row["report_date"].strftime("%Y-%m-%d"),
@@ -115,7 +107,7 @@ def get_stock_news(symbol: str, start_date: str = None, end_date: str = None, ma
             "publisher": row.get("publisher"),
             "type": row.get("type"),
             "link": row.get("link"),
-            "related_symbols": row["related_symbols"] if isinstance(row.get("related_symbols"), list) else [],
+            "related_symbols": related_symbols,
             "paragraphs": paragraphs
         })
 
@@ -1,6 +1,6 @@
 import pandas as pd
 
-from .util import create_ticker
+from .util import create_ticker, validate_date_range
 
 def get_stock_pb_ratio(symbol: str, start_date: str = None, end_date: str = None):
     """
@@ -54,38 +54,22 @@ def get_stock_pb_ratio(symbol: str, start_date: str = None, end_date: str = None
         time expressions.
     """
     symbol = symbol.upper()
+    err = validate_date_range(start_date, end_date)
+    if err:
+        return err
+
     ticker = create_ticker(symbol)
-    df = ticker.pb_ratio()
+    df = ticker.pb_ratio(start=start_date or None, end=end_date or None)
 
     if df.empty:
         return {
             "symbol": symbol,
-            "message": "No historical data available for this symbol."
+            "message": "No data found for the specified date range." if (start_date or end_date)
+            else "No historical data available for this symbol."
         }
     df['report_date'] = pd.to_datetime(df['report_date'])
     df['fiscal_quarter'] = pd.to_datetime(df['fiscal_quarter'])
 
-    # Apply date filters
-    if start_date:
-        try:
-            start_dt = pd.to_datetime(start_date)
-            df = df[df['report_date'] >= start_dt]
-        except ValueError:
-            return {"error": f"Invalid start_date format: '{start_date}'. Use YYYY-MM-DD."}
-
-    if end_date:
-        try:
-            end_dt = pd.to_datetime(end_date)
-            df = df[df['report_date'] <= end_dt]
-        except ValueError:
-            return {"error": f"Invalid end_date format: '{end_date}'. Use YYYY-MM-DD."}
-
-    if df.empty:
-        return {
-            "symbol": symbol,
-            "message": "No data found for the specified date range."
-        }
-
     # Safety cap to avoid token overflow in LLM context
     MAX_ROWS = 1000
     if len(df) > MAX_ROWS:
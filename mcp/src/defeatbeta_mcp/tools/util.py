@@ -1,6 +1,8 @@
 import os
 from typing import Optional
 
+import pandas as pd
+
 from defeatbeta_api.data.ticker import Ticker
 from defeatbeta_api.data.company_meta import CompanyMeta
 
@@ -18,6 +20,17 @@ def get_http_proxy() -> Optional[str]:
         or os.getenv("defeatbeta_gateway")
     )
 
+def validate_date_range(start_date: Optional[str], end_date: Optional[str]) -> Optional[dict]:
+    # Tools then pass the dates to the Ticker method, which pushes the range into the
+    # query, so only the requested window is read
+    for name, value in (("start_date", start_date), ("end_date", end_date)):
+        if value:
+            try:
+                pd.to_datetime(value)
+            except ValueError:
+                return {"error": f"Invalid {name} format: '{value}'. Use YYYY-MM-DD."}
+    return None
+
 def create_ticker(symbol: str) -> Ticker:
     proxy = get_http_proxy()
     symbol = symbol.upper()
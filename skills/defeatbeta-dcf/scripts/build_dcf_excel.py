@@ -6,10 +6,24 @@ projection, NPV, and fair-price cell is an Excel formula referencing
 input cells. The user can edit any assumption (discount rate, growth
 rates, cash, share count, current price) and the model recomputes.
 
+Workbooks are written in openpyxl write-only mode: each sheet is laid out
+in memory as plain (value, style) tuples and then streamed row by row, with
+every cell pointing at a shared named style. With --recalc the formulas are
+also evaluated in-process (see recalc.py) so the saved files carry cached
+values without a LibreOffice pass.
+
 Usage:
     python build_dcf_excel.py <input.json> [output.xlsx]
+    python build_dcf_excel.py a.json b.json ... --out-dir ./dcf [--workers 4]
+    python build_dcf_excel.py a.json b.json ... --combined ./universe_DCF.xlsx
+    python build_dcf_excel.py --symbols AAPL MSFT NVDA --out-dir ./dcf --recalc
+    python build_dcf_excel.py --symbols AAPL MSFT NVDA --combined ./universe_DCF.xlsx
 
 Defaults output to ./{SYMBOL}_DCF.xlsx in the current working directory.
+Batch modes write one file per payload from parallel worker processes, or
+one sheet per payload into a single workbook with --combined. --symbols
+computes each payload with the defeatbeta_api package inside the worker, and
+cannot be mixed with JSON inputs.
 """
 from __future__ import annotations
 
@@ -17,13 +31,16 @@ import argparse
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from recalc import recalc_in_process
 
 
 # ===== Palette (3 blues + 1 grey + white, per 3-statement-model conventions) =====
@@ -36,6 +53,8 @@ WHITE_BOLD = Font(name="Calibri", size=11, bold=True, color="FFFFFF")
 BLACK_BOLD = Font(name="Calibri", size=11, bold=True, color="000000")
 BLUE_INPUT_FONT = Font(name="Calibri", size=11, color="0000FF")
 BLACK_FORMULA_FONT = Font(name="Calibri", size=11, color="000000")
+REGULAR_FONT = Font(name="Calibri", size=11)
+DATE_FONT = Font(name="Calibri", size=10, italic=True)
 
 THIN_GREY = Side(style="thin", color="BFBFBF")
 THIN_BORDER = Border(left=THIN_GREY, right=THIN_GREY, top=THIN_GREY, bottom=THIN_GREY)
@@ -50,6 +69,38 @@ FMT_PCT = "0.00%"
 FMT_DEC2 = "0.00"
 FMT_FLOAT4 = "0.0000"
 
+# ===== Named styles =====
+# Cells reference these by name; each (role, number format) pair is registered
+# once per workbook instead of building Font/Fill/Border objects per cell.
+ROLE_STYLES = {
+    "section_header": dict(font=WHITE_BOLD, fill=SECTION_HEADER_FILL, alignment=LEFT_ALIGN),
+    "column_header": dict(font=BLACK_BOLD, fill=COLUMN_HEADER_FILL, alignment=CENTER_ALIGN, border=THIN_BORDER),
+    "label": dict(font=REGULAR_FONT, alignment=LEFT_ALIGN),
+    "label_bold": dict(font=BLACK_BOLD, alignment=LEFT_ALIGN),
+    "input": dict(font=BLUE_INPUT_FONT, fill=INPUT_FILL, alignment=RIGHT_ALIGN, border=THIN_BORDER),
+    "formula": dict(font=BLACK_FORMULA_FONT, alignment=RIGHT_ALIGN, border=THIN_BORDER),
+    "key_total": dict(font=BLACK_BOLD, fill=KEY_TOTAL_FILL, alignment=RIGHT_ALIGN, border=THIN_BORDER),
+    "date": dict(font=DATE_FONT, alignment=CENTER_ALIGN),
+    "recommendation": dict(font=BLACK_BOLD, fill=KEY_TOTAL_FILL, alignment=CENTER_ALIGN, border=THIN_BORDER),
+}
+
+# Column widths (B=label, C=value, D..M projection years)
+COLUMN_WIDTHS = {
+    "A": 2,
+    "B": 38,
+    "C": 18,
+    "D": 16,
+    "E": 16,
+    "F": 18,
+    "G": 16,
+    "H": 16,
+    "I": 16,
+    "J": 16,
+    "K": 16,
+    "L": 16,
+    "M": 16,
+}
+
 
 @dataclass
 class CellRef:
@@ -68,15 +119,25 @@ class CellRef:
 
 @dataclass
 class BuildContext:
-    """Tracks cursor position and named cell refs as we write sections."""
+    """Tracks cursor position and named cell refs as we write sections.
+
+    Cells are buffered as ``{row: {column_index: (value, role, number_format)}}``
+    so sections can fill rows out of order before the sheet is streamed.
+    """
 
-    ws: Worksheet
     row: int = 1
     refs: Dict[str, CellRef] = field(default_factory=dict)
+    cells: Dict[int, Dict[int, Tuple[object, str, Optional[str]]]] = field(default_factory=dict)
+    merges: List[str] = field(default_factory=list)
+    row_heights: Dict[int, float] = field(default_factory=dict)
 
     def advance(self, n: int = 1) -> None:
         self.row += n
 
+    def put(self, col: str, row: int, value, role: str, number_format: Optional[str] = None) -> CellRef:
+        self.cells.setdefault(row, {})[column_index_from_string(col)] = (value, role, number_format)
+        return CellRef(col, row)
+
     def remember(self, name: str, col: str, row: int) -> CellRef:
         ref = CellRef(col, row)
         self.refs[name] = ref
@@ -91,41 +152,22 @@ def write_section_header(ctx: BuildContext, title: str, span_cols: int = 7) -> N
     """Write a section banner spanning N columns."""
     start = "B"
     end = get_column_letter(1 + span_cols)  # B=2, so end col index = 2 + span_cols - 1
-    cell = ctx.ws[f"{start}{ctx.row}"]
-    cell.value = title
-    cell.font = WHITE_BOLD
-    cell.fill = SECTION_HEADER_FILL
-    cell.alignment = LEFT_ALIGN
-    ctx.ws.merge_cells(f"{start}{ctx.row}:{end}{ctx.row}")
-    ctx.ws.row_dimensions[ctx.row].height = 22
+    ctx.put(start, ctx.row, title, "section_header")
+    ctx.merges.append(f"{start}{ctx.row}:{end}{ctx.row}")
+    ctx.row_heights[ctx.row] = 22
     ctx.advance()
 
 
 def write_label(ctx: BuildContext, col: str, label: str, bold: bool = False) -> None:
-    cell = ctx.ws[f"{col}{ctx.row}"]
-    cell.value = label
-    cell.font = BLACK_BOLD if bold else Font(name="Calibri", size=11)
-    cell.alignment = LEFT_ALIGN
+    ctx.put(col, ctx.row, label, "label_bold" if bold else "label")
 
 
 def write_column_header(ctx: BuildContext, col: str, label: str) -> None:
-    cell = ctx.ws[f"{col}{ctx.row}"]
-    cell.value = label
-    cell.font = BLACK_BOLD
-    cell.fill = COLUMN_HEADER_FILL
-    cell.alignment = CENTER_ALIGN
-    cell.border = THIN_BORDER
+    ctx.put(col, ctx.row, label, "column_header")
 
 
 def write_input(ctx: BuildContext, col: str, value, number_format: str = FMT_INT) -> CellRef:
-    cell = ctx.ws[f"{col}{ctx.row}"]
-    cell.value = value
-    cell.font = BLUE_INPUT_FONT
-    cell.fill = INPUT_FILL
-    cell.number_format = number_format
-    cell.alignment = RIGHT_ALIGN
-    cell.border = THIN_BORDER
-    return CellRef(col, ctx.row)
+    return ctx.put(col, ctx.row, value, "input", number_format)
 
 
 def write_formula(
@@ -135,15 +177,7 @@ def write_formula(
     number_format: str = FMT_INT,
     is_key_total: bool = False,
 ) -> CellRef:
-    cell = ctx.ws[f"{col}{ctx.row}"]
-    cell.value = formula
-    cell.font = BLACK_BOLD if is_key_total else BLACK_FORMULA_FONT
-    if is_key_total:
-        cell.fill = KEY_TOTAL_FILL
-    cell.number_format = number_format
-    cell.alignment = RIGHT_ALIGN
-    cell.border = THIN_BORDER
-    return CellRef(col, ctx.row)
+    return ctx.put(col, ctx.row, formula, "key_total" if is_key_total else "formula", number_format)
 
 
 # ===== Section builders =====
@@ -244,21 +278,11 @@ def build_discount_rate_section(ctx: BuildContext, dr: dict) -> None:
 
 
 def write_label_at(ctx: BuildContext, col: str, row: int, label: str, bold: bool = False) -> None:
-    cell = ctx.ws[f"{col}{row}"]
-    cell.value = label
-    cell.font = BLACK_BOLD if bold else Font(name="Calibri", size=11)
-    cell.alignment = LEFT_ALIGN
+    ctx.put(col, row, label, "label_bold" if bold else "label")
 
 
 def write_input_at(ctx: BuildContext, col: str, row: int, value, number_format: str) -> CellRef:
-    cell = ctx.ws[f"{col}{row}"]
-    cell.value = value
-    cell.font = BLUE_INPUT_FONT
-    cell.fill = INPUT_FILL
-    cell.number_format = number_format
-    cell.alignment = RIGHT_ALIGN
-    cell.border = THIN_BORDER
-    return CellRef(col, row)
+    return ctx.put(col, row, value, "input", number_format)
 
 
 def write_formula_at(
@@ -269,15 +293,7 @@ def write_formula_at(
     number_format: str,
     is_key_total: bool = False,
 ) -> CellRef:
-    cell = ctx.ws[f"{col}{row}"]
-    cell.value = formula
-    cell.font = BLACK_BOLD if is_key_total else BLACK_FORMULA_FONT
-    if is_key_total:
-        cell.fill = KEY_TOTAL_FILL
-    cell.number_format = number_format
-    cell.alignment = RIGHT_ALIGN
-    cell.border = THIN_BORDER
-    return CellRef(col, row)
+    return ctx.put(col, row, formula, "key_total" if is_key_total else "formula", number_format)
 
 
 def build_growth_estimates_section(ctx: BuildContext, ge: dict) -> None:
@@ -470,10 +486,7 @@ def build_dcf_template_section(ctx: BuildContext, dt: dict) -> None:
     write_label(ctx, "B", "Date", bold=True)
     for i, col in enumerate(proj_cols):
         date_val = projections[i].get("date", "")
-        cell = ctx.ws[f"{col}{ctx.row}"]
-        cell.value = str(date_val)
-        cell.font = Font(name="Calibri", size=10, italic=True)
-        cell.alignment = CENTER_ALIGN
+        ctx.put(col, ctx.row, str(date_val), "date")
     ctx.advance()
 
     # FCF row
@@ -555,12 +568,7 @@ def build_dcf_template_section(ctx: BuildContext, dt: dict) -> None:
         write_label(ctx, "B", "Year", bold=True)
         for i, item in enumerate(historical[:10]):
             col = proj_cols[1 + i]  # start from D, skip C (was year 0 header)
-            cell = ctx.ws[f"{col}{ctx.row}"]
-            cell.value = str(item.get("date", ""))
-            cell.font = BLACK_BOLD
-            cell.fill = COLUMN_HEADER_FILL
-            cell.alignment = CENTER_ALIGN
-            cell.border = THIN_BORDER
+            write_column_header(ctx, col, str(item.get("date", "")))
         ctx.advance()
 
         write_label(ctx, "B", "FCF Margin", bold=True)
@@ -628,18 +636,54 @@ def build_dcf_value_section(ctx: BuildContext, dv: dict) -> None:
     ctx.advance()
 
     write_label(ctx, "B", "Recommendation", bold=True)
-    rec_cell = ctx.ws[f"C{ctx.row}"]
-    rec_cell.value = f'=IF({fair_price}>{current_price},"Buy","Sell")'
-    rec_cell.font = BLACK_BOLD
-    rec_cell.fill = KEY_TOTAL_FILL
-    rec_cell.alignment = CENTER_ALIGN
-    rec_cell.number_format = "@"
-    rec_cell.border = THIN_BORDER
+    ctx.put("C", ctx.row, f'=IF({fair_price}>{current_price},"Buy","Sell")', "recommendation", "@")
     ctx.advance()
 
 
+# ===== Streaming output =====
+def style_name(wb: Workbook, role: str, number_format: Optional[str]) -> str:
+    """Register the named style for (role, number_format) on first use and return its name."""
+    name = f"DCF {role}" if number_format is None else f"DCF {role} {number_format}"
+    if name not in wb.style_names:
+        wb.add_named_style(NamedStyle(name=name, number_format=number_format or "General", **ROLE_STYLES[role]))
+    return name
+
+
+def sheet_title(wb: Workbook, symbol: str) -> str:
+    """Unique sheet title for *symbol*, within Excel's 31 character limit."""
+    base = f"DCF {symbol}"[:31]
+    title, n = base, 2
+    while title in wb.sheetnames:
+        suffix = f" ({n})"
+        title, n = base[:31 - len(suffix)] + suffix, n + 1
+    return title
+
+
+def stream_sheet(wb: Workbook, title: str, ctx: BuildContext) -> None:
+    """Write the buffered cells of *ctx* to a new write-only sheet, one row at a time."""
+    ws = wb.create_sheet(title=title)
+    # Column and row dimensions must be set before any row is appended
+    for col, w in COLUMN_WIDTHS.items():
+        ws.column_dimensions[col].width = w
+    for row, height in ctx.row_heights.items():
+        ws.row_dimensions[row].height = height
+    ws.sheet_view.showGridLines = False
+    for cell_range in ctx.merges:
+        ws.merged_cells.add(cell_range)
+
+    for row in range(1, max(ctx.cells, default=0) + 1):
+        row_cells = ctx.cells.get(row, {})
+        values: List[Optional[WriteOnlyCell]] = [None] * max(row_cells, default=0)
+        for col_idx, (value, role, number_format) in row_cells.items():
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style_name(wb, role, number_format)
+            values[col_idx - 1] = cell
+        ws.append(values)
+
+
 # ===== Top-level orchestration =====
-def build(payload: dict, output_path: str) -> str:
+def layout(payload: dict) -> Tuple[str, BuildContext]:
+    """Lay out all four sections for one payload; returns (symbol, context)."""
     if "error" in payload:
         raise ValueError(f"MCP error for {payload.get('symbol', 'UNKNOWN')}: {payload['error']}")
 
@@ -649,63 +693,141 @@ def build(payload: dict, output_path: str) -> str:
     dt = payload["dcf_template"]
     dv = payload["dcf_value"]
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"DCF {symbol}"
-
-    # Column widths (B=label, C=value, D..M projection years)
-    widths = {
-        "A": 2,
-        "B": 38,
-        "C": 18,
-        "D": 16,
-        "E": 16,
-        "F": 18,
-        "G": 16,
-        "H": 16,
-        "I": 16,
-        "J": 16,
-        "K": 16,
-        "L": 16,
-        "M": 16,
-    }
-    for col, w in widths.items():
-        ws.column_dimensions[col].width = w
-
-    ws.sheet_view.showGridLines = False
-
-    ctx = BuildContext(ws=ws, row=1)
+    ctx = BuildContext(row=1)
     build_discount_rate_section(ctx, dr)
     build_growth_estimates_section(ctx, ge)
     build_dcf_template_section(ctx, dt)
     build_dcf_value_section(ctx, dv)
+    return symbol, ctx
+
 
+def save(wb: Workbook, output_path: str, recalc: bool = False) -> str:
     output_path = os.path.abspath(output_path)
     wb.save(output_path)
+    if recalc:
+        recalc_in_process(output_path)
     return output_path
 
 
+def build(payload: dict, output_path: str, recalc: bool = False) -> str:
+    symbol, ctx = layout(payload)
+
+    wb = Workbook(write_only=True)
+    stream_sheet(wb, sheet_title(wb, symbol), ctx)
+    return save(wb, output_path, recalc)
+
+
+def build_workbook(payloads: List[dict], output_path: str, recalc: bool = False) -> str:
+    """Write one workbook with a sheet per payload."""
+    if not payloads:
+        raise ValueError("No DCF payloads to write")
+
+    wb = Workbook(write_only=True)
+    for payload in payloads:
+        symbol, ctx = layout(payload)
+        stream_sheet(wb, sheet_title(wb, symbol), ctx)
+    return save(wb, output_path, recalc)
+
+
+def load_payload(source: Union[str, dict]) -> dict:
+    if isinstance(source, dict):
+        return source
+    with open(source, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def default_output_path(payload: dict, output_dir: str) -> str:
+    symbol = (payload.get("symbol") or "DCF").upper()
+    return os.path.join(output_dir, f"{symbol}_DCF.xlsx")
+
+
+def _build_to_dir(source: Union[str, dict], output_dir: str, recalc: bool = False) -> str:
+    payload = load_payload(source)
+    return build(payload, default_output_path(payload, output_dir), recalc)
+
+
+def _fetch_dcf_data(symbol: str) -> dict:
+    # Imported in the worker so JSON-only use does not require the package
+    from defeatbeta_api.data.ticker import Ticker
+
+    return Ticker(symbol).dcf_data()
+
+
+def _build_symbol_to_dir(symbol: str, output_dir: str, recalc: bool = False) -> str:
+    payload = _fetch_dcf_data(symbol)
+    return build(payload, default_output_path(payload, output_dir), recalc)
+
+
+def build_many(sources: List[Union[str, dict]], output_dir: str, max_workers: Optional[int] = None,
+               recalc: bool = False) -> List[str]:
+    """Write one workbook per payload (dict or JSON path) from parallel worker processes."""
+    os.makedirs(output_dir, exist_ok=True)
+    n = len(sources)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_build_to_dir, sources, [output_dir] * n, [recalc] * n))
+
+
+def build_symbols(symbols: List[str], output_dir: str, max_workers: Optional[int] = None,
+                  recalc: bool = False) -> List[str]:
+    """Fetch dcf_data for each ticker and write its workbook, one worker process per ticker."""
+    os.makedirs(output_dir, exist_ok=True)
+    symbols = [s.upper() for s in symbols]
+    n = len(symbols)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_build_symbol_to_dir, symbols, [output_dir] * n, [recalc] * n))
+
+
+def build_symbols_combined(symbols: List[str], output_path: str, max_workers: Optional[int] = None,
+                           recalc: bool = False) -> str:
+    """Fetch dcf_data for each ticker in parallel and write them all as sheets of one workbook."""
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        payloads = list(executor.map(_fetch_dcf_data, [s.upper() for s in symbols]))
+    return build_workbook(payloads, output_path, recalc)
+
+
 def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("input_json", help="Path to JSON file containing MCP get_stock_dcf_analysis output.")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument(
-        "output_xlsx",
-        nargs="?",
-        default=None,
-        help="Output .xlsx path. Defaults to ./{SYMBOL}_DCF.xlsx in cwd.",
+        "inputs",
+        nargs="*",
+        help="JSON file(s) containing MCP get_stock_dcf_analysis output. With a single input, "
+             "an optional trailing .xlsx path names the output file.",
     )
+    parser.add_argument("--symbols", nargs="+", default=None,
+                        help="Tickers to fetch with defeatbeta_api instead of reading JSON files; "
+                             "works with --combined.")
+    parser.add_argument("--out-dir", default=None, help="Directory for one workbook per input. Defaults to cwd.")
+    parser.add_argument("--combined", default=None,
+                        help="Write every input as a sheet of this single .xlsx instead of one file each.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for batch builds.")
+    parser.add_argument("--recalc", action="store_true",
+                        help="Evaluate formulas in-process and store cached values in each workbook.")
     args = parser.parse_args()
 
-    with open(args.input_json, "r", encoding="utf-8") as f:
-        payload = json.load(f)
-
-    output_path = args.output_xlsx
-    if output_path is None:
-        symbol = (payload.get("symbol") or "DCF").upper()
-        output_path = os.path.join(os.getcwd(), f"{symbol}_DCF.xlsx")
+    inputs = list(args.inputs)
+    output_path = None
+    if len(inputs) == 2 and inputs[1].lower().endswith(".xlsx"):
+        output_path = inputs.pop()
+    if not inputs and not args.symbols:
+        parser.error("provide input JSON files or --symbols")
+    if args.symbols and (inputs or output_path):
+        parser.error("--symbols cannot be used together with input JSON files")
+
+    output_dir = args.out_dir or os.getcwd()
+    if args.symbols and args.combined:
+        written = [build_symbols_combined(args.symbols, args.combined, args.workers, args.recalc)]
+    elif args.symbols:
+        written = build_symbols(args.symbols, output_dir, args.workers, args.recalc)
+    elif args.combined:
+        written = [build_workbook([load_payload(path) for path in inputs], args.combined, args.recalc)]
+    elif len(inputs) == 1:
+        payload = load_payload(inputs[0])
+        written = [build(payload, output_path or default_output_path(payload, output_dir), args.recalc)]
+    else:
+        written = build_many(inputs, output_dir, args.workers, args.recalc)
 
-    written = build(payload, output_path)
-    print(written)
+    for path in written:
+        print(path)
     return 0
 
 
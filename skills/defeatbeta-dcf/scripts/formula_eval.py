@@ -0,0 +1,464 @@
+"""In-process evaluator for the Excel formula subset used by the DCF workbooks.
+
+Supports numbers, strings, booleans, cell and range references (optionally
+sheet-qualified and `$`-anchored), the operators `+ - * / ^ & % = <> < > <= >=`,
+and the functions SUM, AVERAGE, MIN, MAX, NPV, POWER, IF, ROUND and ABS.
+Excel errors such as `#DIV/0!` are values that propagate through formulas the
+same way a spreadsheet app would show them.
+
+Anything outside that subset raises `FormulaError`, so callers can leave the
+cell uncached instead of writing a wrong number.
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from openpyxl import load_workbook
+from openpyxl.utils.cell import get_column_letter, range_boundaries
+
+
+class FormulaError(Exception):
+    """Raised for syntax or functions outside the supported subset, and for circular references."""
+
+
+@dataclass(frozen=True)
+class ExcelError:
+    """An Excel error value such as ``#DIV/0!``."""
+
+    code: str
+
+    def __str__(self) -> str:
+        return self.code
+
+
+DIV0 = ExcelError("#DIV/0!")
+VALUE = ExcelError("#VALUE!")
+NUM = ExcelError("#NUM!")
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+      (?P<string>"(?:[^"]|"")*")
+    | (?P<func>[A-Za-z][A-Za-z0-9.]*)\(
+    | (?P<ref>(?:(?:'(?:[^']|'')+'|[A-Za-z_][\w.]*)!)?\$?[A-Za-z]{1,3}\$?\d+(?::\$?[A-Za-z]{1,3}\$?\d+)?)
+    | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<bool>TRUE|FALSE)\b
+    | (?P<op><>|<=|>=|[-+*/^&=<>%(),])
+    )""",
+    re.VERBOSE | re.IGNORECASE,
+)
+
+_COMPARISONS = {
+    "=": lambda a, b: a == b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    ">": lambda a, b: a > b,
+    "<=": lambda a, b: a <= b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def tokenize(formula: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    text = formula.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise FormulaError(f"Unsupported syntax at {text[pos:]!r} in {formula!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing a small tuple AST."""
+
+    def __init__(self, formula: str):
+        self.formula = formula
+        self.tokens = tokenize(formula)
+        self.pos = 0
+
+    def parse(self):
+        node = self._comparison()
+        if self.pos != len(self.tokens):
+            raise FormulaError(f"Unexpected {self.tokens[self.pos][1]!r} in {self.formula!r}")
+        return node
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take_op(self, *ops: str) -> Optional[str]:
+        token = self._peek()
+        if token is not None and token[0] == "op" and token[1] in ops:
+            self.pos += 1
+            return token[1]
+        return None
+
+    def _expect(self, op: str) -> None:
+        if self._take_op(op) is None:
+            raise FormulaError(f"Expected {op!r} in {self.formula!r}")
+
+    def _binary(self, operand: Callable, ops: Tuple[str, ...]):
+        node = operand()
+        while True:
+            op = self._take_op(*ops)
+            if op is None:
+                return node
+            node = ("binop", op, node, operand())
+
+    def _comparison(self):
+        return self._binary(self._concat, tuple(_COMPARISONS))
+
+    def _concat(self):
+        return self._binary(self._additive, ("&",))
+
+    def _additive(self):
+        return self._binary(self._term, ("+", "-"))
+
+    def _term(self):
+        return self._binary(self._power, ("*", "/"))
+
+    def _power(self):
+        return self._binary(self._unary, ("^",))
+
+    def _unary(self):
+        op = self._take_op("-", "+")
+        if op is not None:
+            return ("neg", self._unary()) if op == "-" else self._unary()
+        node = self._primary()
+        while self._take_op("%") is not None:
+            node = ("percent", node)
+        return node
+
+    def _primary(self):
+        token = self._peek()
+        if token is None:
+            raise FormulaError(f"Unexpected end of formula {self.formula!r}")
+        kind, text = token
+        self.pos += 1
+        if kind == "number":
+            return ("value", float(text))
+        if kind == "string":
+            return ("value", text[1:-1].replace('""', '"'))
+        if kind == "bool":
+            return ("value", text.upper() == "TRUE")
+        if kind == "ref":
+            return ("ref", text)
+        if kind == "func":
+            name = text.upper()
+            if name not in FUNCTIONS:
+                raise FormulaError(f"Unsupported function {name} in {self.formula!r}")
+            args = []
+            if self._take_op(")") is None:
+                args.append(self._comparison())
+                while self._take_op(",") is not None:
+                    args.append(self._comparison())
+                self._expect(")")
+            return ("call", name, args)
+        if kind == "op" and text == "(":
+            node = self._comparison()
+            self._expect(")")
+            return node
+        raise FormulaError(f"Unexpected {text!r} in {self.formula!r}")
+
+
+# ===== Value coercion =====
+def _to_number(value):
+    if isinstance(value, ExcelError):
+        return value
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return VALUE
+
+
+def _to_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _compare_key(value):
+    # Excel orders numbers < text < booleans; blanks compare as zero / empty text
+    if value is None:
+        return (0, 0.0)
+    if isinstance(value, bool):
+        return (2, value)
+    if isinstance(value, (int, float)):
+        return (0, float(value))
+    return (1, str(value).lower())
+
+
+def _finite(value: float):
+    return value if math.isfinite(value) else NUM
+
+
+def _arithmetic(op: str, left, right):
+    a, b = _to_number(left), _to_number(right)
+    if isinstance(a, ExcelError):
+        return a
+    if isinstance(b, ExcelError):
+        return b
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if op == "/":
+        return DIV0 if b == 0 else a / b
+    return _power(a, b)
+
+
+def _power(base: float, exponent: float):
+    if base == 0 and exponent < 0:
+        return DIV0
+    if base < 0 and not float(exponent).is_integer():
+        return NUM
+    try:
+        return _finite(base ** exponent)
+    except OverflowError:
+        return NUM
+
+
+def _numbers(args):
+    """Flatten arguments the way aggregate functions do: ranges skip text and blanks."""
+    values = []
+    for arg in args:
+        if isinstance(arg, list):
+            for item in arg:
+                if isinstance(item, ExcelError):
+                    return item
+                if isinstance(item, (int, float)) and not isinstance(item, bool):
+                    values.append(float(item))
+        else:
+            number = _to_number(arg)
+            if isinstance(number, ExcelError):
+                return number
+            values.append(number)
+    return values
+
+
+# ===== Functions =====
+def _fn_sum(args):
+    values = _numbers(args)
+    return values if isinstance(values, ExcelError) else sum(values)
+
+
+def _fn_average(args):
+    values = _numbers(args)
+    if isinstance(values, ExcelError):
+        return values
+    return sum(values) / len(values) if values else DIV0
+
+
+def _fn_min(args):
+    values = _numbers(args)
+    if isinstance(values, ExcelError):
+        return values
+    return min(values) if values else 0.0
+
+
+def _fn_max(args):
+    values = _numbers(args)
+    if isinstance(values, ExcelError):
+        return values
+    return max(values) if values else 0.0
+
+
+def _fn_npv(args):
+    if len(args) < 2:
+        raise FormulaError("NPV needs a rate and at least one value")
+    rate = _to_number(args[0])
+    if isinstance(rate, ExcelError):
+        return rate
+    if rate == -1:
+        return DIV0
+    values = _numbers(args[1:])
+    if isinstance(values, ExcelError):
+        return values
+    return sum(value / (1 + rate) ** i for i, value in enumerate(values, 1))
+
+
+def _fn_power(args):
+    if len(args) != 2:
+        raise FormulaError("POWER takes two arguments")
+    base, exponent = _to_number(args[0]), _to_number(args[1])
+    for value in (base, exponent):
+        if isinstance(value, ExcelError):
+            return value
+    return _power(base, exponent)
+
+
+def _fn_round(args):
+    if len(args) != 2:
+        raise FormulaError("ROUND takes two arguments")
+    number, digits = _to_number(args[0]), _to_number(args[1])
+    for value in (number, digits):
+        if isinstance(value, ExcelError):
+            return value
+    # Excel rounds halves away from zero
+    factor = 10 ** int(digits)
+    return math.copysign(math.floor(abs(number) * factor + 0.5) / factor, number)
+
+
+def _fn_abs(args):
+    if len(args) != 1:
+        raise FormulaError("ABS takes one argument")
+    number = _to_number(args[0])
+    return number if isinstance(number, ExcelError) else abs(number)
+
+
+FUNCTIONS: Dict[str, Callable] = {
+    "SUM": _fn_sum,
+    "AVERAGE": _fn_average,
+    "MIN": _fn_min,
+    "MAX": _fn_max,
+    "NPV": _fn_npv,
+    "POWER": _fn_power,
+    "ROUND": _fn_round,
+    "ABS": _fn_abs,
+    "IF": None,  # evaluated lazily so only the chosen branch is computed
+}
+
+
+class WorkbookEvaluator:
+    """Evaluates every formula cell of a workbook, memoising results per cell."""
+
+    def __init__(self, sheets: Dict[str, Dict[str, object]]):
+        # sheets: {sheet_name: {"A1": value_or_formula}}, formulas start with "="
+        self.sheets = sheets
+        self._results: Dict[Tuple[str, str], object] = {}
+        self._in_progress = set()
+        self._parsed: Dict[str, tuple] = {}
+
+    @classmethod
+    def from_file(cls, xlsx_path: str) -> "WorkbookEvaluator":
+        wb = load_workbook(xlsx_path)
+        sheets = {}
+        for ws in wb.worksheets:
+            sheets[ws.title] = {
+                cell.coordinate: cell.value
+                for row in ws.iter_rows()
+                for cell in row
+                if cell.value is not None
+            }
+        return cls(sheets)
+
+    def formula_cells(self) -> List[Tuple[str, str]]:
+        return [
+            (sheet, address)
+            for sheet, cells in self.sheets.items()
+            for address, value in cells.items()
+            if isinstance(value, str) and value.startswith("=")
+        ]
+
+    def value(self, sheet: str, address: str):
+        key = (sheet, address)
+        if key in self._results:
+            return self._results[key]
+        raw = self.sheets.get(sheet, {}).get(address)
+        if not (isinstance(raw, str) and raw.startswith("=")):
+            return raw
+        if key in self._in_progress:
+            raise FormulaError(f"Circular reference at {sheet}!{address}")
+        self._in_progress.add(key)
+        try:
+            result = self._eval(self._parse(raw[1:]), sheet)
+            if isinstance(result, list):
+                result = result[0] if len(result) == 1 else VALUE
+            if isinstance(result, float):
+                result = _finite(result)
+        finally:
+            self._in_progress.discard(key)
+        self._results[key] = result
+        return result
+
+    def _parse(self, formula: str):
+        node = self._parsed.get(formula)
+        if node is None:
+            node = _Parser(formula).parse()
+            self._parsed[formula] = node
+        return node
+
+    def _resolve(self, ref: str, sheet: str):
+        if "!" in ref:
+            sheet_part, ref = ref.rsplit("!", 1)
+            sheet = sheet_part[1:-1].replace("''", "'") if sheet_part.startswith("'") else sheet_part
+            if sheet not in self.sheets:
+                return ExcelError("#REF!")
+        ref = ref.replace("$", "").upper()
+        if ":" not in ref:
+            return self.value(sheet, ref)
+        min_col, min_row, max_col, max_row = range_boundaries(ref)
+        return [
+            self.value(sheet, f"{get_column_letter(col)}{row}")
+            for row in range(min_row, max_row + 1)
+            for col in range(min_col, max_col + 1)
+        ]
+
+    def _eval(self, node, sheet: str):
+        kind = node[0]
+        if kind == "value":
+            return node[1]
+        if kind == "ref":
+            return self._resolve(node[1], sheet)
+        if kind == "neg":
+            value = _to_number(self._scalar(node[1], sheet))
+            return value if isinstance(value, ExcelError) else -value
+        if kind == "percent":
+            value = _to_number(self._scalar(node[1], sheet))
+            return value if isinstance(value, ExcelError) else value / 100
+        if kind == "binop":
+            _, op, left_node, right_node = node
+            left, right = self._scalar(left_node, sheet), self._scalar(right_node, sheet)
+            for value in (left, right):
+                if isinstance(value, ExcelError):
+                    return value
+            if op == "&":
+                return _to_text(left) + _to_text(right)
+            if op in _COMPARISONS:
+                return _COMPARISONS[op](_compare_key(left), _compare_key(right))
+            return _arithmetic(op, left, right)
+        if kind == "call":
+            _, name, arg_nodes = node
+            if name == "IF":
+                return self._if(arg_nodes, sheet)
+            return FUNCTIONS[name]([self._eval(arg, sheet) for arg in arg_nodes])
+        raise FormulaError(f"Unknown node {kind}")
+
+    def _scalar(self, node, sheet: str):
+        value = self._eval(node, sheet)
+        if isinstance(value, list):
+            return value[0] if len(value) == 1 else VALUE
+        return value
+
+    def _if(self, arg_nodes, sheet: str):
+        if not 1 <= len(arg_nodes) <= 3:
+            raise FormulaError("IF takes one to three arguments")
+        condition = self._scalar(arg_nodes[0], sheet)
+        if isinstance(condition, ExcelError):
+            return condition
+        if isinstance(condition, str):
+            upper = condition.upper()
+            if upper not in ("TRUE", "FALSE"):
+                return VALUE
+            condition = upper == "TRUE"
+        truthy = bool(_to_number(condition))
+        if truthy:
+            return self._scalar(arg_nodes[1], sheet) if len(arg_nodes) > 1 else True
+        return self._scalar(arg_nodes[2], sheet) if len(arg_nodes) > 2 else False
@@ -1,23 +1,36 @@
-"""Recalculate formula cells in an .xlsx via LibreOffice headless.
+"""Fill cached values for formula cells in an .xlsx.
 
 openpyxl writes formula strings but does not evaluate them, so previewers
 that rely on cached values (including Claude's file preview) show blanks
-until the workbook is opened in a real spreadsheet app. This script
-re-opens the file under `libreoffice --headless --calc`, lets it evaluate
-every formula, and writes the cached values back into the same file.
+until the workbook is opened in a real spreadsheet app.
 
-If LibreOffice is not installed, prints a warning and exits 0 — the
-workbook is still valid for Excel / Numbers / WPS users who will get
+By default this script evaluates every formula in-process with
+`formula_eval` (the arithmetic, SUM/AVERAGE/MIN/MAX, NPV/POWER, IF,
+ROUND/ABS subset the DCF workbooks use) and writes the results straight
+into the cell XML, keeping the formulas. No external program is needed.
+
+`--engine libreoffice` instead re-opens the file under
+`libreoffice --headless --calc` and lets it write the cached values. If
+LibreOffice is not installed, that engine prints a warning and exits 0 —
+the workbook is still valid for Excel / Numbers / WPS users who will get
 on-open recalc for free.
 """
 from __future__ import annotations
 
 import argparse
 import os
+import posixpath
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import zipfile
+from typing import Dict, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from formula_eval import ExcelError, FormulaError, WorkbookEvaluator
 
 
 LIBREOFFICE_BINARIES = (
@@ -26,6 +39,18 @@ LIBREOFFICE_BINARIES = (
     "/Applications/LibreOffice.app/Contents/MacOS/soffice",
 )
 
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# A formula cell as written by openpyxl: <c r="C4" s="5"><f>...</f><v /></c>
+_FORMULA_CELL = re.compile(
+    r'<c r="(?P<ref>[A-Z]+[0-9]+)"(?P<attrs>[^>]*)>'
+    r'(?P<formula><f(?:\s[^>]*)?(?:/>|>[^<]*</f>))'
+    r'(?:<v\s*/>|<v>[^<]*</v>)?</c>'
+)
+_TYPE_ATTR = re.compile(r'\st="[^"]*"')
+
 
 def find_libreoffice() -> str | None:
     for candidate in LIBREOFFICE_BINARIES:
@@ -40,11 +65,85 @@ def find_libreoffice() -> str | None:
     return None
 
 
-def recalc(xlsx_path: str) -> int:
-    if not os.path.isfile(xlsx_path):
-        print(f"error: {xlsx_path} does not exist", file=sys.stderr)
-        return 1
+def _sheet_paths(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Map each sheet name to its worksheet XML path inside the archive."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{_PKG_REL_NS}Relationship")}
+    paths = {}
+    for sheet in workbook.iter(f"{_MAIN_NS}sheet"):
+        target = targets.get(sheet.get(_REL_ID))
+        if target is None:
+            continue
+        paths[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else posixpath.normpath(
+            posixpath.join("xl", target))
+    return paths
+
+
+def _cached_value(value) -> Tuple[str | None, str] | None:
+    """(cell type attribute, <v> text) for a computed value, or None to leave the cell uncached."""
+    if isinstance(value, ExcelError):
+        return "e", value.code
+    if isinstance(value, bool):
+        return "b", "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return None, repr(float(value))
+    if isinstance(value, str):
+        return "str", escape(value)
+    return None
 
+
+def recalc_in_process(xlsx_path: str) -> Tuple[int, int]:
+    """Evaluate formulas with formula_eval and write cached values into *xlsx_path*.
+
+    Returns (cells written, cells left uncached because they use unsupported syntax).
+    """
+    evaluator = WorkbookEvaluator.from_file(xlsx_path)
+    values: Dict[str, Dict[str, object]] = {}
+    skipped = 0
+    for sheet, address in evaluator.formula_cells():
+        try:
+            values.setdefault(sheet, {})[address] = evaluator.value(sheet, address)
+        except FormulaError:
+            skipped += 1
+
+    written = 0
+
+    def replace(match: re.Match, sheet_values: Dict[str, object]) -> str:
+        nonlocal written
+        cached = _cached_value(sheet_values.get(match.group("ref")))
+        if cached is None:
+            return match.group(0)
+        cell_type, text = cached
+        attrs = _TYPE_ATTR.sub("", match.group("attrs"))
+        if cell_type is not None:
+            attrs += f' t="{cell_type}"'
+        written += 1
+        return f'<c r="{match.group("ref")}"{attrs}>{match.group("formula")}<v>{text}</v></c>'
+
+    fd, tmp_path = tempfile.mkstemp(prefix="dcf_recalc_", suffix=".xlsx", dir=os.path.dirname(os.path.abspath(xlsx_path)))
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(xlsx_path) as src, zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as dst:
+            sheet_for_path = {path: name for name, path in _sheet_paths(src).items()}
+            for item in src.infolist():
+                data = src.read(item.filename)
+                sheet = sheet_for_path.get(item.filename)
+                if sheet in values:
+                    xml = data.decode("utf-8")
+                    xml = _FORMULA_CELL.sub(lambda m: replace(m, values[sheet]), xml)
+                    data = xml.encode("utf-8")
+                dst.writestr(item, data)
+        # mkstemp creates the file owner-only; keep the workbook's own permissions
+        shutil.copymode(xlsx_path, tmp_path)
+        os.replace(tmp_path, xlsx_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return written, skipped
+
+
+def recalc_libreoffice(xlsx_path: str) -> int:
     binary = find_libreoffice()
     if binary is None:
         print(
@@ -56,7 +155,6 @@ def recalc(xlsx_path: str) -> int:
         return 0
 
     xlsx_path = os.path.abspath(xlsx_path)
-    out_dir = os.path.dirname(xlsx_path)
     target_name = os.path.basename(xlsx_path)
 
     # LibreOffice won't overwrite the source file when output dir equals
@@ -105,11 +203,34 @@ def recalc(xlsx_path: str) -> int:
     return 0
 
 
+def recalc(xlsx_path: str, engine: str = "python") -> int:
+    if not os.path.isfile(xlsx_path):
+        print(f"error: {xlsx_path} does not exist", file=sys.stderr)
+        return 1
+
+    if engine == "libreoffice":
+        return recalc_libreoffice(xlsx_path)
+
+    _, skipped = recalc_in_process(xlsx_path)
+    if skipped:
+        print(
+            f"warning: {skipped} formula cell(s) use syntax the in-process evaluator does not support "
+            "and were left uncached; rerun with --engine libreoffice to fill them.",
+            file=sys.stderr,
+        )
+    return 0
+
+
 def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("xlsx_path", help="Path to the .xlsx file to recalculate.")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("xlsx_path", nargs="+", help="Path(s) to the .xlsx file(s) to recalculate.")
+    parser.add_argument("--engine", choices=("python", "libreoffice"), default="python",
+                        help="Evaluate in-process (default) or through headless LibreOffice.")
     args = parser.parse_args()
-    return recalc(args.xlsx_path)
+    status = 0
+    for path in args.xlsx_path:
+        status = recalc(path, args.engine) or status
+    return status
 
 
 if __name__ == "__main__":
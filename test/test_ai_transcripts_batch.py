@@ -0,0 +1,114 @@
+import json
+import logging
+import threading
+import unittest
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from defeatbeta_api.client.openai_conf import OpenAIConfiguration
+from defeatbeta_api.data.ticker import Ticker
+from openai import OpenAI
+
+KEY_FINANCIAL_DATA = {
+    "key_financial_data": {
+        "total_revenue_for_this_quarter": {
+            "value_vocabulary": "7.7", "unit": "billion", "currency_code": "USD",
+            "speaker": "CFO", "paragraph_number": 3
+        },
+        "gaap_gross_margin_for_this_quarter": None
+    }
+}
+
+
+class StandInLLM(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat completions endpoint that always calls the summary tool.
+
+    Setting ``fail_next`` makes the next request answer 500, to exercise the retry path.
+    """
+    requests = 0
+    fail_next = False
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with StandInLLM.lock:
+            StandInLLM.requests += 1
+            fail, StandInLLM.fail_next = StandInLLM.fail_next, False
+        if fail:
+            self._reply(500, {"error": {"message": "warming up", "type": "server_error"}})
+            return
+        self._reply(200, {
+            "id": "chatcmpl-stand-in",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "tool_calls",
+                "message": {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [{
+                        "id": "call_0",
+                        "type": "function",
+                        "function": {"name": "extract_key_financial_data",
+                                     "arguments": json.dumps(KEY_FINANCIAL_DATA)}
+                    }]
+                }
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+        })
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAITranscriptsBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ticker = Ticker("META", log_level=logging.DEBUG)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInLLM)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.llm = OpenAI(api_key="stand-in", base_url=f"http://127.0.0.1:{cls.server.server_port}/v1", max_retries=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def test_analyze_with_ai(self):
+        transcripts = self.ticker.earning_call_transcripts()
+        periods = [(2025, 1), (2025, 2), (2025, 3)]
+        # A fresh model name keeps earlier runs out of the response cache
+        config = OpenAIConfiguration(model=f"stand-in-{uuid.uuid4().hex}", temperature=0)
+        before = StandInLLM.requests
+        StandInLLM.fail_next = True
+
+        res = transcripts.analyze_with_ai("summary", self.llm, periods=periods, config=config,
+                                          concurrency=3, backoff=0.01)
+        print(res.to_string())
+        self.assertEqual(sorted(set(zip(res["fiscal_year"], res["fiscal_quarter"]))), periods)
+        revenue = res[res["key_financial_metric"] == "total_revenue"]
+        self.assertTrue((revenue["value"] == 7.7e9).all())
+        self.assertEqual(StandInLLM.requests - before, len(periods) + 1)
+
+        cached = transcripts.analyze_with_ai("summary", self.llm, periods=periods, config=config)
+        self.assertEqual(StandInLLM.requests - before, len(periods) + 1)
+        self.assertTrue(cached.equals(res))
+
+    def test_chunked_summary(self):
+        transcripts = self.ticker.earning_call_transcripts()
+        before = StandInLLM.requests
+        # Leaves a few thousand tokens per chunk next to the prompt template and tool schema
+        config = OpenAIConfiguration(model="stand-in", max_prompt_tokens=14000, compact_json=True)
+        res = transcripts.summarize_key_financial_data_with_ai(2025, 2, self.llm, config)
+        print(res.to_string())
+        self.assertGreater(StandInLLM.requests - before, 1)
+        self.assertEqual(res["key_financial_metric"].tolist(), ["total_revenue", "gaap_gross_margin"])
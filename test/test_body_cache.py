@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import duckdb
+
+from defeatbeta_api.data.body_cache import BodyCache
+
+# Every body query contains this, so the fake client can count them
+BODY_MARKER = "repeat(md5("
+
+class CountingDuckDBClient:
+    """In-memory DuckDB standing in for DuckDBClient, counting how often a body query is run."""
+
+    def __init__(self):
+        self.connection = duckdb.connect()
+        self.copies = 0
+
+    def query(self, sql):
+        return self.connection.sql(sql).df()
+
+    def execute(self, sql):
+        if BODY_MARKER in sql:
+            self.copies += 1
+        self.connection.execute(sql)
+
+
+def body_sql(key):
+    # Same shape and size for every key, so each cached file takes about the same space
+    return f"SELECT '{key}' AS uuid, {BODY_MARKER}'{key}'), 64) AS body"
+
+
+@patch("defeatbeta_api.data.body_cache.get_cached_data_update_time", lambda: "2026-01-01 00:00:00")
+class TestBodyCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+        self.client = CountingDuckDBClient()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def file_size(self):
+        probe = BodyCache(tempfile.mkdtemp(dir=self.directory))
+        probe.fetch(self.client, body_sql("k0"), "news", "k0")
+        self.client.copies = 0
+        return os.path.getsize(probe.path("news", "k0"))
+
+    def test_hit_does_not_query_again(self):
+        cache = BodyCache(self.directory)
+        first = cache.fetch(self.client, body_sql("a"), "news", "a")
+        second = cache.fetch(self.client, body_sql("a"), "news", "a")
+        self.assertEqual(self.client.copies, 1)
+        self.assertTrue(first.equals(second))
+        self.assertEqual(second["uuid"].tolist(), ["a"])
+
+        # Another instance (e.g. another process) reads the same file without querying
+        BodyCache(self.directory).fetch(self.client, body_sql("a"), "news", "a")
+        self.assertEqual(self.client.copies, 1)
+
+    def test_keys_and_update_time_separate_entries(self):
+        cache = BodyCache(self.directory)
+        cache.fetch(self.client, body_sql("a"), "news", "a")
+        cache.fetch(self.client, body_sql("b"), "news", "b")
+        self.assertEqual(self.client.copies, 2)
+        with patch("defeatbeta_api.data.body_cache.get_cached_data_update_time", lambda: "2026-02-01 00:00:00"):
+            cache.fetch(self.client, body_sql("a"), "news", "a")
+        self.assertEqual(self.client.copies, 3)
+
+    def test_least_recently_read_is_evicted_first(self):
+        size = self.file_size()
+        cache = BodyCache(self.directory, max_bytes=int(size * 2.5))
+        cache.fetch(self.client, body_sql("a"), "news", "a")
+        cache.fetch(self.client, body_sql("b"), "news", "b")
+        # Reading "a" again makes "b" the least recently used entry
+        cache.fetch(self.client, body_sql("a"), "news", "a")
+        cache.fetch(self.client, body_sql("c"), "news", "c")
+
+        self.assertTrue(os.path.exists(cache.path("news", "a")))
+        self.assertFalse(os.path.exists(cache.path("news", "b")))
+        self.assertTrue(os.path.exists(cache.path("news", "c")))
+        self.assertEqual(self.client.copies, 3)
+
+        # An evicted body is fetched again on the next read
+        cache.fetch(self.client, body_sql("b"), "news", "b")
+        self.assertEqual(self.client.copies, 4)
+        self.assertFalse(os.path.exists(cache.path("news", "a")))
+
+    def test_new_instance_orders_entries_by_mtime(self):
+        size = self.file_size()
+        writer = BodyCache(self.directory)
+        for key in ("a", "b"):
+            writer.fetch(self.client, body_sql(key), "news", key)
+        # "b" was read long ago by another process, "a" recently
+        os.utime(writer.path("news", "b"), (1_000_000, 1_000_000))
+        os.utime(writer.path("news", "a"), (2_000_000, 2_000_000))
+
+        cache = BodyCache(self.directory, max_bytes=int(size * 2.5))
+        cache.fetch(self.client, body_sql("c"), "news", "c")
+        self.assertTrue(os.path.exists(cache.path("news", "a")))
+        self.assertFalse(os.path.exists(cache.path("news", "b")))
+
+    def test_corrupt_file_is_dropped_and_fetched_again(self):
+        cache = BodyCache(self.directory)
+        cache.fetch(self.client, body_sql("a"), "news", "a")
+        with open(cache.path("news", "a"), "wb") as f:
+            f.write(b"not a parquet file")
+
+        record = cache.fetch(self.client, body_sql("a"), "news", "a")
+        self.assertEqual(record["uuid"].tolist(), ["a"])
+        self.assertEqual(self.client.copies, 2)
+        # The replacement is a readable cache entry again
+        cache.fetch(self.client, body_sql("a"), "news", "a")
+        self.assertEqual(self.client.copies, 2)
+
+    def test_fetch_many_reads_only_missing_keys(self):
+        cache = BodyCache(self.directory)
+        cache.fetch(self.client, body_sql("a"), "news_article", "a")
+        requested = []
+
+        def batch_sql(keys):
+            requested.append(keys)
+            return " UNION ALL ".join(body_sql(key) for key in keys)
+
+        result = cache.fetch_many(self.client, batch_sql, "news_article", "uuid", ["a", "b", "c", "b"])
+        self.assertEqual(requested, [["b", "c"]])
+        self.assertEqual(sorted(result["uuid"]), ["a", "b", "c"])
+
+        # Every key now has its own entry, shared with single fetches
+        result = cache.fetch_many(self.client, batch_sql, "news_article", "uuid", ["c", "b"])
+        self.assertEqual(len(requested), 1)
+        self.assertEqual(sorted(result["uuid"]), ["b", "c"])
+        copies = self.client.copies
+        cache.fetch(self.client, body_sql("b"), "news_article", "b")
+        self.assertEqual(self.client.copies, copies)
+
+    def test_fetch_many_scope_and_unreturned_keys(self):
+        cache = BodyCache(self.directory)
+        requested = []
+
+        def batch_sql(keys):
+            requested.append(keys)
+            # "x" belongs to another scope: the query finds no row for it
+            return " UNION ALL ".join(body_sql(key) + (" WHERE false" if key == "x" else "") for key in keys)
+
+        result = cache.fetch_many(self.client, batch_sql, "news", "uuid", ["a", "x"], ("NVDA",))
+        self.assertEqual(result["uuid"].tolist(), ["a"])
+        self.assertTrue(os.path.exists(cache.path("news", "NVDA", "a")))
+        self.assertFalse(os.path.exists(cache.path("news", "NVDA", "x")))
+        self.assertFalse(os.path.exists(cache.path("news", "a")))
+
+        # The unreturned key is asked for again rather than served as an empty hit
+        cache.fetch_many(self.client, batch_sql, "news", "uuid", ["a", "x"], ("NVDA",))
+        self.assertEqual(requested, [["a", "x"], ["x"]])
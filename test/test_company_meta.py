@@ -31,3 +31,13 @@ class TestCompanyMeta(unittest.TestCase):
         self.assertIn("cik", result[0])
         self.assertIn("name", result[0])
         self.assertIn("financial_currency", result[0])
+
+    def test_get_company_info_unknown_symbol(self):
+        self.assertIsNone(self.company_meta.get_company_info("NOT_A_REAL_TICKER"))
+
+    def test_currencies(self):
+        result = self.company_meta.currencies(["AAPL", "BABA", "NOT_A_REAL_TICKER"])
+        print(f"Currencies: {result}")
+        self.assertEqual(result["AAPL"], "USD")
+        self.assertEqual(result["NOT_A_REAL_TICKER"], "USD")
+        self.assertEqual(result["BABA"], self.company_meta.currency("BABA"))
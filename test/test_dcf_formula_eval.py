@@ -0,0 +1,218 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DCF_SCRIPTS = REPO_ROOT / "skills" / "defeatbeta-dcf" / "scripts"
+
+# recalc.py imports formula_eval as a top-level module, the way the skill runs it
+sys.path.insert(0, str(DCF_SCRIPTS))
+
+from formula_eval import DIV0, ExcelError, FormulaError, NUM, VALUE, WorkbookEvaluator  # noqa: E402
+from recalc import recalc_in_process  # noqa: E402
+
+
+def evaluate(formula, **cells):
+    """Value of *formula* on a one-sheet workbook holding *cells* (e.g. A1=2)."""
+    sheet = dict(cells)
+    sheet["Z99"] = "=" + formula
+    return WorkbookEvaluator({"Sheet1": sheet}).value("Sheet1", "Z99")
+
+
+class TestFormulaOperators(unittest.TestCase):
+
+    def test_precedence(self):
+        self.assertEqual(evaluate("1+2*3"), 7)
+        self.assertEqual(evaluate("(1+2)*3"), 9)
+        self.assertEqual(evaluate("2*3^2"), 18)
+        self.assertEqual(evaluate("2^3^2"), 64)  # Excel's ^ is left-associative
+        self.assertEqual(evaluate("10-4-3"), 3)
+        self.assertEqual(evaluate("12/3/2"), 2)
+        self.assertEqual(evaluate("1+2&3"), "33")
+        self.assertIs(evaluate("1+1=2"), True)
+        self.assertIs(evaluate("2*3<>6"), False)
+
+    def test_unary_minus_and_percent(self):
+        self.assertEqual(evaluate("-2^2"), 4)  # negation binds tighter than ^, as in Excel
+        self.assertEqual(evaluate("--3"), 3)
+        self.assertEqual(evaluate("+5-+2"), 3)
+        self.assertAlmostEqual(evaluate("50%"), 0.5)
+        self.assertAlmostEqual(evaluate("-50%*4"), -2)
+        self.assertAlmostEqual(evaluate("200%%"), 0.02)
+        self.assertAlmostEqual(evaluate("A1%", A1=25), 0.25)
+
+    def test_comparisons_and_text(self):
+        self.assertIs(evaluate("3>=3"), True)
+        self.assertIs(evaluate('"b">"A"'), True)
+        self.assertIs(evaluate('1<"a"'), True)  # numbers sort before text
+        self.assertIs(evaluate("TRUE>1"), True)  # booleans sort after numbers
+        self.assertEqual(evaluate('"say ""hi"""&"!"'), 'say "hi"!')
+        self.assertEqual(evaluate('"n="&2.5&"/"&4'), "n=2.5/4")
+
+    def test_unsupported_syntax(self):
+        with self.assertRaises(FormulaError):
+            evaluate("VLOOKUP(1,A1:B2,2)")
+        with self.assertRaises(FormulaError):
+            evaluate("1+")
+        with self.assertRaises(FormulaError):
+            evaluate("(1+2")
+        with self.assertRaises(FormulaError):
+            evaluate("1 # 2")
+
+
+class TestFormulaReferences(unittest.TestCase):
+
+    def setUp(self):
+        self.evaluator = WorkbookEvaluator({
+            "Inputs": {"A1": 100, "A2": 0.1, "A3": "=A1*(1+A2)", "B1": 1, "B2": 2, "B3": "text", "C1": 3},
+            "Cash Flow": {"A1": 10, "A2": 20, "A3": "=SUM(A1:A2)"},
+            "DCF": {
+                "A1": "=Inputs!A3",
+                "A2": "=$A$1*2",
+                "A3": "='Cash Flow'!A3+Inputs!$C$1",
+                "A4": "=SUM(Inputs!B1:C3)",
+                "A5": "=Missing!A1",
+                "A6": "=A7",
+                "A7": "=A6",
+                "A8": "=Inputs!B1:B2",
+                "A9": "=Inputs!D9+1",
+            },
+        })
+
+    def test_cell_and_range_references_across_sheets(self):
+        self.assertAlmostEqual(self.evaluator.value("DCF", "A1"), 110)
+        self.assertAlmostEqual(self.evaluator.value("DCF", "A2"), 220)
+        self.assertEqual(self.evaluator.value("DCF", "A3"), 33)
+        # Ranges skip text and blanks
+        self.assertEqual(self.evaluator.value("DCF", "A4"), 6)
+        # Blank cells read as zero in arithmetic
+        self.assertEqual(self.evaluator.value("DCF", "A9"), 1)
+
+    def test_missing_sheet_is_ref_error(self):
+        self.assertEqual(self.evaluator.value("DCF", "A5"), ExcelError("#REF!"))
+
+    def test_multi_cell_range_as_scalar_is_value_error(self):
+        self.assertEqual(self.evaluator.value("DCF", "A8"), VALUE)
+
+    def test_circular_reference(self):
+        with self.assertRaises(FormulaError):
+            self.evaluator.value("DCF", "A6")
+
+    def test_formula_cells(self):
+        cells = self.evaluator.formula_cells()
+        self.assertIn(("Inputs", "A3"), cells)
+        self.assertIn(("DCF", "A9"), cells)
+        self.assertNotIn(("Inputs", "A1"), cells)
+
+
+class TestFormulaFunctions(unittest.TestCase):
+    CELLS = {"A1": 1, "A2": 2, "A3": 3, "A4": "x", "B1": 0}
+
+    def test_aggregates(self):
+        self.assertEqual(evaluate("SUM(A1:A4, 4)", **self.CELLS), 10)
+        self.assertEqual(evaluate("AVERAGE(A1:A4)", **self.CELLS), 2)
+        self.assertEqual(evaluate("MIN(A1:A3, -1)", **self.CELLS), -1)
+        self.assertEqual(evaluate("MAX(A1:A3)", **self.CELLS), 3)
+        self.assertEqual(evaluate("MIN(A4:A4)", **self.CELLS), 0)
+        self.assertEqual(evaluate("AVERAGE(A4:A4)", **self.CELLS), DIV0)
+        self.assertEqual(evaluate('SUM("x")'), VALUE)
+
+    def test_npv(self):
+        self.assertAlmostEqual(evaluate("NPV(0.1, 110, 121)"), 200)
+        self.assertAlmostEqual(evaluate("NPV(0.1, A1:A3)", **self.CELLS), 1 / 1.1 + 2 / 1.21 + 3 / 1.331)
+        self.assertEqual(evaluate("NPV(-1, 1)"), DIV0)
+        with self.assertRaises(FormulaError):
+            evaluate("NPV(0.1)")
+
+    def test_power(self):
+        self.assertEqual(evaluate("POWER(2, 10)"), 1024)
+        self.assertAlmostEqual(evaluate("POWER(1.1, 0.5)"), 1.1 ** 0.5)
+        self.assertEqual(evaluate("POWER(0, -1)"), DIV0)
+        self.assertEqual(evaluate("POWER(-8, 1/3)"), NUM)
+        self.assertEqual(evaluate("10^400"), NUM)
+
+    def test_if(self):
+        self.assertEqual(evaluate('IF(A1>0, "up", "down")', **self.CELLS), "up")
+        self.assertEqual(evaluate("IF(B1, 1, 2)", **self.CELLS), 2)
+        self.assertIs(evaluate("IF(FALSE, 1)"), False)
+        self.assertIs(evaluate("IF(1)"), True)
+        self.assertEqual(evaluate('IF("TRUE", 1, 2)'), 1)
+        self.assertEqual(evaluate('IF("maybe", 1, 2)'), VALUE)
+        # Only the chosen branch is evaluated, so an error in the other one does not leak
+        self.assertEqual(evaluate("IF(B1=0, 0, 1/B1)", **self.CELLS), 0)
+
+    def test_round_and_abs(self):
+        self.assertEqual(evaluate("ROUND(2.5, 0)"), 3)
+        self.assertEqual(evaluate("ROUND(-2.5, 0)"), -3)  # halves round away from zero
+        self.assertAlmostEqual(evaluate("ROUND(1.2345, 2)"), 1.23)
+        self.assertEqual(evaluate("ROUND(1234, -2)"), 1200)
+        self.assertEqual(evaluate("ABS(-4.5)"), 4.5)
+        with self.assertRaises(FormulaError):
+            evaluate("ABS(1, 2)")
+
+
+class TestFormulaErrors(unittest.TestCase):
+
+    def test_div0_propagates(self):
+        cells = {"A1": 1, "B1": 0, "C1": "=A1/B1"}
+        evaluator = WorkbookEvaluator({"S": dict(cells, D1="=C1+1", D2="=SUM(C1, 1)", D3="=-C1", D4='=C1&"x"',
+                                             D5="=C1>0", D6="=IF(C1, 1, 2)", D7="=ROUND(C1, 2)")})
+        for address in ("C1", "D1", "D2", "D3", "D4", "D5", "D6", "D7"):
+            self.assertEqual(evaluator.value("S", address), DIV0, address)
+
+    def test_ref_propagates(self):
+        evaluator = WorkbookEvaluator({"S": {"A1": "=Gone!A1", "A2": "=A1*2", "A3": "=NPV(0.1, A1)",
+                                             "A4": "=AVERAGE(A1, 1)"}})
+        for address in ("A1", "A2", "A3", "A4"):
+            self.assertEqual(evaluator.value("S", address), ExcelError("#REF!"), address)
+
+    def test_text_in_arithmetic_is_value_error(self):
+        self.assertEqual(evaluate('"abc"*2'), VALUE)
+        self.assertEqual(evaluate('"3"*2'), 6)
+
+
+class TestRecalcInProcess(unittest.TestCase):
+
+    def test_writes_cached_values(self):
+        wb = Workbook()
+        inputs = wb.active
+        inputs.title = "Inputs"
+        inputs["A1"] = 100
+        inputs["A2"] = 0.1
+        inputs["A3"] = "=A1*(1+A2)"
+        inputs["A4"] = '="Growth "&A2*100&"%"'
+        dcf = wb.create_sheet("DCF Model")
+        dcf["A1"] = "=NPV(Inputs!A2, 110, 121)"
+        dcf["A2"] = "=Inputs!A3>100"
+        dcf["A3"] = "=1/0"
+        dcf["A4"] = "=ROUND(SUM(A1, Inputs!A1:A3), 1)"
+        dcf["A5"] = "=VLOOKUP(1, Inputs!A1:A3, 1)"
+        dcf["B1"] = "='DCF Model'!A1/2"
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "dcf.xlsx")
+            wb.save(path)
+            os.chmod(path, 0o644)
+            written, skipped = recalc_in_process(path)
+            self.assertEqual((written, skipped), (7, 1))
+            # The rewritten file keeps the workbook's permissions
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o644)
+
+            cached = load_workbook(path, data_only=True)
+            self.assertAlmostEqual(cached["Inputs"]["A3"].value, 110)
+            self.assertEqual(cached["Inputs"]["A4"].value, "Growth 10%")
+            self.assertAlmostEqual(cached["DCF Model"]["A1"].value, 200)
+            self.assertIs(cached["DCF Model"]["A2"].value, True)
+            self.assertEqual(cached["DCF Model"]["A3"].value, "#DIV/0!")
+            self.assertAlmostEqual(cached["DCF Model"]["A4"].value, 410.1)
+            self.assertIsNone(cached["DCF Model"]["A5"].value)
+            self.assertAlmostEqual(cached["DCF Model"]["B1"].value, 100)
+
+            # The formulas themselves are kept
+            formulas = load_workbook(path)
+            self.assertEqual(formulas["DCF Model"]["A1"].value, "=NPV(Inputs!A2, 110, 121)")
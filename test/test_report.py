@@ -1,8 +1,153 @@
 import logging
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
 
 from defeatbeta_api.data.ticker import Ticker
 import defeatbeta_api.reports.tearsheet as tearsheet
+from defeatbeta_api.reports.tearsheet import render_figure
+
+
+def fake_inputs(ticker):
+    """Small but complete TEARSHEET_INPUTS for *ticker*, failing for the symbol 'BAD'."""
+    if ticker.ticker == "BAD":
+        raise RuntimeError("no data for BAD")
+    dates = pd.date_range("2022-03-31", periods=12, freq="QE")
+    steps = np.linspace(0.1, 0.3, len(dates))
+    inputs = {
+        'info': pd.DataFrame([{'symbol': ticker.ticker, 'sector': 'Technology', 'industry': 'Software',
+                               'web_site': 'https://example.com', 'city': 'San Jose', 'country': 'US',
+                               'address': '1 Main St'}]),
+        'ttm_pe': pd.DataFrame({'report_date': dates, 'ttm_pe': 20 + 10 * steps}),
+        'industry_ttm_pe': pd.DataFrame({'report_date': dates, 'industry_pe': 25 + 5 * steps}),
+    }
+    for metric in ('gross_margin', 'ebitda_margin', 'net_margin'):
+        inputs[f'quarterly_{metric}'] = pd.DataFrame({'report_date': dates, metric: steps})
+        inputs[f'industry_quarterly_{metric}'] = pd.DataFrame(
+            {'report_date': dates, 'industry': 'Software', f'industry_{metric}': steps / 2})
+    for name, column in (('revenue', 'revenue'), ('ebitda', 'ebitda'),
+                         ('net_income', 'net_income_common_stockholders'), ('eps', 'eps')):
+        inputs[f'quarterly_{name}_yoy_growth'] = pd.DataFrame({
+            'report_date': dates, column: 1e9 * (1 + steps), f'prev_year_{column}': 1e9 * np.ones(len(dates)),
+            'yoy_growth': steps})
+    return inputs
+
+
+def stand_in_ticker(symbol):
+    # fetch_inputs is mocked, so only the symbol is ever read from the ticker
+    ticker = Ticker.__new__(Ticker)
+    ticker.ticker = symbol
+    return ticker
+
+
+@patch("defeatbeta_api.reports.tearsheet.get_cached_data_update_time", lambda: "2026-01-01")
+@patch("defeatbeta_api.reports.tearsheet.fetch_inputs", fake_inputs)
+class TestTearsheetBatch(unittest.TestCase):
+
+    def test_failing_symbol_is_skipped(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            tickers = [stand_in_ticker(symbol) for symbol in ("ADBE", "BAD", "NVDA")]
+            with self.assertLogs(tearsheet.logger, logging.WARNING) as logs:
+                written = tearsheet.batch(tickers, out_dir=out_dir, max_workers=2, processes=1, cache=False)
+
+            self.assertEqual(list(written), ["ADBE", "NVDA"])
+            self.assertEqual(written["ADBE"], os.path.join(out_dir, "ADBE.html"))
+            self.assertEqual(sorted(os.listdir(out_dir)), ["ADBE.html", "NVDA.html"])
+            for symbol, path in written.items():
+                with open(path, encoding="utf-8") as f:
+                    report = f.read()
+                self.assertIn(symbol, report)
+                self.assertIn("<svg", report)
+                self.assertNotIn("{{", report)
+            self.assertIn("BAD", "".join(logs.output))
+
+
+@patch("defeatbeta_api.reports.tearsheet.get_cached_data_update_time", lambda: "2026-01-01")
+@patch("defeatbeta_api.reports.tearsheet.fetch_inputs", fake_inputs)
+class TestFigureCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.rendered = []
+
+        def counting_render(figure):
+            self.rendered.append(figure)
+            return render_figure(figure)
+
+        patches = [
+            patch("defeatbeta_api.reports.tearsheet.validate_figure_cache_directory", lambda: self.tmpdir.name),
+            patch("defeatbeta_api.reports.tearsheet.render_figure", counting_render),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+        self.ticker = stand_in_ticker("ADBE")
+
+    def cached_files(self):
+        directory = os.path.join(self.tmpdir.name, "ADBE")
+        return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+    def test_second_render_reads_every_chart_from_cache(self):
+        first = tearsheet.render(self.ticker)
+        charts = len(self.rendered)
+        self.assertEqual(charts, 8)
+        self.assertEqual(len(self.cached_files()), charts)
+
+        second = tearsheet.render(self.ticker)
+        self.assertEqual(len(self.rendered), charts)
+        self.assertEqual(second, first)
+
+    def test_changed_data_replaces_stale_chart(self):
+        tearsheet.render(self.ticker)
+        before = self.cached_files()
+        self.rendered.clear()
+
+        def changed_inputs(ticker):
+            inputs = fake_inputs(ticker)
+            inputs['quarterly_revenue_yoy_growth']['yoy_growth'] *= 2
+            return inputs
+
+        with patch("defeatbeta_api.reports.tearsheet.fetch_inputs", changed_inputs):
+            tearsheet.render(self.ticker)
+        after = self.cached_files()
+
+        # Only the revenue chart is rendered again, under a new digest, and its old file is gone
+        self.assertEqual(len(self.rendered), 1)
+        self.assertEqual(self.rendered[0].kwargs['title'], 'Quarterly Revenue YoY Growth')
+        self.assertEqual(len(after), len(before))
+        replaced = sorted(set(before) - set(after))
+        added = sorted(set(after) - set(before))
+        self.assertEqual(len(replaced), 1)
+        self.assertEqual(len(added), 1)
+        self.assertTrue(replaced[0].startswith("quarterly_revenue_yoy_growth-"))
+        self.assertTrue(added[0].startswith("quarterly_revenue_yoy_growth-"))
+
+    def test_digest_follows_series_data(self):
+        growth = fake_inputs(self.ticker)['quarterly_revenue_yoy_growth']
+        figure = tearsheet.growth_section(growth, 'revenue', 'Revenue')['quarterly_revenue_yoy_growth']
+        same = tearsheet.Figure(figure.plot, dict(figure.kwargs, series_y=figure.kwargs['series_y'].copy()))
+        changed = tearsheet.Figure(figure.plot, dict(figure.kwargs, series_y=figure.kwargs['series_y'] + 0.01))
+        self.assertEqual(tearsheet.figure_digest(same), tearsheet.figure_digest(figure))
+        self.assertNotEqual(tearsheet.figure_digest(changed), tearsheet.figure_digest(figure))
+
+    def test_cache_disabled_skips_directory(self):
+        tearsheet.render(self.ticker, cache=False)
+        tearsheet.render(self.ticker, cache=False)
+        self.assertEqual(len(self.rendered), 16)
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+
+class TestTearsheetLive(unittest.TestCase):
 
-ticker = Ticker("ADBE", http_proxy="http://127.0.0.1:8118", log_level=logging.DEBUG)
+    def test_html(self):
+        ticker = Ticker("ADBE", http_proxy="http://127.0.0.1:8118", log_level=logging.DEBUG)
+        tearsheet.html(ticker, output='/tmp/test.html')
 
-tearsheet.html(ticker, output='/tmp/test.html')
\ No newline at end of file
+    def test_batch(self):
+        written = tearsheet.batch(["ADBE", "NVDA"], out_dir="/tmp/tearsheets", http_proxy="http://127.0.0.1:8118")
+        self.assertEqual(list(written), ["ADBE", "NVDA"])
@@ -1,7 +1,36 @@
 import logging
 import unittest
 
+import pandas as pd
+
 from defeatbeta_api.data.ticker import Ticker
+from defeatbeta_api.utils.const import stock_statement
+
+# YoY by pairing each quarter with the one exactly a year earlier, as computed before the growth engine
+SELF_JOIN_YOY_SQL = """
+WITH metric_data AS (
+    SELECT CAST(report_date AS DATE) AS report_date, item_value
+    FROM '{url}'
+    WHERE symbol = '{ticker}'
+        AND finance_type = 'income_statement'
+        AND item_name = '{item_name}'
+        AND period_type = 'quarterly'
+        AND report_date != 'TTM'
+)
+SELECT
+    e1.report_date,
+    CASE
+        WHEN e2.item_value IS NOT NULL AND e2.item_value != 0
+        THEN ROUND((e1.item_value - e2.item_value) / ABS(e2.item_value), 4)
+        ELSE NULL
+    END AS expected_yoy
+FROM metric_data e1
+LEFT JOIN metric_data e2
+  ON strftime(e2.report_date, '%m-%d') = strftime(e1.report_date, '%m-%d')
+ AND date_diff('year', e2.report_date, e1.report_date) = 1
+WHERE e1.item_value IS NOT NULL
+ORDER BY e1.report_date
+"""
 
 class TestTicker(unittest.TestCase):
     SYMBOL = "PDD"
@@ -47,6 +76,14 @@ class TestTicker(unittest.TestCase):
         result = self.ticker.price()
         print(result)
 
+    def test_price_with_date_range(self):
+        result = self.ticker.price(start="2025-01-01", end="2025-01-31", columns=["report_date", "close"])
+        print(result)
+        self.assertEqual(list(result.columns), ["report_date", "close"])
+        report_dates = pd.to_datetime(result['report_date'])
+        self.assertTrue((report_dates >= pd.Timestamp("2025-01-01")).all())
+        self.assertTrue((report_dates <= pd.Timestamp("2025-01-31")).all())
+
     def test_statement_1(self):
         result = self.ticker.quarterly_income_statement()
         result.print_pretty_table()
@@ -115,6 +152,29 @@ class TestTicker(unittest.TestCase):
         print(transcripts.get_transcript(fiscal_year, fiscal_quarter))
         transcripts.print_pretty_table(fiscal_year, fiscal_quarter)
 
+    def test_get_transcripts(self):
+        transcripts = self.ticker.earning_call_transcripts()
+        result = transcripts.get_transcripts(periods=[(2024, 3), (2024, 4)])
+        print(result)
+        self.assertTrue((result["symbol"] == self.SYMBOL).all())
+        self.assertTrue(set(zip(result["fiscal_year"], result["fiscal_quarter"])).issubset({(2024, 3), (2024, 4)}))
+        for (symbol, fiscal_year, fiscal_quarter), paragraphs in transcripts.iter_transcripts(periods=[(2024, 4)]):
+            self.assertEqual((symbol, fiscal_year, fiscal_quarter), (self.SYMBOL, 2024, 4))
+            self.assertEqual(list(paragraphs.columns), ["paragraph_number", "speaker", "content"])
+
+    def test_get_transcript_sentences(self):
+        transcripts = self.ticker.earning_call_transcripts()
+        result = transcripts.get_transcript_sentences(2024, 4)
+        print(result)
+        self.assertEqual(list(result.columns), ["paragraph_number", "speaker", "sentences"])
+        self.assertTrue(result["sentences"].map(len).sum() > 0)
+
+    def test_search_transcripts(self):
+        result = self.ticker.earning_call_transcripts().search("pricing pressure", top_k=5)
+        print(result.to_string())
+        self.assertLessEqual(len(result), 5)
+        self.assertTrue((result["symbol"] == self.SYMBOL).all())
+
     def test_news(self):
         news = self.ticker.news()
 
@@ -130,6 +190,52 @@ class TestTicker(unittest.TestCase):
         print(news.get_news(first_uuid))
         news.print_pretty_table(first_uuid)
 
+    def test_news_list_paging(self):
+        news = self.ticker.news()
+        full = news.get_news_list()
+        latest = news.get_news_list(limit=5, newest_first=True)
+        print(latest.to_string())
+        self.assertLessEqual(len(latest), 5)
+        self.assertTrue(latest["report_date"].is_monotonic_decreasing)
+        if not full.empty:
+            self.assertEqual(latest.iloc[0]["report_date"], full["report_date"].max())
+        next_page = news.get_news_list(limit=5, offset=5, newest_first=True)
+        self.assertFalse(set(latest["uuid"]) & set(next_page["uuid"]))
+        window = news.get_news_list(since="2025-01-01", until="2025-01-31")
+        self.assertTrue(window["report_date"].str[:10].between("2025-01-01", "2025-01-31").all())
+
+    def test_similar_news(self):
+        news = self.ticker.news()
+        df = news.get_news_list()
+        if df.empty:
+            self.skipTest(f"No news available for {self.SYMBOL}")
+        result = news.similar_news(df.iloc[-1]["uuid"], k=5)
+        print(result.to_string())
+        self.assertLessEqual(len(result), 5)
+        self.assertNotIn(df.iloc[-1]["uuid"], result["uuid"].tolist())
+        self.assertTrue(result["score"].is_monotonic_decreasing)
+
+    def test_similar_transcripts(self):
+        result = self.ticker.earning_call_transcripts().similar_transcripts(2024, 4, k=5)
+        print(result.to_string())
+        self.assertLessEqual(len(result), 5)
+        self.assertTrue(result["score"].is_monotonic_decreasing)
+
+    def test_transcript_sentiment(self):
+        transcripts = self.ticker.earning_call_transcripts()
+        result = transcripts.get_sentiment()
+        print(result.to_string())
+        self.assertTrue((result["symbol"] == self.SYMBOL).all())
+        self.assertTrue(result["tone"].between(-1, 1).all())
+        paragraphs = transcripts.get_sentiment(by="paragraph")
+        self.assertEqual(paragraphs["positive"].sum(), result["positive"].sum())
+
+    def test_news_sentiment(self):
+        result = self.ticker.news().get_sentiment()
+        print(result.to_string())
+        self.assertTrue(result["symbols"].str.split(",").apply(lambda s: self.SYMBOL in s).all())
+        self.assertTrue(result["uuid"].is_unique)
+
     def test_quarterly_revenue_by_breakdown(self):
         result = self.ticker.quarterly_revenue_by_breakdown()
         print(result.to_string())
@@ -178,6 +284,32 @@ class TestTicker(unittest.TestCase):
         result = self.ticker.annual_fcf_margin()
         print(result.to_string())
 
+    def test_growth(self):
+        result = self.ticker.growth(["total_revenue", "operating_income"], cagr_years=[3])
+        print(result.to_string())
+        for column in ["item_value", "yoy_growth", "qoq_growth", "cagr_3y"]:
+            self.assertIn(column, result.columns)
+        self.assertEqual(set(result["item_name"]), {"total_revenue", "operating_income"})
+
+        # PDD reports on calendar quarter ends, where the old exact-date self-join is a
+        # correct, independent reference for the engine's YoY values
+        url = self.ticker.huggingface_client.get_url_path(stock_statement)
+        for item_name in ["total_revenue", "operating_income"]:
+            expected = self.ticker.duckdb_client.query(
+                SELF_JOIN_YOY_SQL.format(url=url, ticker=self.SYMBOL, item_name=item_name))
+            actual = result[result["item_name"] == item_name]
+            self.assertEqual(len(actual), len(expected))
+            merged = expected.merge(actual, on="report_date")
+            self.assertEqual(len(merged), len(expected))
+            self.assertGreater(merged["expected_yoy"].notna().sum(), 0)
+            pd.testing.assert_series_equal(merged["yoy_growth"], merged["expected_yoy"], check_names=False)
+
+    def test_annual_growth(self):
+        result = self.ticker.growth(["total_revenue"], period_type="annual", cagr_years=[3, 5])
+        print(result.to_string())
+        self.assertNotIn("qoq_growth", result.columns)
+        self.assertIn("cagr_5y", result.columns)
+
     def test_quarterly_revenue_yoy_growth(self):
         result = self.ticker.quarterly_revenue_yoy_growth()
         print(result.to_string())
@@ -230,6 +362,19 @@ class TestTicker(unittest.TestCase):
         result = self.ticker.market_capitalization()
         print(result.to_string())
 
+    def test_valuation_with_date_range(self):
+        full = self.ticker.ps_ratio()
+        full = full[(full['report_date'] >= pd.Timestamp("2025-01-01"))
+                    & (full['report_date'] <= pd.Timestamp("2025-03-31"))].reset_index(drop=True)
+        ranged = self.ticker.ps_ratio(start="2025-01-01", end="2025-03-31")
+        print(ranged.to_string())
+        pd.testing.assert_frame_equal(full, ranged.reset_index(drop=True))
+
+        result = self.ticker.enterprise_value(start="2025-01-01", end="2025-03-31",
+                                              columns=["report_date", "enterprise_value"])
+        print(result.to_string())
+        self.assertEqual(list(result.columns), ["report_date", "enterprise_value"])
+
     def test_ps_ratio(self):
         result = self.ticker.ps_ratio()
         print(result.to_string())
@@ -266,6 +411,22 @@ class TestTicker(unittest.TestCase):
         result = self.ticker.ttm_revenue()
         print(result.to_string())
 
+    def test_ttm(self):
+        result = self.ticker.ttm(["total_revenue", "ebitda", "free_cash_flow"])
+        print(result.to_string())
+        self.assertEqual(list(result.columns),
+                         ["symbol", "report_date", "ttm_total_revenue", "ttm_ebitda", "ttm_free_cash_flow"])
+
+        revenue = self.ticker.ttm_revenue()
+        merged = result.merge(revenue, on=["symbol", "report_date"], suffixes=("", "_single"))
+        self.assertFalse(merged.empty)
+        self.assertTrue((merged["ttm_total_revenue"] == merged["ttm_total_revenue_single"]).all())
+
+    def test_ttm_with_detail(self):
+        result = self.ticker.ttm(["total_revenue"], detail=True)
+        print(result.to_string())
+        self.assertIn("report_date_2_total_revenue", result.columns)
+
     def test_ttm_fcf(self):
         result = self.ticker.ttm_fcf()
         print(result.to_string())
@@ -310,6 +471,53 @@ class TestTicker(unittest.TestCase):
         result = self.ticker.wacc()
         print(result.to_string())
 
+    def test_as_of(self):
+        dates = pd.date_range("2020-01-31", "2024-12-31", freq="ME")
+        result = self.ticker.as_of(dates, metrics=["close_price", "ttm_eps", "ttm_pe", "ps_ratio"])
+        print(result.to_string())
+        self.assertEqual(len(result), len(dates))
+        self.assertEqual(list(result.columns),
+                         ["symbol", "as_of", "price_date", "close_price", "ttm_eps", "ttm_pe", "ps_ratio"])
+        self.assertTrue((result['price_date'] <= result['as_of']).all())
+
+        # A single date matches the same row of the vectorized pass
+        single = self.ticker.as_of("2023-06-30", metrics=["ttm_pe"])
+        print(single.to_string())
+        expected = result.loc[result['as_of'] == pd.Timestamp("2023-06-30"), 'ttm_pe'].iloc[0]
+        self.assertEqual(single['ttm_pe'].iloc[0], expected)
+
+    def test_as_of_invalid_metric(self):
+        with self.assertRaises(ValueError):
+            self.ticker.as_of("2024-01-31", metrics=["not_a_metric"])
+
+    def test_dcf_sensitivity(self):
+        wacc_range = [0.08, 0.09, 0.10]
+        growth_range = [0.02, 0.025, 0.03]
+        result = self.ticker.dcf_sensitivity(wacc_range, growth_range)
+        print(result.to_string())
+        self.assertEqual(result.shape, (3, 3))
+        base = self.ticker.dcf_data()
+        wacc = base["discount_rate"]["wacc"]
+        terminal = base["dcf_template"]["growth_rate_terminal"]
+        single = self.ticker.dcf_sensitivity([wacc], [terminal])
+        self.assertAlmostEqual(single.iloc[0, 0], base["dcf_value"]["fair_price"], places=6)
+
+    def test_dcf_monte_carlo(self):
+        result = self.ticker.dcf_monte_carlo(10_000, {
+            'wacc': ('normal', 0.09, 0.01),
+            'growth_rate_terminal': ('uniform', 0.02, 0.035),
+        }, seed=42)
+        print(result.describe().to_string())
+        self.assertEqual(len(result), 10_000)
+        self.assertIn('fair_price', result.columns)
+        again = self.ticker.dcf_monte_carlo(10_000, {
+            'wacc': ('normal', 0.09, 0.01),
+            'growth_rate_terminal': ('uniform', 0.02, 0.035),
+        }, seed=42)
+        pd.testing.assert_frame_equal(result, again)
+        with self.assertRaises(ValueError):
+            self.ticker.dcf_monte_carlo(10, {'not_an_input': ('normal', 0, 1)})
+
     def test_dcf(self):
         import math
         import xlwings as xw
@@ -0,0 +1,38 @@
+import logging
+import time
+import unittest
+
+from defeatbeta_api.client.duckdb_conf import Configuration
+from defeatbeta_api.data.service_context import get_service_context
+from defeatbeta_api.data.ticker import Ticker
+
+
+class TestTickerConstruction(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Warm up the shared context so the benchmark measures construction only
+        cls.context = get_service_context(http_proxy="http://127.0.0.1:8118", log_level=logging.DEBUG)
+
+    def test_tickers_share_context(self):
+        a = Ticker("AAPL", http_proxy="http://127.0.0.1:8118", log_level=logging.DEBUG)
+        b = Ticker("MSFT", http_proxy="http://127.0.0.1:8118", log_level=logging.DEBUG)
+        self.assertIs(a.context, self.context)
+        self.assertIs(a.huggingface_client, b.huggingface_client)
+        self.assertIs(a.treasure, b.treasure)
+        self.assertIs(a.company_meta, b.company_meta)
+
+    def test_equal_configurations_share_context(self):
+        a = get_service_context(http_proxy="http://127.0.0.1:8118", config=Configuration(threads=2))
+        b = get_service_context(http_proxy="http://127.0.0.1:8118", config=Configuration(threads=2))
+        c = get_service_context(http_proxy="http://127.0.0.1:8118", config=Configuration(threads=3))
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+
+    def test_benchmark_10k_tickers(self):
+        n = 10_000
+        start = time.perf_counter()
+        tickers = [Ticker(f"T{i}", http_proxy="http://127.0.0.1:8118", log_level=logging.DEBUG) for i in range(n)]
+        elapsed = time.perf_counter() - start
+        print(f"Constructed {n} Ticker objects in {elapsed:.3f}s ({elapsed / n * 1e6:.1f} µs each)")
+        # Construction stays cheap because no Ticker builds its own clients
+        self.assertTrue(all(ticker.context is self.context for ticker in tickers))
@@ -62,6 +62,15 @@ class TestTickers(unittest.TestCase):
             print('...')
             print(df.tail(2).to_string())
 
+    def test_get_articles(self):
+        lists = {symbol: news.get_news_list() for symbol, news in self.tickers.news().items()}
+        uuids = [df.iloc[-1]["uuid"] for df in lists.values() if not df.empty]
+        result = self.tickers.get_articles(uuids)
+        print(result.head().to_string())
+        self.assertTrue(result["uuid"].is_unique)
+        self.assertEqual(set(result["uuid"]), set(uuids))
+        self.assertTrue(all(set(symbols) & set(SYMBOLS) for symbols in result["symbols"]))
+
 
     def test_earning_call_transcripts(self):
         result = self.tickers.earning_call_transcripts()
@@ -71,6 +80,45 @@ class TestTickers(unittest.TestCase):
 
         print(result)
 
+    def test_get_transcripts(self):
+        result = self.tickers.get_transcripts(periods=[(2024, 4), ("NVDA", 2024, 3)])
+        print(result)
+        self.assertTrue(set(result["symbol"]).issubset(SYMBOLS))
+        for (symbol, _, _), paragraphs in self.tickers.iter_transcripts(periods=[(2024, 4)], batch_size=1):
+            self.assertIn(symbol, SYMBOLS)
+            self.assertFalse(paragraphs.empty)
+
+    def test_mention_counts(self):
+        result = self.tickers.mention_counts(["AI", "data center"])
+        print(result.to_string())
+        self.assertEqual(list(result.columns), ["symbol", "fiscal_year", "fiscal_quarter", "report_date", "term",
+                                                "mentions", "paragraphs"])
+        self.assertTrue(set(result["symbol"]).issubset(SYMBOLS))
+        by_speaker = self.tickers.mention_counts([r"tariffs?"], by="speaker", match="regex")
+        self.assertIn("speaker", by_speaker.columns)
+
+    def test_mention_counts_without_tickers(self):
+        result = Tickers([], http_proxy="http://127.0.0.1:8118").mention_counts(["AI"], by="speaker")
+        self.assertTrue(result.empty)
+        self.assertEqual(list(result.columns), ["symbol", "fiscal_year", "fiscal_quarter", "speaker", "term",
+                                                "mentions", "paragraphs"])
+
+    def test_sentiment(self):
+        result = self.tickers.transcript_sentiment()
+        print(result.to_string())
+        self.assertTrue(set(result["symbol"]).issubset(SYMBOLS))
+        self.assertTrue(result["tone"].between(-1, 1).all())
+        news = self.tickers.news_sentiment()
+        print(news.to_string())
+        self.assertTrue(news["uuid"].is_unique)
+
+    def test_search_transcripts(self):
+        result = self.tickers.search_transcripts("data center demand", date_range=("2024-01-01", None), top_k=5)
+        print(result.to_string())
+        self.assertLessEqual(len(result), 5)
+        self.assertTrue(set(result["symbol"]).issubset(SYMBOLS))
+        self.assertTrue(result["score"].is_monotonic_decreasing)
+
     # ------------------------------------------------------------------
     # Category 1 – Finance
     # ------------------------------------------------------------------
@@ -187,6 +235,15 @@ class TestTickers(unittest.TestCase):
         for s in SYMBOLS:
             self.assertIn(s, symbols_in_result)
 
+    def test_ttm(self):
+        result = self.tickers.ttm(["total_revenue", "net_income_common_stockholders"])
+        print(result.to_string())
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertFalse(result.empty)
+        symbols_in_result = result["symbol"].str.upper().tolist()
+        for s in SYMBOLS:
+            self.assertIn(s, symbols_in_result)
+
     def test_ttm_revenue(self):
         result = self.tickers.ttm_revenue()
         print(result.to_string())
@@ -299,6 +356,22 @@ class TestTickers(unittest.TestCase):
         for s in SYMBOLS:
             self.assertIn(s, symbols_in_result)
 
+    def test_roce(self):
+        result = self.tickers.roce()
+        print(result.to_string())
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertFalse(result.empty)
+        symbols_in_result = result['symbol'].str.upper().tolist()
+        for s in SYMBOLS:
+            self.assertIn(s, symbols_in_result)
+
+    def test_roe_matches_single_ticker(self):
+        result = self.tickers.roe()
+        for s in SYMBOLS:
+            single = self.tickers._ticker_map[s].roe().reset_index(drop=True)
+            bulk = result[result['symbol'] == s].reset_index(drop=True)
+            pd.testing.assert_frame_equal(single, bulk)
+
     def test_equity_multiplier(self):
         result = self.tickers.equity_multiplier()
         print(result.to_string())
@@ -329,10 +402,40 @@ class TestTickers(unittest.TestCase):
         for s in SYMBOLS:
             self.assertIn(s, symbols_in_result)
 
+    def test_as_of(self):
+        dates = pd.date_range("2023-01-31", "2024-12-31", freq="ME")
+        result = self.tickers.as_of(dates, metrics=["market_capitalization", "pb_ratio"])
+        print(result.to_string())
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertEqual(len(result), len(dates) * len(SYMBOLS))
+        symbols_in_result = result['symbol'].str.upper().tolist()
+        for s in SYMBOLS:
+            self.assertIn(s, symbols_in_result)
+
+    def test_dcf_data(self):
+        result = self.tickers.dcf_data()
+        print(result.to_string())
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertEqual(result['symbol'].tolist(), SYMBOLS)
+        for s in SYMBOLS:
+            single = self.tickers._ticker_map[s].dcf_data()["dcf_value"]
+            row = result[result['symbol'] == s].iloc[0]
+            self.assertAlmostEqual(row['fair_price'], single['fair_price'], places=6)
+            self.assertEqual(row['recommendation'], single['recommendation'])
+
     # ------------------------------------------------------------------
     # Category 3 – Growth
     # ------------------------------------------------------------------
 
+    def test_growth(self):
+        result = self.tickers.growth(["total_revenue", "ebitda"], cagr_years=[3])
+        print(result.to_string())
+        self.assertIsInstance(result, pd.DataFrame)
+        self.assertFalse(result.empty)
+        symbols_in_result = result["symbol"].str.upper().tolist()
+        for s in SYMBOLS:
+            self.assertIn(s, symbols_in_result)
+
     def test_quarterly_revenue_yoy_growth(self):
         result = self.tickers.quarterly_revenue_yoy_growth()
         print(result.to_string())
@@ -0,0 +1,44 @@
+import unittest
+
+from defeatbeta_api.data.transcript_ai import chunk_paragraphs, estimate_tokens, serialize_transcript
+
+
+def paragraph(number, speaker, length):
+    return {"paragraph_number": number, "speaker": speaker, "content": "x" * length}
+
+
+def numbers(chunks):
+    return [[p["paragraph_number"] for p in chunk] for chunk in chunks]
+
+
+class TestChunkParagraphs(unittest.TestCase):
+
+    def cost(self, paragraphs):
+        return sum(estimate_tokens(serialize_transcript([p], True)) for p in paragraphs)
+
+    def test_turns_are_packed_whole(self):
+        paragraphs = [paragraph(0, "Operator", 100), paragraph(1, "Analyst", 300),
+                      paragraph(2, "CEO", 300), paragraph(3, "CEO", 100)]
+        self.assertEqual(numbers(chunk_paragraphs(paragraphs, 200, True)), [[0, 1], [2, 3]])
+
+    def test_long_turn_tops_up_current_chunk(self):
+        # A 356-token CFO turn must be split; its first paragraph still fits after the operator
+        paragraphs = [paragraph(0, "Operator", 100), paragraph(1, "Operator", 100)]
+        paragraphs += [paragraph(n, "CFO", 300) for n in range(2, 6)]
+        self.assertEqual([self.cost([p]) for p in paragraphs], [40, 40, 89, 89, 89, 89])
+
+        chunks = chunk_paragraphs(paragraphs, 200, True)
+        self.assertEqual(numbers(chunks), [[0, 1, 2], [3, 4], [5]])
+        for chunk in chunks:
+            self.assertLessEqual(self.cost(chunk), 200)
+        # Greedy packing: the next chunk's first paragraph never fits in the previous one
+        for previous, following in zip(chunks, chunks[1:]):
+            self.assertGreater(self.cost(previous) + self.cost(following[:1]), 200)
+
+    def test_oversized_paragraph_is_its_own_chunk(self):
+        paragraphs = [paragraph(0, "Operator", 100), paragraph(1, "CEO", 1000), paragraph(2, "CEO", 100)]
+        self.assertEqual(numbers(chunk_paragraphs(paragraphs, 200, True)), [[0], [1], [2]])
+
+    def test_budget_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            chunk_paragraphs([paragraph(0, "Operator", 10)], 0)
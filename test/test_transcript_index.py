@@ -0,0 +1,144 @@
+import math
+import os
+import tempfile
+import unittest
+
+import duckdb
+
+from defeatbeta_api.data.transcript_index import SEARCH_COLUMNS, TranscriptIndex
+from defeatbeta_api.utils.text import tokenize
+
+# (symbol, fiscal_year, fiscal_quarter, report_date, [(speaker, content), ...])
+TRANSCRIPTS = [
+    ("NVDA", 2024, 1, "2024-05-22", [
+        ("CFO", "Data center revenue grew strongly. Data center demand remains strong across every region."),
+        ("CEO", "Gaming was flat."),
+    ]),
+    ("NVDA", 2023, 4, "2024-02-21", [
+        ("CFO", "Data center revenue doubled."),
+    ]),
+    ("SHOP", 2024, 1, "2024-05-08", [
+        ("CFO", "Merchants adopted our data tools, and the new center of gravity is offline retail."),
+        ("CEO", " ".join(["Volume"] * 80) + " and then tariffs came up near the end of a very long answer."),
+    ]),
+]
+
+
+class LocalDuckDBClient:
+    """In-memory DuckDB standing in for DuckDBClient."""
+
+    def __init__(self):
+        self.connection = duckdb.connect()
+
+    def query(self, sql):
+        return self.connection.sql(sql).df()
+
+    def execute(self, sql):
+        self.connection.execute(sql)
+
+
+class LocalHuggingFaceClient:
+    """Serves every table from one local parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def get_url_path(self, table):
+        return self.path
+
+
+def literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def write_transcripts(client, path):
+    rows = []
+    for symbol, year, quarter, report_date, paragraphs in TRANSCRIPTS:
+        structs = ", ".join(
+            f"{{'paragraph_number': {number}, 'speaker': {literal(speaker)}, 'content': {literal(content)}}}"
+            for number, (speaker, content) in enumerate(paragraphs, start=1))
+        rows.append(f"({literal(symbol)}, {year}, {quarter}, {literal(report_date)}, [{structs}])")
+    client.execute(f"COPY (SELECT * FROM (VALUES {', '.join(rows)}) "
+                   f"AS t(symbol, fiscal_year, fiscal_quarter, report_date, transcripts)) TO '{path}' (FORMAT parquet)")
+
+
+def bm25(query):
+    """Reference BM25 score of every paragraph, keyed by (symbol, fiscal_year, fiscal_quarter, paragraph_number)."""
+    docs = {(symbol, year, quarter, number): tokenize(content)
+            for symbol, year, quarter, _, paragraphs in TRANSCRIPTS
+            for number, (_, content) in enumerate(paragraphs, start=1)}
+    avg_length = sum(len(tokens) for tokens in docs.values()) / len(docs)
+    scores = {}
+    for term in set(tokenize(query)):
+        matching = [key for key, tokens in docs.items() if term in tokens]
+        idf = math.log1p((len(docs) - len(matching) + 0.5) / (len(matching) + 0.5))
+        for key in matching:
+            tf = docs[key].count(term)
+            norm = 1.2 * (1 - 0.75 + 0.75 * len(docs[key]) / avg_length)
+            scores[key] = scores.get(key, 0.0) + idf * tf * 2.2 / (tf + norm)
+    return scores
+
+
+class TestTranscriptIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.client = LocalDuckDBClient()
+        source = os.path.join(cls.tmpdir.name, "transcripts.parquet")
+        write_transcripts(cls.client, source)
+        directory = os.path.join(cls.tmpdir.name, "index")
+        os.makedirs(directory)
+        TranscriptIndex.build(directory, cls.client, LocalHuggingFaceClient(source))
+        cls.index = TranscriptIndex(directory, cls.client)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    @staticmethod
+    def keys(result):
+        return list(zip(result["symbol"], result["fiscal_year"], result["fiscal_quarter"], result["paragraph_number"]))
+
+    def test_bm25_ordering(self):
+        result = self.index.search("data center")
+        self.assertEqual(list(result.columns), SEARCH_COLUMNS)
+
+        expected = bm25("data center")
+        ranked = sorted(expected, key=expected.get, reverse=True)
+        self.assertEqual(self.keys(result), ranked)
+        self.assertEqual(ranked[0], ("NVDA", 2024, 1, 1))
+        for key, score in zip(self.keys(result), result["score"]):
+            self.assertAlmostEqual(score, expected[key])
+
+        self.assertEqual(self.keys(self.index.search("data center", top_k=1)), ranked[:1])
+
+    def test_symbol_and_date_filters(self):
+        result = self.index.search("data center", symbols=["shop"])
+        self.assertEqual(self.keys(result), [("SHOP", 2024, 1, 1)])
+
+        result = self.index.search("data center", date_range=("2024-05-01", None))
+        self.assertEqual(set(self.keys(result)), {("NVDA", 2024, 1, 1), ("SHOP", 2024, 1, 1)})
+        result = self.index.search("data center", date_range=(None, "2024-02-21"))
+        self.assertEqual(self.keys(result), [("NVDA", 2023, 4, 1)])
+
+        result = self.index.search("data center", symbols=["SHOP", "UNKNOWN"], date_range=("2024-05-10", None))
+        self.assertTrue(result.empty)
+
+    def test_snippet(self):
+        result = self.index.search("doubled")
+        self.assertEqual(result["snippet"].tolist(), ["Data center revenue doubled."])
+
+        # A long paragraph is cut around the first query term
+        snippet = self.index.search("tariffs")["snippet"].iloc[0]
+        self.assertTrue(snippet.startswith("…"))
+        self.assertIn("tariffs came up", snippet)
+        self.assertLess(len(snippet), 250)
+
+    def test_unknown_term_returns_empty_frame(self):
+        result = self.index.search("blockchain")
+        self.assertTrue(result.empty)
+        self.assertEqual(list(result.columns), SEARCH_COLUMNS)
+
+        with self.assertRaises(ValueError):
+            self.index.search("data", top_k=0)
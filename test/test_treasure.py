@@ -1,6 +1,9 @@
 import logging
 import unittest
 
+import numpy as np
+import pandas as pd
+
 from defeatbeta_api.data.treasure import Treasure
 
 
@@ -12,3 +15,20 @@ class TestTreasure(unittest.TestCase):
     def test_daily_treasure_yield(self):
         result = self.treasure.daily_treasure_yield()
         print(result)
+
+    def test_yield_at(self):
+        curve = self.treasure.daily_treasure_yield()
+        last = curve.iloc[-1]
+        dates = [last['report_date'], last['report_date'] + pd.Timedelta(days=3), pd.Timestamp("1900-01-01")]
+        result = self.treasure.yield_at(dates, '10y')
+        print(result)
+        self.assertAlmostEqual(result[0], last['bc_10year'])
+        self.assertAlmostEqual(result[1], last['bc_10year'])
+        self.assertTrue(np.isnan(result[2]))
+        between = self.treasure.yield_at(last['report_date'], 8.5)
+        self.assertGreaterEqual(between, min(last['bc_7year'], last['bc_10year']))
+        self.assertLessEqual(between, max(last['bc_7year'], last['bc_10year']))
+
+    def test_yield_at_invalid_tenor(self):
+        with self.assertRaises(ValueError):
+            self.treasure.yield_at("2024-01-02", "ten years")
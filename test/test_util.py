@@ -1,7 +1,10 @@
+import threading
 import unittest
 
+import numpy as np
+
 from defeatbeta_api.utils.util import load_finance_template, load_sp500_historical_annual_returns, sp500_cagr_returns, \
-    sp500_cagr_returns_rolling
+    sp500_cagr_returns_rolling, sp500_cagr_returns_matrix, update_time_cached
 from defeatbeta_api.utils.const import income_statement
 
 
@@ -22,4 +25,42 @@ class TestUtil(unittest.TestCase):
         sp500_returns = load_sp500_historical_annual_returns()
         print(sp500_returns)
         print(sp500_cagr_returns(10))
-        print(sp500_cagr_returns_rolling(10).to_string())
\ No newline at end of file
+        print(sp500_cagr_returns_rolling(10).to_string())
+
+    def test_sp500_cagr_returns_matrix(self):
+        matrix = sp500_cagr_returns_matrix(30)
+        print(matrix.tail())
+        for years in (1, 10, 30):
+            rolling = sp500_cagr_returns_rolling(years)
+            expected = rolling.set_index("end_date")[f"cagr_returns_{years}_years"]
+            actual = matrix.loc[expected.index, years]
+            self.assertTrue(np.allclose(actual.values, expected.values))
+
+    def test_update_time_cached_locks_per_key(self):
+        building = threading.Event()
+        release = threading.Event()
+        loads = []
+
+        def slow_load():
+            loads.append("slow")
+            building.set()
+            release.wait(5)
+            return "slow index"
+
+        builder = threading.Thread(target=update_time_cached, args=("test_slow", "t1", slow_load))
+        builder.start()
+        self.assertTrue(building.wait(5))
+        fast = []
+        reader = threading.Thread(target=lambda: fast.append(update_time_cached("test_fast", "t1", lambda: "fast")))
+        reader.start()
+        reader.join(2)
+        # Another key was served while the slow build still held its own lock
+        fast_before_release = list(fast)
+        release.set()
+        builder.join(5)
+        reader.join(5)
+        self.assertEqual(fast_before_release, ["fast"])
+
+        self.assertEqual(update_time_cached("test_slow", "t1", lambda: "reloaded"), "slow index")
+        self.assertEqual(update_time_cached("test_slow", "t2", lambda: "reloaded"), "reloaded")
+        self.assertEqual(loads, ["slow"])